@@ -31,6 +31,9 @@ player_hits = [0, 0]
 player_misses = [0, 0]
 shots_taken = [0, 0]
 
+# Cell -> ship lookup per player: (ship list it was built from, {(row, col): ship index}, health per ship)
+ship_index = [None, None]
+
 # Used during ship placement to know which grid/list to update
 placing_grid = None
 placing_ship_positions = None
@@ -252,6 +255,7 @@ def create_grid():
         # Store grid & ships for this player
         player_grids[player_index] = placing_grid
         player_ship_positions[player_index] = placing_ship_positions
+        build_ship_index(player_index)
 
         print_single_grid(
             title=f"{name} - Final ship layout",
@@ -327,19 +331,47 @@ def accept_valid_player_placement():
         return row, col
 
 
+def build_ship_index(player):
+    """
+    Builds the cell -> ship lookup and remaining health per ship for a player.
+    Health counts the cells of each ship that are not HIT yet.
+    """
+    ships = player_ship_positions[player]
+    grid = player_grids[player]
+    cell_to_ship = {}
+    health = []
+
+    for i, ship in enumerate(ships):
+        for r, c in ship["coords"]:
+            cell_to_ship[(r, c)] = i
+        health.append(sum(1 for r, c in ship["coords"] if grid[r][c] != Cell.HIT))
+
+    ship_index[player] = (ships, cell_to_ship, health)
+    return ship_index[player]
+
+
+def get_ship_index(player):
+    """
+    Returns the player's ship index, rebuilding it if their fleet was replaced.
+    """
+    index = ship_index[player]
+    if index is None or index[0] is not player_ship_positions[player]:
+        index = build_ship_index(player)
+    return index
+
+
 def check_if_ship_sunk(row, col):
     """
     Checks whether a newly hit ship is now fully destroyed.
     If so, increments the current player's sunk-ship count.
     """
     defender = 1 - current_player
-    grid = player_grids[defender]
+    ships, cell_to_ship, health = get_ship_index(defender)
 
-    for ship in player_ship_positions[defender]:
-        if (row, col) in ship["coords"] and all(grid[r][c] == Cell.HIT for r, c in ship["coords"]):
-            print(f"You sank the {ship['name']}!")
-            ships_sunk[current_player] += 1
-            return
+    i = cell_to_ship.get((row, col))
+    if i is not None and health[i] == 0:
+        print(f"You sank the {ships[i]['name']}!")
+        ships_sunk[current_player] += 1
 
 
 def shoot_bullet():
@@ -363,7 +395,9 @@ def shoot_bullet():
 
     if cell == Cell.SHIP:
         print("Hit!")
+        _, cell_to_ship, health = get_ship_index(defender)
         grid[row][col] = Cell.HIT
+        health[cell_to_ship[(row, col)]] -= 1
         player_hits[current_player] += 1
         check_if_ship_sunk(row, col)
     else:
@@ -0,0 +1,5 @@
+# conftest.py - Lets the tests import the modular version's flat modules.
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "modular_version"))
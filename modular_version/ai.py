@@ -0,0 +1,186 @@
+# ai.py - Computer players. Each one picks a shot with choose_shot() and
+# learns the outcome through observe(result) with an engine ShotResult.
+
+import random
+from functools import lru_cache
+
+from state import fleet, grid_size
+from engine import Outcome
+
+
+class RandomAI:
+    """
+    Fires at random untouched cells.
+    """
+
+    def __init__(self, size=grid_size, ships=fleet, rng=random):
+        self.targets = [(r, c) for r in range(size) for c in range(size)]
+        rng.shuffle(self.targets)
+
+    def choose_shot(self):
+        return self.targets[-1]
+
+    def choose_volley(self, shots):
+        """
+        Up to `shots` distinct untouched cells, for a salvo turn. Taken from
+        the end of the list, last first, so observing the results in volley
+        order pops each one off the end.
+        """
+        return self.targets[:-shots - 1:-1]
+
+    def observe(self, result):
+        target = (result.row, result.col)
+        if self.targets[-1] == target:
+            self.targets.pop()
+        else:
+            self.targets.remove(target)
+
+
+def ship_placements(size, ship_len):
+    """
+    Every placement of a ship of given length as a tuple of flat cell
+    indexes (row * size + col), horizontal first.
+    """
+    placements = []
+    for r in range(size):
+        for c in range(size - ship_len + 1):
+            placements.append(tuple(r * size + c + k for k in range(ship_len)))
+    if ship_len > 1:
+        for c in range(size):
+            for r in range(size - ship_len + 1):
+                placements.append(tuple((r + k) * size + c for k in range(ship_len)))
+    return placements
+
+
+@lru_cache(maxsize=None)
+def placement_index(size, ship_len):
+    """
+    Shared, read-only lookup tables for one ship length:
+    (placements, covering) where covering[cell] lists the placement ids
+    that pass through that cell.
+    """
+    placements = tuple(ship_placements(size, ship_len))
+    covering = [[] for _ in range(size * size)]
+    for pid, placement in enumerate(placements):
+        for cell in placement:
+            covering[cell].append(pid)
+    return placements, tuple(tuple(pids) for pids in covering)
+
+
+class DensityAI:
+    """
+    Probability-density hunter.
+    density[cell] counts the legal placements of every unsunk ship covering
+    that cell. Misses and sunk ships only remove the placements they touch,
+    so each observation updates the map incrementally.
+    While hits are unresolved, it targets the cells that complete
+    placements through those hits.
+    """
+
+    def __init__(self, size=grid_size, ships=fleet, rng=random):
+        self.size = size
+        self.rng = rng
+        self.ship_lens = {name: ship_len for name, ship_len in ships}
+
+        self.remaining = {}            # ship length -> unsunk ships of that length
+        for _, ship_len in ships:
+            self.remaining[ship_len] = self.remaining.get(ship_len, 0) + 1
+
+        self.placements = {}           # ship length -> list of placements
+        self.covering = {}             # ship length -> cell -> placement ids
+        self.alive = {}                # ship length -> 1 if placement still legal
+        self.cover = {}                # ship length -> cell -> alive placements
+        for ship_len in self.remaining:
+            placements, covering = placement_index(size, ship_len)
+            self.placements[ship_len] = placements
+            self.covering[ship_len] = covering
+            self.alive[ship_len] = bytearray([1]) * len(placements)
+            self.cover[ship_len] = [len(pids) for pids in covering]
+
+        self.density = [0] * (size * size)
+        for ship_len, count in self.remaining.items():
+            for cell, n in enumerate(self.cover[ship_len]):
+                self.density[cell] += count * n
+
+        self.shot = bytearray(size * size)
+        self.unresolved = set()        # hit cells not yet part of a sunk ship
+
+    def _block(self, cell):
+        """
+        Removes every placement through a cell that can no longer hold a ship.
+        """
+        for ship_len, pids in self.covering.items():
+            alive = self.alive[ship_len]
+            cover = self.cover[ship_len]
+            weight = self.remaining[ship_len]
+            placements = self.placements[ship_len]
+            for pid in pids[cell]:
+                if alive[pid]:
+                    alive[pid] = 0
+                    for c in placements[pid]:
+                        cover[c] -= 1
+                        self.density[c] -= weight
+
+    def _sink(self, ship_len):
+        """
+        One fewer ship of this length to find.
+        """
+        self.remaining[ship_len] -= 1
+        for cell, n in enumerate(self.cover[ship_len]):
+            self.density[cell] -= n
+
+    def observe(self, result):
+        cell = result.row * self.size + result.col
+        self.shot[cell] = 1
+
+        if result.outcome == Outcome.MISS:
+            self._block(cell)
+            return
+
+        self.unresolved.add(cell)
+        if result.outcome in (Outcome.SUNK, Outcome.WIN):
+            ship = result.ship
+            self._sink(self.ship_lens[ship["name"]])
+            for r, c in ship["coords"]:
+                sunk_cell = r * self.size + c
+                self.unresolved.discard(sunk_cell)
+                self._block(sunk_cell)
+
+    def _target_scores(self):
+        """
+        Scores untouched cells by the alive placements that pass through
+        unresolved hits, favouring placements that cover several of them.
+        """
+        scores = {}
+        unresolved = self.unresolved
+        shot = self.shot
+        seen = set()
+
+        for hit in unresolved:
+            for ship_len, pids in self.covering.items():
+                weight = self.remaining[ship_len]
+                if not weight:
+                    continue
+                alive = self.alive[ship_len]
+                placements = self.placements[ship_len]
+                for pid in pids[hit]:
+                    if not alive[pid] or (ship_len, pid) in seen:
+                        continue
+                    seen.add((ship_len, pid))
+                    placement = placements[pid]
+                    covered = sum(1 for c in placement if c in unresolved)
+                    for c in placement:
+                        if not shot[c]:
+                            scores[c] = scores.get(c, 0) + weight * covered * covered
+        return scores
+
+    def choose_shot(self):
+        scores = self._target_scores() if self.unresolved else None
+        if not scores:
+            shot = self.shot
+            scores = {c: d for c, d in enumerate(self.density) if not shot[c]}
+
+        best = max(scores.values())
+        choices = [c for c, score in scores.items() if score == best]
+        cell = choices[0] if len(choices) == 1 else self.rng.choice(choices)
+        return divmod(cell, self.size)
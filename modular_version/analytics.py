@@ -0,0 +1,293 @@
+# analytics.py - Stats over archived event logs: accuracy, first-hit latency,
+# shots-to-sink per ship type and hit / ship-placement heatmaps.
+# Logs are read in game-aligned chunks and aggregated with NumPy, so memory
+# stays flat however large the archive is; files are spread across cores.
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from state import fleet
+from engine import Outcome
+from eventlog import HEADER, NEW_GAME, PLACE, SHOT, LENGTH_MASK, DIRECTION_SHIFT, check_header
+from snapshot import DIRECTIONS
+from board import column_label
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only this module needs it
+    np = None
+
+CHUNK_EVENTS = 1 << 20
+SHADES = " .:-=+*#%@"
+
+
+def event_dtype():
+    # Same layout as eventlog.EVENT
+    return np.dtype([("kind", "u1"), ("player", "u1"), ("row", "<u2"), ("col", "<u2"), ("aux", "<u2")])
+
+
+def new_stats():
+    """
+    Empty aggregate. Every field adds up, so stats from separate chunks
+    and files merge with merge_stats.
+    """
+    return {
+        "games": 0,
+        "shots": np.zeros(2, np.int64),
+        "hits": np.zeros(2, np.int64),
+        "wins": np.zeros(2, np.int64),
+        "first_hit_total": np.zeros(2, np.int64),
+        "first_hit_games": np.zeros(2, np.int64),
+        "sink_shots": {},              # ship type -> [total shots, ships sunk]
+        "hit_heat": {},                # grid size -> hits per cell
+        "ship_heat": {},               # grid size -> ship placements per cell
+    }
+
+
+def merge_stats(into, other):
+    """
+    Adds other into into and returns it.
+    """
+    into["games"] += other["games"]
+    for key in ("shots", "hits", "wins", "first_hit_total", "first_hit_games"):
+        into[key] += other[key]
+    for name, (total, count) in other["sink_shots"].items():
+        entry = into["sink_shots"].setdefault(name, [0, 0])
+        entry[0] += total
+        entry[1] += count
+    for key in ("hit_heat", "ship_heat"):
+        for size, heat in other[key].items():
+            if size in into[key]:
+                into[key][size] += heat
+            else:
+                into[key][size] = heat.copy()
+    return into
+
+
+def _add_heat(heats, sizes, rows, cols):
+    for size in np.unique(sizes):
+        mine = sizes == size
+        cells = rows[mine].astype(np.int64) * size + cols[mine]
+        heat = np.bincount(cells, minlength=int(size) * int(size)).reshape(size, size)
+        size = int(size)
+        if size in heats:
+            heats[size] += heat
+        else:
+            heats[size] = heat
+
+
+def _group_ordinals(keys):
+    """
+    For each element, how many earlier elements share its key.
+    """
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    counts = np.diff(np.r_[starts, len(keys)])
+    ordinals = np.empty(len(keys), np.int64)
+    ordinals[order] = np.arange(len(keys)) - np.repeat(starts, counts)
+    return ordinals
+
+
+def analyze_block(events, stats):
+    """
+    Aggregates a block of whole games (a structured array that starts
+    with a NEW_GAME event) into stats.
+    """
+    kind = events["kind"]
+    is_new = kind == NEW_GAME
+    game = np.cumsum(is_new) - 1
+    starts = np.flatnonzero(is_new)
+    sizes = events["row"][starts].astype(np.int64)
+    scales = events["aux"][starts]
+    stats["games"] += len(starts)
+
+    # Ships: expand every PLACE event into its cells
+    place = (kind == PLACE) & (game >= 0)
+    p_game = game[place]
+    p_owner = events["player"][place].astype(np.int64)
+    p_aux = events["aux"][place]
+    length = (p_aux & LENGTH_MASK).astype(np.int64)
+    steps = np.array(DIRECTIONS, np.int64)[p_aux >> DIRECTION_SHIFT]
+    ship_of_cell = np.repeat(np.arange(len(p_game)), length)
+    offset = np.arange(len(ship_of_cell)) - np.repeat(np.cumsum(length) - length, length)
+    cell_rows = events["row"][place].astype(np.int64)[ship_of_cell] + steps[ship_of_cell, 0] * offset
+    cell_cols = events["col"][place].astype(np.int64)[ship_of_cell] + steps[ship_of_cell, 1] * offset
+    _add_heat(stats["ship_heat"], sizes[p_game[ship_of_cell]], cell_rows, cell_cols)
+
+    cell_keys = ((p_game * 2 + p_owner)[ship_of_cell] << 32) | (cell_rows << 16) | cell_cols
+    key_order = np.argsort(cell_keys)
+    cell_keys = cell_keys[key_order]
+    cell_ship = ship_of_cell[key_order]
+
+    # Ship type: position in the fleet, folded onto `fleet` for scaled fleets
+    ship_index = _group_ordinals(p_game * 2 + p_owner)
+    ship_scale = scales[p_game]
+    ship_type = np.where(ship_scale > 0, ship_index % len(fleet), len(fleet) + ship_index)
+
+    # Shots
+    shot = (kind == SHOT) & (game >= 0)
+    s_game = game[shot]
+    s_player = events["player"][shot].astype(np.int64)
+    s_rows = events["row"][shot].astype(np.int64)
+    s_cols = events["col"][shot].astype(np.int64)
+    outcome = events["aux"][shot]
+    hit = outcome != Outcome.MISS.value
+
+    stats["shots"] += np.bincount(s_player, minlength=2)
+    stats["hits"] += np.bincount(s_player[hit], minlength=2)
+    stats["wins"] += np.bincount(s_player[outcome == Outcome.WIN.value], minlength=2)
+    _add_heat(stats["hit_heat"], sizes[s_game[hit]], s_rows[hit], s_cols[hit])
+
+    # First-hit latency: shots a player needed for their first hit of a game
+    shot_number = _group_ordinals(s_game * 2 + s_player) + 1
+    hit_keys = (s_game * 2 + s_player)[hit]
+    _, first = np.unique(hit_keys, return_index=True)
+    first_players = hit_keys[first] % 2
+    stats["first_hit_total"] += np.bincount(first_players, weights=shot_number[hit][first],
+                                            minlength=2).astype(np.int64)
+    stats["first_hit_games"] += np.bincount(first_players, minlength=2)
+
+    # Shots-to-sink: attacker shots from the first hit on a ship to its sinking
+    h_keys = ((s_game * 2 + 1 - s_player)[hit] << 32) | (s_rows[hit] << 16) | s_cols[hit]
+    found = np.searchsorted(cell_keys, h_keys)
+    found[found == len(cell_keys)] = 0
+    valid = cell_keys[found] == h_keys if len(cell_keys) else np.zeros(len(h_keys), bool)
+    h_ship = np.where(valid, cell_ship[found] if len(cell_ship) else 0, -1)
+    h_number = shot_number[hit]
+    h_sunk = np.isin(outcome[hit], (Outcome.SUNK.value, Outcome.WIN.value)) & valid
+
+    first_hit = np.zeros(len(p_game), np.int64)
+    ships_hit, first = np.unique(h_ship[valid], return_index=True)
+    first_hit[ships_hit] = h_number[valid][first]
+    sunk_ships = h_ship[h_sunk]
+    to_sink = h_number[h_sunk] - first_hit[sunk_ships] + 1
+    types = ship_type[sunk_ships]
+    totals = np.bincount(types, weights=to_sink)
+    counts = np.bincount(types)
+    for code in np.flatnonzero(counts):
+        name = fleet[code][0] if code < len(fleet) else f"Ship {code - len(fleet) + 1}"
+        entry = stats["sink_shots"].setdefault(name, [0, 0])
+        entry[0] += int(totals[code])
+        entry[1] += int(counts[code])
+    return stats
+
+
+def analyze_file(path, chunk=CHUNK_EVENTS):
+    """
+    Streams one log file through analyze_block, `chunk` events at a time.
+    Each block is cut at the last game start it holds; the unfinished game
+    is carried into the next block.
+    """
+    dtype = event_dtype()
+    stats = new_stats()
+    carry = np.empty(0, dtype)
+    with open(path, "rb") as f:
+        check_header(f)
+        f.seek(HEADER.size)
+        while True:
+            data = f.read(chunk * dtype.itemsize)
+            whole = len(data) - len(data) % dtype.itemsize
+            events = np.frombuffer(data[:whole], dtype)
+            if len(carry):
+                events = np.concatenate((carry, events))
+            if len(data) < chunk * dtype.itemsize:
+                break
+            starts = np.flatnonzero(events["kind"] == NEW_GAME)
+            cut = starts[-1] if len(starts) else 0
+            if cut:
+                analyze_block(events[:cut], stats)
+            carry = events[cut:]
+    if len(events):
+        analyze_block(events, stats)
+    return stats
+
+
+def analyze(paths, workers=None, chunk=CHUNK_EVENTS):
+    """
+    Aggregates every log in paths, one file per worker process.
+    """
+    if np is None:
+        raise ImportError("analytics needs NumPy: pip install numpy")
+
+    stats = new_stats()
+    if workers == 1 or len(paths) == 1:
+        for path in paths:
+            merge_stats(stats, analyze_file(path, chunk))
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(analyze_file, paths, [chunk] * len(paths)):
+            merge_stats(stats, result)
+    return stats
+
+
+def summarize(stats):
+    """
+    Turns raw stats into the report numbers.
+    """
+    shots, hits = stats["shots"], stats["hits"]
+    first_total, first_games = stats["first_hit_total"], stats["first_hit_games"]
+    return {
+        "games": stats["games"],
+        "accuracy": [float(hits[i] / shots[i]) if shots[i] else 0.0 for i in (0, 1)],
+        "wins": [int(w) for w in stats["wins"]],
+        "first_hit_latency": [float(first_total[i] / first_games[i]) if first_games[i] else 0.0
+                              for i in (0, 1)],
+        "shots_to_sink": {name: total / count for name, (total, count) in stats["sink_shots"].items()},
+    }
+
+
+def heatmap_lines(heat):
+    """
+    Text rendering of a heatmap, darker for higher counts.
+    """
+    size = len(heat)
+    top = heat.max() or 1
+    lines = ["   " + " ".join(column_label(c) for c in range(size))]
+    for r in range(size):
+        shades = (heat[r] * (len(SHADES) - 1) // top).astype(int)
+        lines.append(f"{r + 1:>2} " + " ".join(SHADES[s] for s in shades))
+    return lines
+
+
+def print_report(stats):
+    report = summarize(stats)
+    print(f"Games: {report['games']}")
+    for i in (0, 1):
+        print(f"Player {i + 1}: accuracy {report['accuracy'][i] * 100:.1f}%, "
+              f"wins {report['wins'][i]}, first hit after {report['first_hit_latency'][i]:.1f} shots")
+    print("\nShots to sink (first hit to sinking):")
+    sink = report["shots_to_sink"]
+    names = [name for name, _ in fleet if name in sink] + sorted(set(sink) - {name for name, _ in fleet})
+    for name in names:
+        print(f"  {name:<12} {sink[name]:.1f}")
+    for size, heat in sorted(stats["hit_heat"].items()):
+        print(f"\nHits, {size}x{size}:")
+        print("\n".join(heatmap_lines(heat)))
+    for size, heat in sorted(stats["ship_heat"].items()):
+        print(f"\nShip placements, {size}x{size}:")
+        print("\n".join(heatmap_lines(heat)))
+
+
+def main():
+    """
+    Command line entry point:
+    python analytics.py games-*.bsel --workers 4 --heatmaps heat.npz
+    """
+    parser = argparse.ArgumentParser(description="Stats over archived Battleship event logs.")
+    parser.add_argument("logs", nargs="+")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--heatmaps", default=None, help="also save the heatmaps to this .npz file")
+    args = parser.parse_args()
+
+    stats = analyze(args.logs, args.workers)
+    print_report(stats)
+    if args.heatmaps:
+        np.savez(args.heatmaps,
+                 **{f"hits_{size}": heat for size, heat in stats["hit_heat"].items()},
+                 **{f"ships_{size}": heat for size, heat in stats["ship_heat"].items()})
+
+
+if __name__ == "__main__":
+    main()
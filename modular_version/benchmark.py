@@ -0,0 +1,188 @@
+# benchmark.py - Times the hot paths across grid and fleet sizes, writes the
+# results as JSON and flags regressions against a stored baseline.
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from state import scaled_fleet, Cell, PlayerBoard
+from board import print_single_grid
+from placement import validate_grid_and_place_ship, place_ship_randomly, random_ship_layout
+from gameplay import check_if_ship_sunk
+from engine import new_game
+from simulate import play_game
+
+GRID_SIZES = (10, 20, 50)
+FLEET_SCALES = (1, 4)
+BASELINE = "bench_baseline.json"
+
+
+def best_time(fn, ops, repeat, number):
+    """
+    Times `number` back-to-back calls of fn(), `repeat` times over, and
+    returns the best time per operation in microseconds.
+    fn must perform `ops` operations per call.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / (number * ops) * 1e6
+
+
+def bench_validate(size, ships, repeat, number, rng):
+    _, layout = random_ship_layout(ships, size, rng)
+    spans = [(s["coords"][0][0], s["coords"][-1][0], s["coords"][0][1], s["coords"][-1][1])
+             for s in layout]
+    boards = iter([PlayerBoard("Bench", size=size) for _ in range(repeat * number)])
+
+    def run():
+        player = next(boards)
+        for span in spans:
+            validate_grid_and_place_ship(player, *span)
+
+    return best_time(run, len(spans), repeat, number)
+
+
+def bench_place_randomly(size, ships, repeat, number, rng):
+    boards = iter([PlayerBoard("Bench", size=size) for _ in range(repeat * number)])
+    sink = io.StringIO()
+
+    def run():
+        player = next(boards)
+        with contextlib.redirect_stdout(sink):
+            for ship_name, ship_len in ships:
+                place_ship_randomly(player, ship_name, ship_len, rng)
+
+    return best_time(run, len(ships), repeat, number)
+
+
+def bench_check_sunk(size, ships, repeat, number, rng):
+    _, fleet_1 = random_ship_layout(ships, size, rng)
+    _, fleet_2 = random_ship_layout(ships, size, rng)
+    session = new_game(fleet_1, fleet_2, size)
+    defender = session.defender
+
+    # Hit the first cell of every enemy ship, so none of them sinks
+    cells = [ship["coords"][0] for ship in fleet_2]
+    for r, c in cells:
+        defender.grid[r][c] = Cell.HIT
+        defender.ship_health[defender.ship_at[(r, c)]] -= 1
+
+    def run():
+        for r, c in cells:
+            check_if_ship_sunk(session, r, c)
+
+    return best_time(run, len(cells), repeat, number)
+
+
+def bench_print_grid(size, ships, repeat, number, rng):
+    grid, _ = random_ship_layout(ships, size, rng)
+    sink = io.StringIO()
+
+    def run():
+        sink.seek(0)
+        with contextlib.redirect_stdout(sink):
+            print_single_grid("Bench", grid, reveal_ships=True)
+
+    return best_time(run, 1, repeat, number)
+
+
+def bench_full_game(size, ships, repeat, number, rng):
+    seed = rng.random()
+
+    def run():
+        # Same game every time, so repeats are comparable
+        play_game(("density", "random"), random.Random(seed), ships, size)
+
+    return best_time(run, 1, repeat, number)
+
+
+# name -> (benchmark, calls per timed run)
+BENCHMARKS = {
+    "validate_grid_and_place_ship": (bench_validate, 100),
+    "place_ship_randomly": (bench_place_randomly, 20),
+    "check_if_ship_sunk": (bench_check_sunk, 2000),
+    "print_single_grid": (bench_print_grid, 50),
+    "full_game": (bench_full_game, 3),
+}
+
+
+def run_benchmarks(sizes=GRID_SIZES, scales=FLEET_SCALES, repeat=5, seed=0, names=None):
+    """
+    Runs every benchmark for every grid size and fleet scale that fits.
+    Returns {"benchmark/size/fleet": microseconds per operation}.
+    """
+    results = {}
+    for name, (bench, number) in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        for size in sizes:
+            for scale in scales:
+                ships = scaled_fleet(scale)
+                # Skip fleets that would cover more than a fifth of the board
+                if sum(ship_len for _, ship_len in ships) * 5 > size * size:
+                    continue
+                rng = random.Random(seed)
+                results[f"{name}/{size}/{len(ships)}"] = bench(size, ships, repeat, number, rng)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns [(key, baseline_us, current_us)] for every benchmark that got
+    slower than baseline * (1 + tolerance).
+    """
+    regressions = []
+    for key, base in baseline.items():
+        current = results.get(key)
+        if current is not None and current > base * (1 + tolerance):
+            regressions.append((key, base, current))
+    return regressions
+
+
+def main():
+    """
+    Command line entry point:
+    python benchmark.py --out bench.json
+    Compares against bench_baseline.json and exits with status 1 if any
+    benchmark regressed past the tolerance. Copy bench.json over the
+    baseline to accept new numbers.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark Battleship hot paths.")
+    parser.add_argument("--out", default="bench.json")
+    parser.add_argument("--baseline", default=BASELINE, help="JSON file from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS))
+    args = parser.parse_args()
+
+    results = run_benchmarks(repeat=args.repeat, names=args.only)
+    with open(args.out, "w") as f:
+        json.dump({"python": platform.python_version(), "results": results}, f, indent=2)
+
+    for key, us in results.items():
+        print(f"{key:<40} {us:>12.2f} us")
+    print(f"\nResults written to {args.out}")
+
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for key, base, current in regressions:
+            print(f"REGRESSION {key}: {base:.2f} us -> {current:.2f} us")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
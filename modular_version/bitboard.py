@@ -0,0 +1,162 @@
+# bitboard.py - Board backend that keeps ship, hit and miss layers as integer
+# bitmasks (bit = row * size + col). Drop-in for the list-of-lists grid.
+
+from state import Cell
+
+
+class _BitRow:
+    """
+    One row of a BitBoard, so that board[row][col] reads and writes
+    work exactly like the list-of-lists grid.
+    """
+    __slots__ = ("board", "offset")
+
+    def __init__(self, board, row):
+        self.board = board
+        self.offset = row * board.size
+
+    def __len__(self):
+        return self.board.size
+
+    def __getitem__(self, col):
+        if not (0 <= col < self.board.size):
+            raise IndexError("column out of range")
+        return self.board.cell(1 << (self.offset + col))
+
+    def __setitem__(self, col, value):
+        if not (0 <= col < self.board.size):
+            raise IndexError("column out of range")
+        self.board.set_cell(1 << (self.offset + col), value)
+
+    def __iter__(self):
+        return (self[c] for c in range(self.board.size))
+
+
+class BitBoard:
+    """
+    Ship, hit and miss layers stored as integers, plus one mask per ship.
+    Already-shot, sunk and all-sunk checks are single bitwise operations.
+    """
+    __slots__ = ("size", "ship_mask", "hit_mask", "miss_mask", "ship_masks", "ships", "ship_at")
+
+    def __init__(self, size):
+        self.size = size
+        self.ship_mask = 0
+        self.hit_mask = 0
+        self.miss_mask = 0
+        self.ship_masks = []           # one mask per ship, same order as ships
+        self.ships = []                # the {"name", "coords"} dicts
+        self.ship_at = {}              # bit position -> ship index
+
+    @classmethod
+    def from_ships(cls, ship_positions, size):
+        """
+        Builds an untouched board from a list of {"name", "coords"} ships.
+        Same signature as engine.grid_from_ships.
+        """
+        board = cls(size)
+        for ship in ship_positions:
+            board.add_ship(ship)
+        return board
+
+    def add_ship(self, ship):
+        """
+        Adds a {"name", "coords"} ship and its mask to the board.
+        """
+        mask = 0
+        for r, c in ship["coords"]:
+            pos = r * self.size + c
+            self.ship_at[pos] = len(self.ships)
+            mask |= 1 << pos
+        self.ship_masks.append(mask)
+        self.ships.append(ship)
+        self.ship_mask |= mask
+
+    # --- list-of-lists grid API ---
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, row):
+        if not (0 <= row < self.size):
+            raise IndexError("row out of range")
+        return _BitRow(self, row)
+
+    def __iter__(self):
+        return (_BitRow(self, r) for r in range(self.size))
+
+    def cell(self, bit):
+        """
+        Returns the Cell value stored at a single-bit mask.
+        """
+        if self.hit_mask & bit:
+            return Cell.HIT
+        if self.miss_mask & bit:
+            return Cell.MISS
+        if self.ship_mask & bit:
+            return Cell.SHIP
+        return Cell.EMPTY
+
+    def set_cell(self, bit, value):
+        """
+        Stores a Cell value at a single-bit mask.
+        """
+        self.hit_mask &= ~bit
+        self.miss_mask &= ~bit
+        if value == Cell.HIT:
+            self.hit_mask |= bit
+            self.ship_mask |= bit
+        elif value == Cell.MISS:
+            self.miss_mask |= bit
+            self.ship_mask &= ~bit
+        elif value == Cell.SHIP:
+            self.ship_mask |= bit
+        else:
+            self.ship_mask &= ~bit
+
+    # --- fast paths ---
+
+    def already_shot(self, row, col):
+        return bool((self.hit_mask | self.miss_mask) >> (row * self.size + col) & 1)
+
+    def shoot(self, row, col):
+        """
+        Marks a shot at (row, col).
+        Returns (hit, sunk_ship) where sunk_ship is the ship dict
+        if this shot finished it off, otherwise None.
+        Raises ValueError if the cell was already shot.
+        """
+        pos = row * self.size + col
+        bit = 1 << pos
+        if (self.hit_mask | self.miss_mask) & bit:
+            raise ValueError("Cell already shot.")
+
+        if not self.ship_mask & bit:
+            self.miss_mask |= bit
+            return False, None
+
+        self.hit_mask |= bit
+        i = self.ship_at.get(pos)
+        if i is None or not self.is_sunk(i):
+            return True, None
+        return True, self.ships[i]
+
+    def shots(self):
+        """
+        (row, col, cell) for every shot cell.
+        """
+        result = []
+        for mask, cell in ((self.hit_mask, Cell.HIT), (self.miss_mask, Cell.MISS)):
+            while mask:
+                low = mask & -mask
+                row, col = divmod(low.bit_length() - 1, self.size)
+                result.append((row, col, cell))
+                mask ^= low
+        return result
+
+    def is_sunk(self, index):
+        mask = self.ship_masks[index]
+        return self.hit_mask & mask == mask
+
+    def all_sunk(self):
+        return self.ship_mask & ~self.hit_mask == 0
@@ -1,40 +1,134 @@
 # board.py - Handles grid display + coordinate input formatting
 
+from functools import lru_cache
+from time import perf_counter
+
+import metrics
 from state import alphabet, grid_size, Cell
 
-def input_coordinate(prompt):
+def column_label(col):
+    """
+    Spreadsheet-style column name: 0 -> A, 25 -> Z, 26 -> AA, 27 -> AB.
+    """
+    label = ""
+    col += 1
+    while col:
+        col, rem = divmod(col - 1, 26)
+        label = alphabet[rem] + label
+    return label
+
+
+class CoordinateError(ValueError):
+    """
+    Raised for coordinate text that cannot be parsed. reason is a short
+    label ('format', 'row', 'column' or 'bounds') for the rejected-input
+    metric; the message is for the player.
+    """
+
+    def __init__(self, message, reason):
+        super().__init__(message)
+        self.reason = reason
+
+
+@lru_cache(maxsize=None)
+def coordinate_tables(size):
+    """
+    Precomputed lookups for a board size: column label -> col and
+    row number text -> row, both 0-indexed.
+    """
+    columns = {column_label(c): c for c in range(size)}
+    rows = {str(r + 1): r for r in range(size)}
+    return columns, rows
+
+
+def parse_coordinate(text, size=grid_size):
+    """
+    Turns text like 'A5', 'a 5' or 'AB12' into (row, col), 0-indexed.
+    Raises CoordinateError with a player-facing message if it is not valid.
+    """
+    text = "".join(text.split()).upper()
+    row_part = text.lstrip(alphabet)
+    letters = text[:len(text) - len(row_part)]
+
+    if not letters or not row_part:
+        raise CoordinateError("Invalid format. Use e.g. A5.", "format")
+    if row_part.strip("0123456789"):
+        raise CoordinateError("Row must be a number.", "row")
+
+    columns, rows = coordinate_tables(size)
+
+    col = columns.get(letters)
+    if col is None:
+        raise CoordinateError("Invalid column letter.", "column")
+
+    row = rows.get(row_part.lstrip("0"))
+    if row is None:
+        raise CoordinateError("Coordinates out of bounds.", "bounds")
+
+    return row, col
+
+
+def input_coordinate(prompt, size=grid_size):
     """
     Reads a user-entered coordinate like 'A5',
     validates its format and board boundaries,
     and returns (row, col) as 0-indexed integers.
     """
     while True:
-        text = input(prompt).strip().upper()
+        try:
+            return parse_coordinate(input(prompt), size)
+        except CoordinateError as error:
+            if metrics.enabled:
+                metrics.REJECTED_COORDINATES.inc(label=error.reason)
+            print(error)
 
-        if len(text) < 2:
-            print("Invalid format. Use e.g. A5.")
-            continue
 
-        col_letter = text[0]
-        row_part = text[1:]
+# Display symbol per cell, with own ships shown or hidden
+SYMBOLS_REVEALED = {
+    Cell.EMPTY: ".",
+    Cell.SHIP: "S",    # show own ships
+    Cell.MISS: "O",    # shot but water
+    Cell.HIT: "X",     # shot & hit
+}
+SYMBOLS_HIDDEN = {cell: ("." if cell == Cell.SHIP else symbol) for cell, symbol in SYMBOLS_REVEALED.items()}
 
-        if col_letter not in alphabet[:grid_size]:
-            print("Invalid column letter.")
-            continue
 
-        try:
-            row = int(row_part) - 1
-        except ValueError:
-            print("Row must be a number.")
-            continue
+@lru_cache(maxsize=None)
+def _widths(size):
+    """
+    (row number width, column width) for a board size.
+    Standard boards keep the classic ' 1 . . .' layout.
+    """
+    return max(2, len(str(size))), len(column_label(size - 1))
 
-        col = alphabet.index(col_letter)
 
-        if not (0 <= row < grid_size and 0 <= col < grid_size):
-            print("Coordinates out of bounds.")
-            continue
+def format_header(size):
+    """
+    Column labels line shown above a grid.
+    """
+    row_width, col_width = _widths(size)
+    labels = " ".join(column_label(c).rjust(col_width) for c in range(size))
+    return " " * (row_width + 1) + labels
+
 
-        return row, col
+def format_row(r, row, reveal_ships):
+    """
+    One grid row with its row number, e.g. ' 3 . S X O'.
+    """
+    symbols = SYMBOLS_REVEALED if reveal_ships else SYMBOLS_HIDDEN
+    row_width, col_width = _widths(len(row))
+    pad = " " * (col_width - 1)
+    return f"{r+1:>{row_width}} " + " ".join([pad + symbols[cell] for cell in row])
+
+
+def grid_lines(title, grid, reveal_ships):
+    """
+    The lines print_single_grid shows: blank, title, header, rows, blank.
+    """
+    lines = ["", title, format_header(len(grid))]
+    lines.extend(format_row(r, row, reveal_ships) for r, row in enumerate(grid))
+    lines.append("")
+    return lines
 
 
 def print_single_grid(title, grid, reveal_ships: bool):
@@ -43,22 +137,7 @@ def print_single_grid(title, grid, reveal_ships: bool):
     Shows ship positions only if reveal_ships=True.
     Marks hits as X and misses as O.
     """
-    print(f"\n{title}")
-    print("   " + " ".join(alphabet[i] for i in range(grid_size)))
-
-    for r in range(grid_size):
-        row_display = []
-        for c in range(grid_size):
-            cell = grid[r][c]
-
-            if cell == Cell.HIT:
-                row_display.append("X")   # shot & hit
-            elif cell == Cell.MISS:
-                row_display.append("O")   # shot but water
-            elif reveal_ships and cell == Cell.SHIP:
-                row_display.append("S")   # show own ships
-            else:
-                row_display.append(".")   
-
-        print(f"{r+1:2} " + " ".join(row_display))
-    print()
+    start = perf_counter() if metrics.enabled else 0
+    print("\n".join(grid_lines(title, grid, reveal_ships)))
+    if start:
+        metrics.PRINT_GRID_SECONDS.observe(perf_counter() - start)
@@ -0,0 +1,240 @@
+# client.py - Local client for the multiplayer server. Sends JSON-line
+# requests, matches replies to them and queues pushed events. Also has a
+# random-shooting bot and a console front end for playing a match by hand.
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+from state import fleet, grid_size
+from board import column_label
+from ai import RandomAI
+from engine import Outcome, ShotResult
+
+
+class ServerError(Exception):
+    """
+    The server refused a request.
+    """
+
+
+class BattleshipClient:
+    """
+    One connection to a BattleshipServer.
+    request() waits for the matching reply; events go to self.events.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.events = asyncio.Queue()
+        self.pending = {}              # request id -> future
+        self.ids = itertools.count(1)
+        self.listener = asyncio.ensure_future(self._listen())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765):
+        reader, writer = await asyncio.open_connection(host, port, limit=1 << 16)
+        return cls(reader, writer)
+
+    async def _listen(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                future = self.pending.pop(message.get("id"), None)
+                if future is not None:
+                    future.set_result(message)
+                else:
+                    await self.events.put(message)
+        except ConnectionError:
+            pass
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection closed."))
+            self.pending.clear()
+            await self.events.put({"event": "closed"})
+
+    async def request(self, op, **fields):
+        """
+        Sends one request and returns the reply.
+        Raises ServerError if the server refused it.
+        """
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        self.writer.write((json.dumps(dict(fields, op=op, id=request_id)) + "\n").encode())
+        await self.writer.drain()
+        reply = await future
+        if not reply["ok"]:
+            raise ServerError(reply["error"])
+        return reply
+
+    async def wait_for(self, *names):
+        """
+        Returns the next event whose name is in names, dropping others.
+        """
+        while True:
+            event = await self.events.get()
+            if event["event"] in names or event["event"] == "closed":
+                return event
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self.listener
+
+
+async def play_bot(client, rng, match=None, name="Bot", size=grid_size, salvo=False):
+    """
+    Plays one match with random placement and RandomAI shots.
+    Creates a match (with salvo rules if salvo), or joins `match` if given.
+    Returns the winner's name, or None if the opponent left.
+    """
+    if match is None:
+        await client.request("new", name=name, salvo=salvo)
+        await client.wait_for("joined")
+        me = 0
+    else:
+        await client.request("join", match=match, name=name)
+        me = 1
+    return await play_match(client, me, rng, size)
+
+
+async def play_match(client, me, rng, size=grid_size, ships=None, interval=0, latencies=None):
+    """
+    Places a fleet and shoots with RandomAI until the match ends,
+    a volley per turn in salvo matches.
+    ships is a list of {"name", "coords"} dicts; None lets the server
+    place at random. Waits `interval` seconds before each shot and appends
+    each shot's round trip in seconds to latencies, if given.
+    Returns the winner's name, or None if the opponent left.
+    """
+    if ships is None:
+        await client.request("place", random=True)
+    else:
+        await client.request("place", ships=ships)
+
+    event = await client.wait_for("start")
+    if event["event"] != "start":
+        return None
+    turn = event["turn"]
+    salvo = event.get("salvo", False)
+    shots_allowed = len(fleet)
+
+    shooter = RandomAI(size, fleet, rng)
+    while True:
+        if turn == me:
+            if interval:
+                await asyncio.sleep(interval)
+            start = time.perf_counter()
+            if salvo:
+                targets = shooter.choose_volley(shots_allowed)
+                reply = await client.request("fire", targets=[list(target) for target in targets])
+                shots = reply["shots"]
+                won = reply["won"]
+            else:
+                row, col = shooter.choose_shot()
+                reply = await client.request("fire", row=row, col=col)
+                shots = [reply]
+                won = reply["result"] == "win"
+            if latencies is not None:
+                latencies.append(time.perf_counter() - start)
+            for shot in shots:
+                shooter.observe(ShotResult(Outcome[shot["result"].upper()], shot["row"], shot["col"]))
+            if won:
+                break
+        event = await client.wait_for("volley" if salvo else "incoming", "left")
+        if event["event"] == "left":
+            return None
+        if salvo:
+            shots_allowed = event["shots_allowed"]
+            if event["won"]:
+                break
+        elif event["result"] == "win":
+            break
+        turn = me
+
+    event = await client.wait_for("game_over")
+    return event.get("winner")
+
+
+async def play_console(host, port, match=None, name="Player"):
+    """
+    Plays a match by hand from the terminal, e.g. against a bot.
+    """
+    client = await BattleshipClient.connect(host, port)
+    loop = asyncio.get_running_loop()
+
+    if match is None:
+        reply = await client.request("new", name=name)
+        print(f"Created match {reply['match']}, waiting for an opponent...")
+        await client.wait_for("joined")
+        me = 0
+    else:
+        await client.request("join", match=match, name=name)
+        me = 1
+    await client.request("place", random=True)
+    event = await client.wait_for("start")
+    turn = event.get("turn")
+    salvo = event.get("salvo", False)
+
+    while event["event"] not in ("game_over", "left", "closed"):
+        if turn == me:
+            prompt = "Targets (e.g. A5 B6 C7): " if salvo else "Target (e.g. A5): "
+            target = await loop.run_in_executor(None, input, prompt)
+            try:
+                if salvo:
+                    reply = await client.request("fire", targets=target.split())
+                else:
+                    reply = await client.request("fire", target=target.strip())
+            except ServerError as error:
+                print(error)
+                continue
+            shots = reply["shots"] if salvo else [reply]
+            for shot in shots:
+                print(shot["result"].upper() + (f" - {shot['ship']}" if shot["ship"] else ""))
+            if shots[-1]["result"] == "win":
+                event = await client.wait_for("game_over")
+                break
+        event = await client.wait_for("volley" if salvo else "incoming", "left")
+        if event["event"] != "left":
+            shots = event["shots"] if salvo else [event]
+            for shot in shots:
+                print(f"Opponent fired at {column_label(shot['col'])}{shot['row'] + 1}: {shot['result']}")
+            if shots[-1]["result"] == "win":
+                event = await client.wait_for("game_over")
+        turn = me
+
+    if event["event"] == "game_over":
+        print(f"{event['winner']} wins!")
+    else:
+        print("Opponent left.")
+    await client.close()
+
+
+def main():
+    """
+    Command line entry point:
+    python client.py                 (create a match and wait)
+    python client.py --match 1      (join match 1)
+    """
+    parser = argparse.ArgumentParser(description="Battleship multiplayer client.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--match", type=int, default=None)
+    parser.add_argument("--name", default="Player")
+    args = parser.parse_args()
+    asyncio.run(play_console(args.host, args.port, args.match, args.name))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+# engine.py - Headless rules engine: build a game from two fleets, fire shots,
+# get structured results back. No input() or print() in here.
+
+from enum import Enum
+from time import perf_counter
+
+import metrics
+from state import grid_size, empty_grid, Cell, GameSession, PlayerBoard
+from zobrist import record_shot, fleet_key
+
+
+class Outcome(Enum):
+    MISS = 0         # shot landed in water
+    HIT = 1          # ship hit, still afloat
+    SUNK = 2         # ship hit and fully destroyed
+    WIN = 3          # last enemy ship destroyed
+
+
+class ShotResult:
+    """
+    Outcome of a single shot.
+    ship is the sunk ship dict ({"name", "coords"}) for SUNK/WIN, otherwise None.
+    """
+    __slots__ = ("outcome", "row", "col", "ship")
+
+    def __init__(self, outcome, row, col, ship=None):
+        self.outcome = outcome
+        self.row = row
+        self.col = col
+        self.ship = ship
+
+    def __repr__(self):
+        name = f", {self.ship['name']}" if self.ship else ""
+        return f"ShotResult({self.outcome.name}, {self.row}, {self.col}{name})"
+
+
+def grid_from_ships(ship_positions, size):
+    """
+    Builds an untouched grid with every ship cell marked as SHIP.
+    """
+    grid = empty_grid(size)
+    for ship in ship_positions:
+        for r, c in ship["coords"]:
+            grid[r][c] = Cell.SHIP
+    return grid
+
+
+def new_game(fleet_1, fleet_2, size=grid_size, names=("Player 1", "Player 2"),
+             board_factory=grid_from_ships, log=None, salvo=False):
+    """
+    Creates a GameSession from two fleets, each a list of {"name", "coords"} ships.
+    board_factory(ship_positions, size) builds each board, e.g. BitBoard.from_ships.
+    log, an eventlog.EventLog, records the placements and every shot fired.
+    salvo switches on the salvo rules (see fire_many).
+    Player 1 moves first.
+    """
+    players = []
+    for name, ships in zip(names, (fleet_1, fleet_2)):
+        player = PlayerBoard(name, board_factory(ships, size), ships)
+        index_ships(player)
+        players.append(player)
+    session = GameSession(names, size, players)
+    session.salvo = salvo
+    if log is not None:
+        session.log = log
+        log.start_game(session)
+    return session
+
+
+def index_ships(player):
+    """
+    Builds the player's cell -> ship lookup and remaining health per ship,
+    so resolving a hit never has to scan the fleet.
+    Health counts the cells of each ship that are not HIT yet.
+    Also starts the board's view hash from its fleet; boards restored
+    with shots on them need zobrist.view_hash instead.
+    """
+    grid = player.grid
+    player.ship_at = {}
+    player.ship_health = []
+
+    for i, ship in enumerate(player.ship_positions):
+        health = 0
+        for r, c in ship["coords"]:
+            player.ship_at[(r, c)] = i
+            if grid[r][c] != Cell.HIT:
+                health += 1
+        player.ship_health.append(health)
+    ships = ((ship["name"], len(ship["coords"])) for ship in player.ship_positions)
+    player.view_hash = fleet_key(ships, len(grid))
+
+
+def shoot_grid(player, row, col):
+    """
+    Marks a shot on a player's list-of-lists grid and updates ship health.
+    Returns (hit, sunk_ship), same contract as BitBoard.shoot.
+    """
+    grid = player.grid
+    cell = grid[row][col]
+    if cell in (Cell.HIT, Cell.MISS):
+        raise ValueError("Cell already shot.")
+
+    if cell != Cell.SHIP:
+        grid[row][col] = Cell.MISS
+        return False, None
+
+    grid[row][col] = Cell.HIT
+    i = player.ship_at[(row, col)]
+    player.ship_health[i] -= 1
+    return True, (player.ship_positions[i] if player.ship_health[i] == 0 else None)
+
+
+def _resolve(session, attacker_index, row, col):
+    """
+    Applies one shot that has already been checked and returns its ShotResult.
+    """
+    attacker = session.players[attacker_index]
+    defender = session.players[1 - attacker_index]
+    grid = defender.grid
+
+    if isinstance(grid, list):
+        hit, ship = shoot_grid(defender, row, col)
+    else:
+        hit, ship = grid.shoot(row, col)   # board backends, e.g. BitBoard
+
+    attacker.shots_taken += 1
+    defender.view_hash = record_shot(defender.view_hash, session.grid_size, row, col, hit, ship)
+
+    if not hit:
+        attacker.misses += 1
+        result = ShotResult(Outcome.MISS, row, col)
+    else:
+        attacker.hits += 1
+        if ship is None:
+            result = ShotResult(Outcome.HIT, row, col)
+        else:
+            attacker.ships_sunk += 1
+            if attacker.ships_sunk == len(defender.ship_positions):
+                session.winner = attacker_index
+                result = ShotResult(Outcome.WIN, row, col, ship)
+            else:
+                result = ShotResult(Outcome.SUNK, row, col, ship)
+
+    if session.log is not None:
+        session.log.shot(session, attacker_index, result)
+    return result
+
+
+def fire(session, row, col):
+    """
+    Fires the current player's shot at (row, col) on the opponent's grid.
+    Updates the counters, hands the turn over and returns a ShotResult.
+    Raises ValueError for shots off the board, repeated shots or a finished game.
+    """
+    start = perf_counter() if metrics.enabled else 0
+    if session.winner is not None:
+        raise ValueError("Game is already over.")
+
+    if not (0 <= row < session.grid_size and 0 <= col < session.grid_size):
+        raise ValueError("Coordinates out of bounds.")
+
+    attacker_index = session.current_player
+    session.current_player = 1 - attacker_index
+    try:
+        result = _resolve(session, attacker_index, row, col)
+    except ValueError:
+        session.current_player = attacker_index
+        raise
+
+    if start:
+        metrics.FIRE_SECONDS.observe(perf_counter() - start)
+    return result
+
+
+class VolleyResult:
+    """
+    Outcome of a whole volley: one ShotResult per shot fired, in order,
+    plus the totals. sunk lists the ship dicts the volley sank.
+    """
+    __slots__ = ("shots", "hits", "misses", "sunk", "won")
+
+    def __init__(self, shots):
+        self.shots = shots
+        self.hits = sum(1 for shot in shots if shot.outcome != Outcome.MISS)
+        self.misses = len(shots) - self.hits
+        self.sunk = [shot.ship for shot in shots if shot.ship is not None]
+        self.won = bool(shots) and shots[-1].outcome == Outcome.WIN
+
+    def __repr__(self):
+        return f"VolleyResult({len(self.shots)} shots, {self.hits} hits, {len(self.sunk)} sunk)"
+
+
+def salvo_shots(session):
+    """
+    How many shots the current player may fire this turn: one per
+    surviving ship under salvo rules, otherwise one.
+    """
+    if not session.salvo:
+        return 1
+    attacker = session.players[session.current_player]
+    defender = session.players[1 - session.current_player]
+    return len(attacker.ship_positions) - defender.ships_sunk
+
+
+def fire_many(session, targets):
+    """
+    Fires a volley of (row, col) targets for the current player in one call
+    and hands the turn over once. Every target is checked before any is
+    fired: on the board, not shot before, not repeated in the volley, and
+    at most salvo_shots(session) of them. So a bad volley changes nothing.
+    Shots after the one that wins the game are not fired.
+    Returns a VolleyResult. Raises ValueError.
+    """
+    start = perf_counter() if metrics.enabled else 0
+    if session.winner is not None:
+        raise ValueError("Game is already over.")
+
+    targets = [(row, col) for row, col in targets]
+    allowed = salvo_shots(session)
+    if not targets:
+        raise ValueError("A volley needs at least one target.")
+    if len(targets) > allowed:
+        raise ValueError(f"Only {allowed} shot(s) allowed this turn.")
+
+    size = session.grid_size
+    attacker_index = session.current_player
+    grid = session.players[1 - attacker_index].grid
+    seen = set()
+    for row, col in targets:
+        if not (0 <= row < size and 0 <= col < size):
+            raise ValueError("Coordinates out of bounds.")
+        if (row, col) in seen:
+            raise ValueError("Same cell twice in one volley.")
+        if grid[row][col] in (Cell.HIT, Cell.MISS):
+            raise ValueError("Cell already shot.")
+        seen.add((row, col))
+
+    session.current_player = 1 - attacker_index
+    shots = []
+    for row, col in targets:
+        shots.append(_resolve(session, attacker_index, row, col))
+        if session.winner is not None:
+            break
+
+    if start:
+        metrics.VOLLEY_SECONDS.observe(perf_counter() - start)
+    return VolleyResult(shots)
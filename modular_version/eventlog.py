@@ -0,0 +1,359 @@
+# eventlog.py - Append-only game log. Every placement and shot is one
+# fixed-size 8-byte event; a streaming reader replays the events into board
+# state, and periodic snapshot checkpoints let a reader jump to turn N of a
+# long game without replaying it from the start.
+#
+# Log file: 8-byte header (magic "BSEL", version), then events
+#   kind u8, player u8, row u16, col u16, aux u16
+#   NEW_GAME  player = 1 for salvo rules, row = grid size,
+#             col = ships per player, aux = fleet scale
+#             (0 if the ship names are not a scaled_fleet)
+#   PLACE     row, col = first cell, aux = length | direction << 12
+#   SHOT      player = shooter, row, col, aux = Outcome value
+#
+# Checkpoint file (log path + ".ckpt"): records of
+#   game u32, turn u32, event index u64, snapshot length u32, snapshot
+
+import os
+import struct
+
+from state import fleet, scaled_fleet, Cell, GameSession
+from engine import Outcome
+from snapshot import dumps, loads, ship_span, ship_coords
+from zobrist import view_hash
+
+MAGIC = b"BSEL"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")           # magic, version, unused
+EVENT = struct.Struct("<BBHHH")           # kind, player, row, col, aux
+CHECKPOINT = struct.Struct("<IIQI")       # game, turn, event index, snapshot length
+
+NEW_GAME = 1
+PLACE = 2
+SHOT = 3
+
+LENGTH_MASK = 0xFFF
+DIRECTION_SHIFT = 12
+
+CHUNK_EVENTS = 1 << 16
+
+
+class LogError(ValueError):
+    """
+    Raised for a file that is not an event log this version can read.
+    """
+
+
+def fleet_scale(ship_positions):
+    """
+    The scaled_fleet scale whose names match these ships, or 0.
+    """
+    scale, extra = divmod(len(ship_positions), len(fleet))
+    if scale and not extra and \
+            [ship["name"] for ship in ship_positions] == [name for name, _ in scaled_fleet(scale)]:
+        return scale
+    return 0
+
+
+def ship_names(scale, count):
+    if scale:
+        return [name for name, _ in scaled_fleet(scale)]
+    return [f"Ship {i + 1}" for i in range(count)]
+
+
+def scan_kinds(f):
+    """
+    Yields the kind bytes of the whole events from f's position on, one
+    chunk of events at a time, so scanning a log never holds all of it.
+    """
+    while True:
+        chunk = f.read(CHUNK_EVENTS * EVENT.size)
+        if not chunk:
+            return
+        yield chunk[:len(chunk) - len(chunk) % EVENT.size:EVENT.size]
+
+
+def event_count(path):
+    """
+    Number of whole events in a log file.
+    """
+    return max(0, os.path.getsize(path) - HEADER.size) // EVENT.size
+
+
+def check_header(f):
+    header = f.read(HEADER.size)
+    if len(header) != HEADER.size or HEADER.unpack(header)[:2] != (MAGIC, VERSION):
+        raise LogError("Not a Battleship event log this version can read.")
+
+
+class EventLog:
+    """
+    Appends events to a log file.
+    Events are buffered and written in blocks; flush() or close() writes
+    them out. A record torn by a crash is cut off when the log is reopened.
+    Every `checkpoint_every` shots of a game, a snapshot is appended to the
+    checkpoint file; 0 turns checkpoints off.
+    """
+
+    def __init__(self, path, checkpoint_every=1024):
+        self.path = path
+        self.checkpoint_every = checkpoint_every
+        self.buffer = bytearray()
+        self.games = 0                 # games in the log, including earlier runs
+        self.events = 0                # events in the log, including buffered ones
+        self.turn = 0                  # shots so far in the current game
+
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, "r+b") as f:
+                check_header(f)
+                self.events = event_count(path)
+                self.games = sum(kinds.count(NEW_GAME) for kinds in scan_kinds(f))
+                f.truncate(HEADER.size + self.events * EVENT.size)
+            self._trim_checkpoints()
+            self.file = open(path, "ab")
+        else:
+            self.file = open(path, "wb")
+            self.file.write(HEADER.pack(MAGIC, VERSION, 0))
+        self.checkpoints = None
+
+    def _trim_checkpoints(self):
+        """
+        Cuts the checkpoint file after its last whole checkpoint that points
+        into the log, dropping any torn by a crash or past a cut-off tail.
+        """
+        ckpt_path = self.path + ".ckpt"
+        if not os.path.exists(ckpt_path):
+            return
+        end = 0
+        for _, _, event, offset, length in read_checkpoints(self.path):
+            if event > self.events:
+                break
+            end = offset + length
+        if end != os.path.getsize(ckpt_path):
+            with open(ckpt_path, "r+b") as f:
+                f.truncate(end)
+
+    def _write(self, kind, player, row, col, aux):
+        self.buffer += EVENT.pack(kind, player, row, col, aux)
+        self.events += 1
+        if len(self.buffer) >= CHUNK_EVENTS * EVENT.size:
+            self.flush()
+
+    def start_game(self, session):
+        """
+        Records a new game and both fleets.
+        """
+        ships = session.players[0].ship_positions
+        self._write(NEW_GAME, int(session.salvo), session.grid_size, len(ships), fleet_scale(ships))
+        for player_index, player in enumerate(session.players):
+            for ship in player.ship_positions:
+                row, col, length, direction = ship_span(ship)
+                self._write(PLACE, player_index, row, col, length | direction << DIRECTION_SHIFT)
+        self.games += 1
+        self.turn = 0
+
+    def shot(self, session, player, result):
+        """
+        Records a resolved shot, and a checkpoint when one is due.
+        """
+        self._write(SHOT, player, result.row, result.col, result.outcome.value)
+        self.turn += 1
+        if self.checkpoint_every and self.turn % self.checkpoint_every == 0:
+            self.checkpoint(session)
+
+    def checkpoint(self, session):
+        """
+        Appends a snapshot of the game as it stands after the last event.
+        """
+        self.flush()
+        if self.checkpoints is None:
+            self.checkpoints = open(self.path + ".ckpt", "ab")
+        data = dumps(session)
+        self.checkpoints.write(CHECKPOINT.pack(self.games - 1, self.turn, self.events, len(data)) + data)
+        self.checkpoints.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer = bytearray()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+        if self.checkpoints is not None:
+            self.checkpoints.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_events(path, start=0, chunk=CHUNK_EVENTS):
+    """
+    Streams (kind, player, row, col, aux) tuples from event index start,
+    reading `chunk` events at a time. A torn last record is ignored.
+    """
+    with open(path, "rb") as f:
+        check_header(f)
+        f.seek(HEADER.size + start * EVENT.size)
+        while True:
+            data = f.read(chunk * EVENT.size)
+            whole = len(data) - len(data) % EVENT.size
+            if whole:
+                yield from EVENT.iter_unpack(data[:whole] if whole != len(data) else data)
+            if len(data) < chunk * EVENT.size:
+                return
+
+
+def replay(events, session=None, stop_turn=None):
+    """
+    Applies events to board state and yields each game's GameSession,
+    as soon as the next game starts or the events run out.
+    Outcomes are taken from the log rather than recomputed, which keeps
+    replay to a few operations per event.
+    session continues a game already in progress, e.g. one loaded from a
+    checkpoint. With stop_turn, stops after that many shots of the current
+    game and yields it.
+    """
+    names = None
+    turn = 0 if session is None else session.players[0].shots_taken + session.players[1].shots_taken
+    hit, miss, ship_cell = Cell.HIT, Cell.MISS, Cell.SHIP
+    sunk_or_win = (Outcome.SUNK.value, Outcome.WIN.value)
+    win = Outcome.WIN.value
+    miss_value = Outcome.MISS.value
+
+    for kind, player, row, col, aux in events:
+        if kind == SHOT:
+            if stop_turn is not None and turn >= stop_turn:
+                break
+            attacker = session.players[player]
+            defender = session.players[1 - player]
+            attacker.shots_taken += 1
+            session.current_player = 1 - player
+            if aux == miss_value:
+                defender.grid[row][col] = miss
+                attacker.misses += 1
+            else:
+                defender.grid[row][col] = hit
+                attacker.hits += 1
+                defender.ship_health[defender.ship_at[(row, col)]] -= 1
+                if aux in sunk_or_win:
+                    attacker.ships_sunk += 1
+                    if aux == win:
+                        session.winner = player
+            turn += 1
+        elif kind == PLACE:
+            board = session.players[player]
+            coords = ship_coords(row, col, aux & LENGTH_MASK, aux >> DIRECTION_SHIFT)
+            index = len(board.ship_positions)
+            for r, c in coords:
+                board.grid[r][c] = ship_cell
+                board.ship_at[(r, c)] = index
+            board.ship_positions.append({"name": names[index], "coords": coords})
+            board.ship_health.append(len(coords))
+        elif kind == NEW_GAME:
+            if session is not None:
+                yield _hashed(session)
+            session = GameSession(size=row)
+            session.salvo = bool(player)
+            names = ship_names(aux, col)
+            turn = 0
+        else:
+            raise LogError(f"Unknown event kind {kind}.")
+
+    if session is not None:
+        yield _hashed(session)
+
+
+def _hashed(session):
+    # Replay writes cells directly; work the view hashes out once at the end
+    for board in session.players:
+        board.view_hash = view_hash(board)
+    return session
+
+
+def replay_log(path):
+    """
+    Yields every game in a log file, replayed in order.
+    """
+    return replay(read_events(path))
+
+
+def read_checkpoints(path):
+    """
+    Yields (game, turn, event index, snapshot offset, snapshot length)
+    from the checkpoint file, skipping over the snapshots themselves.
+    """
+    ckpt_path = path + ".ckpt"
+    if not os.path.exists(ckpt_path):
+        return
+    size = os.path.getsize(ckpt_path)
+    with open(ckpt_path, "rb") as f:
+        while True:
+            header = f.read(CHECKPOINT.size)
+            if len(header) < CHECKPOINT.size:
+                return
+            game, turn, event, length = CHECKPOINT.unpack(header)
+            offset = f.tell()
+            if offset + length > size:
+                return                 # torn by a crash
+            f.seek(length, os.SEEK_CUR)
+            yield game, turn, event, offset, length
+
+
+def game_start(path, game):
+    """
+    Event index of the NEW_GAME event of game number `game` (0-based).
+    Finds it with a C-level scan over the event kind bytes, reading the
+    log a chunk at a time.
+    Raises KeyError if the log has fewer games.
+    """
+    base = 0
+    left = game
+    with open(path, "rb") as f:
+        check_header(f)
+        for kinds in scan_kinds(f):
+            index = kinds.find(NEW_GAME)
+            while index >= 0:
+                if left == 0:
+                    return base + index
+                left -= 1
+                index = kinds.find(NEW_GAME, index + 1)
+            base += len(kinds)
+    raise KeyError(game)
+
+
+def seek(path, turn, game=0):
+    """
+    GameSession of game number `game` after its first `turn` shots.
+    Starts from the latest checkpoint at or before that turn, if any,
+    and replays only the events after it.
+    """
+    best = None
+    events = event_count(path)
+    for ckpt in read_checkpoints(path):
+        if ckpt[2] > events:
+            break                      # past the end of a log cut short
+        if ckpt[0] == game and ckpt[1] <= turn and (best is None or ckpt[1] > best[1]):
+            best = ckpt
+
+    if best is None:
+        events = read_events(path, game_start(path, game))
+        return next(replay(events, stop_turn=turn))
+
+    _, ckpt_turn, event_index, offset, length = best
+    with open(path + ".ckpt", "rb") as f:
+        f.seek(offset)
+        session = loads(f.read(length))
+
+    # The snapshot may have been taken before the caller handed the turn
+    # over or declared the winner; the shot event that precedes it decides
+    _, player, _, _, aux = next(read_events(path, event_index - 1, 1))
+    session.current_player = 1 - player
+    if aux == Outcome.WIN.value:
+        session.winner = player
+
+    return next(replay(read_events(path, event_index), session, turn))
@@ -0,0 +1,320 @@
+# exact.py - Exact layout counting and per-cell probabilities. Counts every
+# legal layout of the unsunk ships that agrees with the observed misses, hits
+# and sunk ships, with a profile dynamic program over the cells in row-major
+# order, and gets each cell's exact occupancy from a forward-backward pass.
+# Ground truth for the approximate AIs, and a (slow) AI itself.
+#
+# A DP state is one int64 key: for each column, how many cells of a vertical
+# ship still lie below; how many cells of a horizontal ship still lie to the
+# right in this row; and how many ships of each length are still unplaced.
+# Every state reached at a cell is kept once with the number of partial
+# layouts leading to it, so the ~3 * 10^10 layouts of an empty 10 x 10 board
+# collapse into a few hundred thousand states per cell.
+
+import argparse
+import random
+from math import factorial, prod
+
+from state import fleet, grid_size, Cell
+from engine import Outcome
+from ai import DensityAI
+from board import column_label, parse_coordinate
+from zobrist import ViewHash, ProbabilityCache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only this module needs it
+    np = None
+
+
+class LayoutCounter:
+    """
+    Counts the layouts of `ships` ((name, length) pairs) on a size x size
+    board that avoid the blocked cells (misses and sunk ships), cover every
+    unresolved hit, and leave no ship entirely on hits (it would have been
+    reported sunk). Cells are flat indexes, row * size + col.
+    Raises ValueError when the counts would not fit in 64 bits.
+    """
+
+    def __init__(self, size=grid_size, ships=fleet, blocked=(), hits=()):
+        if np is None:
+            raise ImportError("exact counting needs NumPy: pip install numpy")
+        self.size = size
+        self.blocked = frozenset(blocked)
+        self.hits = frozenset(hits)
+
+        ship_lens = [ship_len for _, ship_len in ships]
+        self.lengths = sorted(set(ship_lens), reverse=True)
+        self.counts = [ship_lens.count(ship_len) for ship_len in self.lengths]
+        # Ships of the same length are told apart by name
+        self.labels = prod(factorial(count) for count in self.counts)
+
+        # Partial layouts per state never exceed this, nor does F * B
+        bound = prod((2 * size * (size - ship_len + 1) + 1) ** count
+                     for ship_len, count in zip(self.lengths, self.counts))
+        bits = max(1, (max(self.lengths, default=1) - 1).bit_length())
+        self.bits = bits
+        self.vmask = (1 << bits) - 1
+        self.hshift = size * bits
+        self.rem_shifts = []
+        shift = self.hshift + bits
+        for count in self.counts:
+            self.rem_shifts.append(shift)
+            shift += count.bit_length()
+        if shift > 63 or bound >= 1 << 63:
+            raise ValueError("Board too large to count exactly in 64 bits.")
+        self.start = sum(count << s for count, s in zip(self.counts, self.rem_shifts))
+
+        # Placements that fit the observations, by first cell:
+        # (length index, column mask it must find clear or None for vertical)
+        self.starts = [[] for _ in range(size * size)]
+        for t in range(size * size):
+            r, c = divmod(t, size)
+            for i, ship_len in enumerate(self.lengths):
+                if c + ship_len <= size and self._fits([t + k for k in range(ship_len)]):
+                    clear = sum(self.vmask << (j * bits) for j in range(c + 1, c + ship_len))
+                    self.starts[t].append((i, clear))
+                if ship_len > 1 and r + ship_len <= size and \
+                        self._fits([t + k * size for k in range(ship_len)]):
+                    self.starts[t].append((i, None))
+
+    def _fits(self, cells):
+        return not any(cell in self.blocked for cell in cells) and \
+            not all(cell in self.hits for cell in cells)
+
+    def _transitions(self, keys, t):
+        """
+        Every way to settle cell t from each state in keys, as
+        (source state indexes, next state keys, whether cell t holds a ship).
+        """
+        col_shift = (t % self.size) * self.bits
+        vert = (keys >> col_shift) & self.vmask
+        horiz = (keys >> self.hshift) & self.vmask
+        busy = (vert | horiz) != 0
+
+        # A ship already running through the cell moves on by one
+        src = np.flatnonzero(busy)
+        step = ((vert[src] != 0).astype(np.int64) << col_shift) + \
+               ((horiz[src] != 0).astype(np.int64) << self.hshift)
+        moves = [(src, keys[src] - step, True)]
+
+        free = ~busy
+        if t not in self.hits:
+            src = np.flatnonzero(free)
+            moves.append((src, keys[src], False))
+        for i, clear in self.starts[t]:
+            ship_len = self.lengths[i]
+            count_mask = (1 << self.counts[i].bit_length()) - 1
+            can = free & (((keys >> self.rem_shifts[i]) & count_mask) != 0)
+            if clear is None:
+                placed = ((ship_len - 1) << col_shift) - (1 << self.rem_shifts[i])
+            else:
+                can &= (keys & clear) == 0
+                placed = ((ship_len - 1) << self.hshift) - (1 << self.rem_shifts[i])
+            src = np.flatnonzero(can)
+            moves.append((src, keys[src] + placed, True))
+        return moves
+
+    def _step(self, keys, weights, t):
+        """
+        Forward DP over cell t: the next states and their weights.
+        """
+        moves = self._transitions(keys, t)
+        new_keys = np.concatenate([next_keys for _, next_keys, _ in moves])
+        new_weights = np.concatenate([weights[src] for src, _, _ in moves])
+        order = np.argsort(new_keys)
+        new_keys = new_keys[order]
+        new_weights = new_weights[order]
+        first = np.flatnonzero(np.r_[True, new_keys[1:] != new_keys[:-1]])
+        return new_keys[first], np.add.reduceat(new_weights, first) if len(first) else new_weights
+
+    def _forward(self, keys, weights, first, last, keep=None):
+        for t in range(first, last):
+            if keep is not None:
+                keep.append((keys, weights))
+            keys, weights = self._step(keys, weights, t)
+        return keys, weights
+
+    def _initial(self):
+        return np.array([self.start], np.int64), np.array([1], np.int64)
+
+    @staticmethod
+    def _final(keys, weights):
+        # Every ship placed and nothing left running: the all-zero key
+        done = keys == 0
+        return int(weights[done].sum()) if done.any() else 0
+
+    def count(self):
+        """
+        Number of layouts, with same-length ships told apart by name.
+        """
+        keys, weights = self._forward(*self._initial(), 0, self.size * self.size)
+        return self._final(keys, weights) * self.labels
+
+    def occupancy(self):
+        """
+        Returns (layouts, counts): counts[cell] is how many layouts put a
+        ship on that cell. Forward states are kept at the start of each row
+        only and recomputed row by row on the way back, which bounds memory
+        to about one row of states.
+        """
+        size = self.size
+        keys, weights = self._initial()
+        rows = []
+        for r in range(size):
+            rows.append((keys, weights))
+            keys, weights = self._forward(keys, weights, r * size, (r + 1) * size)
+
+        total = self._final(keys, weights)
+        counts = [0] * (size * size)
+        after_keys, after = keys, (keys == 0).astype(np.int64)   # completions from each state
+        for r in reversed(range(size)):
+            steps = []
+            self._forward(*rows[r], r * size, (r + 1) * size, steps)
+            for t in reversed(range(r * size, (r + 1) * size)):
+                keys, weights = steps[t - r * size]
+                before = np.zeros(len(keys), np.int64)
+                occupied = 0
+                for src, next_keys, holds_ship in self._transitions(keys, t):
+                    completions = after[np.searchsorted(after_keys, next_keys)]
+                    before[src] += completions         # src is unique within one move
+                    if holds_ship:
+                        occupied += int((weights[src] * completions).sum())
+                counts[t] = occupied * self.labels
+                after_keys, after = keys, before
+        return total * self.labels, counts
+
+
+def count_layouts(size=grid_size, ships=fleet, blocked=(), hits=()):
+    """
+    Exact number of layouts consistent with the observations.
+    """
+    return LayoutCounter(size, ships, blocked, hits).count()
+
+
+def cell_probabilities(size=grid_size, ships=fleet, blocked=(), hits=()):
+    """
+    Exact probability of a ship on each cell, over every consistent layout
+    taken as equally likely. All zeros if no layout fits.
+    """
+    total, counts = LayoutCounter(size, ships, blocked, hits).occupancy()
+    return [n / total if total else 0.0 for n in counts]
+
+
+def attacker_view(session, attacker):
+    """
+    What `attacker` has seen of the other fleet in a GameSession:
+    (unsunk ships, blocked cells, unresolved hit cells).
+    """
+    defender = session.players[1 - attacker]
+    size = session.grid_size
+    blocked = set()
+    hits = set()
+    ships = []
+    for ship, health in zip(defender.ship_positions, defender.ship_health):
+        cells = [r * size + c for r, c in ship["coords"]]
+        if health == 0:
+            blocked.update(cells)
+        else:
+            ships.append((ship["name"], len(cells)))
+            hits.update(cell for cell, (r, c) in zip(cells, ship["coords"])
+                        if defender.grid[r][c] == Cell.HIT)
+    for r in range(size):
+        for c in range(size):
+            if defender.grid[r][c] == Cell.MISS:
+                blocked.add(r * size + c)
+    return ships, blocked, hits
+
+
+# Exact maps by view hash, shared by every ExactAI in the process; an
+# opening book (see openingbook.py) can be loaded into it
+map_cache = ProbabilityCache()
+
+
+class ExactAI:
+    """
+    Fires at the untouched cell with the highest exact probability of
+    holding a ship. Each new board state recounts every consistent layout,
+    so it is a yardstick for the other AIs rather than a fast opponent;
+    states seen before come from the cache (map_cache unless given one).
+    """
+
+    def __init__(self, size=grid_size, ships=fleet, rng=random, cache=None):
+        self.size = size
+        self.rng = rng
+        self.cache = map_cache if cache is None else cache
+        self.view = ViewHash(size, ships)
+        self.ship_lens = {name: ship_len for name, ship_len in ships}
+        self.remaining = list(ships)
+
+        self.shot = bytearray(size * size)
+        self.blocked = set()           # misses and sunk ship cells
+        self.unresolved = set()        # hit cells not yet part of a sunk ship
+        self.fallback = DensityAI(size, ships, rng)
+        self.last_layouts = 0          # consistent layouts behind the last shot
+
+    def observe(self, result):
+        self.fallback.observe(result)
+        self.view.shot(result.row, result.col, result.outcome != Outcome.MISS, result.ship)
+        cell = result.row * self.size + result.col
+        self.shot[cell] = 1
+
+        if result.outcome == Outcome.MISS:
+            self.blocked.add(cell)
+            return
+
+        self.unresolved.add(cell)
+        if result.outcome in (Outcome.SUNK, Outcome.WIN):
+            ship = result.ship
+            self.remaining.remove((ship["name"], self.ship_lens[ship["name"]]))
+            for r, c in ship["coords"]:
+                sunk_cell = r * self.size + c
+                self.unresolved.discard(sunk_cell)
+                self.blocked.add(sunk_cell)
+
+    def occupancy(self):
+        """
+        (counts, layouts) for the board as this player has seen it.
+        """
+        counter = LayoutCounter(self.size, self.remaining, self.blocked, self.unresolved)
+        layouts, counts = counter.occupancy()
+        return tuple(counts), layouts
+
+    def choose_shot(self):
+        counts, self.last_layouts = self.cache.lookup(self.view.value, self.occupancy)
+
+        shot = self.shot
+        scores = {c: n for c, n in enumerate(counts) if not shot[c] and n}
+        if not scores:
+            return self.fallback.choose_shot()
+
+        best = max(scores.values())
+        choices = [c for c, n in scores.items() if n == best]
+        return divmod(self.rng.choice(choices), self.size)
+
+
+def main():
+    """
+    Command line entry point:
+    python exact.py --size 10 --misses A1 B2 --hits E5
+    """
+    parser = argparse.ArgumentParser(description="Exact Battleship layout counts and cell probabilities.")
+    parser.add_argument("--size", type=int, default=grid_size)
+    parser.add_argument("--misses", nargs="*", default=[], help="missed (or sunk) cells, e.g. A1")
+    parser.add_argument("--hits", nargs="*", default=[], help="unresolved hits, e.g. E5")
+    args = parser.parse_args()
+
+    def cells(labels):
+        return [row * args.size + col for row, col in (parse_coordinate(label, args.size) for label in labels)]
+
+    counter = LayoutCounter(args.size, fleet, cells(args.misses), cells(args.hits))
+    total, counts = counter.occupancy()
+    print(f"Layouts: {total}")
+    print("    " + " ".join(f"{column_label(c):>5}" for c in range(args.size)))
+    for r in range(args.size):
+        row = counts[r * args.size:(r + 1) * args.size]
+        print(f"{r + 1:>3} " + " ".join(f"{n / total if total else 0:5.3f}" for n in row))
+
+
+if __name__ == "__main__":
+    main()
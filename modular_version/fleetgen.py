@@ -0,0 +1,130 @@
+# fleetgen.py - Vectorized batch fleet generator for Monte Carlo work.
+# Places every ship on N boards at once with NumPy instead of looping per board.
+
+from state import fleet, grid_size
+from placement import NoLegalPlacement
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only this module needs it
+    np = None
+
+# Uniform redraws per ship before a board's legal placements are scanned
+REJECTION_ROUNDS = 8
+# Most (boards x placements) entries a scan holds at once
+SCAN_ELEMENTS = 1 << 22
+
+
+def placement_table(size, ship_len):
+    """
+    Every placement of a ship of given length on an empty size x size grid,
+    horizontal first, in the same order as placement.legal_placements.
+    Returns (masks, coords): masks is (P, size*size) bool, coords is (P, ship_len, 2).
+    """
+    starts = []
+    for r in range(size):
+        for c in range(size - ship_len + 1):
+            starts.append([(r, c + k) for k in range(ship_len)])
+    for c in range(size):
+        for r in range(size - ship_len + 1):
+            starts.append([(r + k, c) for k in range(ship_len)])
+
+    coords = np.array(starts, dtype=np.int16).reshape(-1, ship_len, 2)
+    masks = np.zeros((len(coords), size * size), dtype=bool)
+    cells = coords[:, :, 0] * size + coords[:, :, 1]
+    masks[np.arange(len(coords))[:, None], cells] = True
+    return masks, coords
+
+
+def pack_masks(masks):
+    """
+    Packs (P, cells) bool masks into (words, P) uint64 bitmasks, cell i in
+    bit i % 64 of word i // 64, so overlap is a word-wise AND.
+    """
+    words = -(-masks.shape[1] // 64)
+    padded = np.zeros((len(masks), words * 64), dtype=bool)
+    padded[:, :masks.shape[1]] = masks
+    return np.packbits(padded, axis=1, bitorder="little").view("<u8").T.copy()
+
+
+def _fill_chunk(boards, coords, ships, tables, size, rng):
+    """
+    Places the whole fleet on one chunk of boards, one ship at a time.
+    Each board draws uniformly from its own legal placements, exactly like
+    placement.random_place_ship does for a single board: first by
+    redrawing uniform placements until one is free, then, for boards still
+    without one, by picking among their legal placements directly.
+    """
+    n = len(boards)
+    words = -(-size * size // 64)
+    occupied = np.zeros((words, n), dtype=np.uint64)
+    rows = np.arange(n)
+
+    for i, (ship_name, ship_len) in enumerate(ships):
+        packed, ship_coords = tables[ship_len]
+        options = packed.shape[1]
+        choice = np.zeros(n, dtype=np.int64)
+
+        # Rejection: costs one AND per board and word, whatever the grid size
+        todo = rows
+        for _ in range(REJECTION_ROUNDS):
+            draw = rng.integers(options, size=len(todo))
+            free = ~(occupied[:, todo] & packed[:, draw]).any(axis=0)
+            choice[todo[free]] = draw[free]
+            todo = todo[~free]
+            if not len(todo):
+                break
+
+        # Crowded boards: test every placement, a few boards at a time so
+        # the (boards, placements) arrays stay within SCAN_ELEMENTS
+        step = max(1, SCAN_ELEMENTS // options)
+        index_type = np.min_scalar_type(options)
+        for start in range(0, len(todo), step):
+            some = todo[start:start + step]
+            legal = (occupied[0, some, None] & packed[0]) == 0
+            for word in range(1, words):
+                legal &= (occupied[word, some, None] & packed[word]) == 0
+            counts = legal.sum(axis=1, dtype=index_type)
+            if not counts.all():
+                raise NoLegalPlacement(f"No legal placement left for {ship_name} (length {ship_len}).")
+
+            # Pick the k-th legal placement per board, k uniform in [0, count)
+            k = (rng.random(len(some)) * counts).astype(index_type)
+            choice[some] = np.argmax(legal.cumsum(axis=1, dtype=index_type) > k[:, None], axis=1)
+
+        occupied |= packed[:, choice]
+        flat = boards.reshape(n, -1)
+        cells = ship_coords[choice, :, 0] * size + ship_coords[choice, :, 1]
+        flat[rows[:, None], cells] = i + 1
+        coords[i][:] = ship_coords[choice]
+
+
+def random_layouts(n, ships=fleet, size=grid_size, seed=None, chunk=10000):
+    """
+    Generates n random fleet layouts at once.
+    Each chunk of boards draws from its own stream spawned from seed, so
+    chunk k comes out the same whichever process or order fills it.
+    Returns (boards, coords):
+      boards is an (n, size, size) int8 array, 0 for water and i + 1 for ship i
+      coords is a list with one (n, ship_len, 2) array of (row, col) per ship
+    Raises NoLegalPlacement if the fleet does not fit.
+    """
+    if np is None:
+        raise ImportError("random_layouts needs NumPy: pip install numpy")
+
+    streams = np.random.SeedSequence(seed).spawn(-(-n // chunk))
+    tables = {}
+    for _, ship_len in ships:
+        if ship_len not in tables:
+            masks, ship_coords = placement_table(size, ship_len)
+            tables[ship_len] = (pack_masks(masks), ship_coords)
+
+    boards = np.zeros((n, size, size), dtype=np.int8)
+    coords = [np.zeros((n, ship_len, 2), dtype=np.int16) for _, ship_len in ships]
+
+    for start, stream in zip(range(0, n, chunk), streams):
+        end = min(start + chunk, n)
+        _fill_chunk(boards[start:end], [c[start:end] for c in coords], ships, tables, size,
+                    np.random.default_rng(stream))
+
+    return boards, coords
@@ -1,30 +1,46 @@
 # gameplay.py - Handles turns, firing, hits/misses, scoring
 
-from state import *
+from time import perf_counter
+
+import metrics
+from state import Cell
 from board import print_single_grid, input_coordinate
+from engine import fire, fire_many, salvo_shots, Outcome
 
-def print_grid():
+def print_grid(session, renderer=None, me=None):
     """
-    Displays the current player's board and the opponent's board.
-    Own ships are visible; enemy ships stay hidden unless hit.
+    Displays player me's board (the current player by default) and the
+    opponent's board. Own ships are visible; enemy ships stay hidden unless hit.
+    With a GridRenderer, the turn header and both boards are drawn as one
+    frame, so only changed cells are redrawn on a terminal.
     """
-    attacker = current_player
-    defender = 1 - current_player
+    if me is None:
+        me = session.current_player
+    attacker = session.players[me]
+    defender = session.players[1 - me]
+
+    if renderer is None:
+        print(f"\n--- {attacker.name}'s turn ---")
+        print_single_grid("Your Board", attacker.grid, reveal_ships=True)
+        print_single_grid(f"{defender.name}'s Board", defender.grid, reveal_ships=False)
+        return
 
-    print_single_grid("Your Board", player_grids[attacker], reveal_ships=True)
-    print_single_grid(f"{player_names[defender]}'s Board", player_grids[defender], reveal_ships=False)
+    renderer.draw(
+        ["", f"--- {attacker.name}'s turn ---"]
+        + renderer.grid_lines("Your Board", attacker.grid, reveal_ships=True)
+        + renderer.grid_lines(f"{defender.name}'s Board", defender.grid, reveal_ships=False)
+    )
 
 
-def accept_valid_player_placement():
+def accept_valid_player_placement(session):
     """
     Prompts current player to enter a coordinate to shoot.
     Rejects locations already targeted.
     """ 
-    defender = 1 - current_player
-    target_grid = player_grids[defender]
+    target_grid = session.defender.grid
 
     while True:
-        row, col = input_coordinate("Shoot (e.g. A5): ")
+        row, col = input_coordinate("Shoot (e.g. A5): ", session.grid_size)
 
         # Ensure not to shoot the same spot twice
         if target_grid[row][col] in (Cell.HIT, Cell.MISS):
@@ -34,80 +50,114 @@ def accept_valid_player_placement():
         return row, col
 
 
-def check_if_ship_sunk(row, col):
+def check_if_ship_sunk(session, row, col, defender=None):
     """
-    Checks whether a newly hit ship is now fully destroyed.
-    If so, increments sunk-ship count.
+    Announces the ship a hit at (row, col) sank, if it sank one.
+    The engine has already counted it; defender defaults to session.defender.
     """
-    defender = 1 - current_player
-    grid = player_grids[defender]
+    start = perf_counter() if metrics.enabled else 0
+    if defender is None:
+        defender = session.defender
+
+    i = defender.ship_at.get((row, col))
+    if i is not None and defender.ship_health[i] == 0:
+        print(f"You sank the {defender.ship_positions[i]['name']}!")
 
-    for ship in player_ship_positions[defender]:
-        if (row, col) in ship["coords"] and all(grid[r][c] == Cell.HIT for r, c in ship["coords"]):
-            print(f"You sank the {ship['name']}!")
-            ships_sunk[current_player] += 1
-            return
+    if start:
+        metrics.CHECK_SUNK_SECONDS.observe(perf_counter() - start)
 
 
-def shoot_bullet():
+def shoot_bullet(session, renderer=None):
     """
     Handles one complete firing turn.
-    Takes input, marks hit/miss, updates statistics,
-    and checks sunk status.
+    Takes input, fires through the engine, which updates statistics and
+    hands the turn over, and reports the result.
     """
-    global player_hits, player_misses, shots_taken
+    start = perf_counter() if metrics.enabled else 0
 
-    defender = 1 - current_player
-    grid = player_grids[defender]
+    print_grid(session, renderer)
 
-    print(f"\n--- {player_names[current_player]}'s turn ---")
-    print_grid()
+    me = session.current_player
+    row, col = accept_valid_player_placement(session)
+    report_shot(session, me, fire(session, row, col), renderer)
 
-    row, col = accept_valid_player_placement()
-    cell = grid[row][col]
+    if start:
+        metrics.TURN_SECONDS.observe(perf_counter() - start)
 
-    shots_taken[current_player] += 1
 
-    if cell == Cell.SHIP:
-        print("Hit!")
-        grid[row][col] = Cell.HIT
-        player_hits[current_player] += 1
-        check_if_ship_sunk(row, col)
-    else:
+def shoot_salvo(session, renderer=None):
+    """
+    Handles one firing turn under salvo rules.
+    Takes one distinct target per surviving ship of the attacker,
+    then fires them as one volley, which stops once the enemy fleet is gone.
+    """
+    start = perf_counter() if metrics.enabled else 0
+
+    print_grid(session, renderer)
+
+    shots = salvo_shots(session)
+    print(f"Salvo: {shots} shot(s) this turn.")
+    targets = []
+    while len(targets) < shots:
+        row, col = accept_valid_player_placement(session)
+        if (row, col) in targets:
+            print("Already in this salvo, try again.")
+            continue
+        targets.append((row, col))
+
+    me = session.current_player
+    for result in fire_many(session, targets).shots:
+        report_shot(session, me, result, renderer)
+
+    if start:
+        metrics.TURN_SECONDS.observe(perf_counter() - start)
+
+
+def report_shot(session, me, result, renderer=None):
+    """
+    Shows the result of a shot player me fired.
+    """
+    defender = session.players[1 - me]
+
+    if renderer is not None:
+        renderer.invalidate(defender.grid, result.row)
+        if renderer.tty:
+            print_grid(session, renderer, me)   # only the shot cell is redrawn
+
+    if result.outcome == Outcome.MISS:
         print("Miss.")
-        grid[row][col] = Cell.MISS
-        player_misses[current_player] += 1
+    else:
+        print("Hit!")
+        check_if_ship_sunk(session, result.row, result.col, defender)
 
 
-def show_live_score():
+def show_live_score(session):
     """
     Prints actual scoreboard: hits/misses/sunk per player.
     """
     print("\n--- LIVE SCORE ---")
-    for i in (0, 1):
-        print(f"{player_names[i]}: {player_hits[i]} hits, {player_misses[i]} misses, {ships_sunk[i]} sunk ship(s)")
+    for player in session.players:
+        print(f"{player.name}: {player.hits} hits, {player.misses} misses, {player.ships_sunk} sunk ship(s)")
     print()
 
 
-def check_game_over():
+def check_game_over(session):
     """
-    Evaluates whether player has sunk all enemy ships.
+    Announces the winner once the engine has recorded one.
     """
-    global game_over
+    if session.winner is not None:
+        player = session.players[session.winner]
+        print(f"\n{player.name} has destroyed all enemy ships!")
+        print(f"{player.name} wins!")
 
-    for i in (0, 1):
-        if ships_sunk[i] == num_ships:
-            print(f"\n{player_names[i]} has destroyed all enemy ships!")
-            print(f"{player_names[i]} wins!")
-            game_over = True
-            return
 
-
-def switch_player():
+def switch_player(session, renderer=None):
     """
-    Alternates player turn, prevents board peeking.
+    Hands the screen to the next player, prevents board peeking.
+    The engine has already passed the turn on.
     """
-    global current_player
-    current_player = 1 - current_player
     input("\nPress ENTER and hand over to next player...")
-    print("\n" * 50)
+    if renderer is None:
+        print("\n" * 50)
+    else:
+        renderer.clear()
@@ -0,0 +1,187 @@
+# layouts.py - Pure, batch validation of complete fleet layouts (ship name ->
+# coordinates), e.g. ones uploaded by players and bots. Nothing is placed on
+# a grid: each ship becomes a bitmask (bit = row * size + col), looked up in
+# a table of every straight placement, and overlaps are one AND per ship.
+#
+# A layout is {"Carrier": [(0, 0), (0, 1), ...], ...} or a ship_positions
+# list of {"name", "coords"} dicts. Coordinates may be tuples or lists.
+
+import argparse
+import json
+from functools import lru_cache
+from itertools import chain
+
+from state import fleet, grid_size
+
+# Grids up to this size get a placement table; larger ones (sparse boards)
+# compute each mask from the coordinates instead
+TABLE_MAX_SIZE = 64
+# Coordinates must be exactly int: 0.0 and True hash like 0 and 1, so they
+# would match placement table keys
+INT_TYPES = frozenset({int})
+
+
+class LayoutError(ValueError):
+    """
+    Raised for a layout that breaks the fleet rules.
+    """
+
+
+@lru_cache(maxsize=None)
+def placement_masks(size, ship_len):
+    """
+    {coordinate tuple: mask} for every straight placement of a ship of
+    given length on a size x size grid, with its cells in ascending and in
+    descending order. Empty above TABLE_MAX_SIZE.
+    """
+    table = {}
+    if size > TABLE_MAX_SIZE:
+        return table
+    for r in range(size):
+        for c in range(size - ship_len + 1):
+            coords = tuple((r, c + k) for k in range(ship_len))
+            table[coords] = table[coords[::-1]] = sum(1 << (r * size + c + k) for k in range(ship_len))
+    for c in range(size):
+        for r in range(size - ship_len + 1):
+            coords = tuple((r + k, c) for k in range(ship_len))
+            table[coords] = table[coords[::-1]] = sum(1 << ((r + k) * size + c) for k in range(ship_len))
+    return table
+
+
+def ship_mask(name, coords, size, table=None):
+    """
+    Mask of one ship whose coordinates are lists or out of order, worked
+    out from its coordinates. Raises LayoutError saying what is wrong with them.
+    """
+    try:
+        cells = sorted((r, c) for r, c in coords)
+    except (TypeError, ValueError):
+        raise LayoutError(f"{name} has a malformed coordinate.") from None
+    # Before any table lookup: 0.0 and True would match the keys 0 and 1
+    if not all(type(r) is int and type(c) is int for r, c in cells):
+        raise LayoutError(f"{name} has a malformed coordinate.")
+    if table and tuple(cells) in table:
+        return table[tuple(cells)]
+    if not all(0 <= r < size and 0 <= c < size for r, c in cells):
+        raise LayoutError(f"{name} is out of bounds.")
+
+    rows = {r for r, _ in cells}
+    cols = {c for _, c in cells}
+    (start_row, start_col), (end_row, end_col) = cells[0], cells[-1]
+    span = (end_row - start_row) + (end_col - start_col) + 1
+    if (len(rows) != 1 and len(cols) != 1) or len(set(cells)) != len(cells) or span != len(cells):
+        raise LayoutError(f"{name} is not a straight, unbroken line.")
+    return sum(1 << (r * size + c) for r, c in cells)
+
+
+def _layout_ships(layout):
+    """
+    The layout as {name: coords}, whichever form it came in.
+    """
+    if isinstance(layout, dict):
+        return layout
+    given = {}
+    try:
+        for ship in layout:
+            name = ship["name"]
+            if name in given:
+                raise LayoutError(f"{name} appears more than once.")
+            given[name] = ship["coords"]
+    except (TypeError, KeyError):
+        raise LayoutError("Ships must be {\"name\", \"coords\"} objects.") from None
+    return given
+
+
+def _check(layout, ships, names, tables, size):
+    given = _layout_ships(layout)
+    if given.keys() != names:
+        for name, _ in ships:
+            if name not in given:
+                raise LayoutError(f"Missing ship: {name}")
+        raise LayoutError(f"Unknown ship: {sorted(map(str, given.keys() - names))[0]}")
+
+    # One C-level type check for the whole layout; any doubt takes the slow path
+    try:
+        exact = INT_TYPES.issuperset(map(type, chain.from_iterable(chain.from_iterable(given.values()))))
+    except TypeError:
+        exact = False
+
+    occupied = 0
+    for name, ship_len in ships:
+        coords = given[name]
+        try:
+            count = len(coords)
+        except TypeError:
+            raise LayoutError(f"{name} has a malformed coordinate.") from None
+        if count != ship_len:
+            raise LayoutError(f"{name} must cover {ship_len} cells, not {count}.")
+        try:
+            if not exact:
+                raise KeyError
+            # JSON gives [r, c] lists, which cannot be table keys as they are
+            key = tuple(coords) if type(coords[0]) is tuple else tuple(map(tuple, coords))
+            mask = tables[ship_len][key]
+        except (KeyError, TypeError):
+            mask = ship_mask(name, coords, size, tables[ship_len])
+        if occupied & mask:
+            raise LayoutError(f"{name} overlaps another ship.")
+        occupied |= mask
+    return occupied
+
+
+def check_layout(layout, ships=fleet, size=grid_size):
+    """
+    Checks one layout against the fleet: every ship present once with the
+    right length, straight, unbroken, on the grid and not overlapping.
+    Returns the mask of every ship cell. Raises LayoutError.
+    """
+    tables = {ship_len: placement_masks(size, ship_len) for _, ship_len in ships}
+    return _check(layout, ships, {name for name, _ in ships}, tables, size)
+
+
+def validate_layouts(layouts, ships=fleet, size=grid_size):
+    """
+    Checks many layouts at once.
+    Returns one entry per layout: None if it is valid, else the error message.
+    """
+    tables = {ship_len: placement_masks(size, ship_len) for _, ship_len in ships}
+    names = {name for name, _ in ships}
+    errors = []
+    append = errors.append
+    for layout in layouts:
+        try:
+            _check(layout, ships, names, tables, size)
+            append(None)
+        except LayoutError as error:
+            append(str(error))
+    return errors
+
+
+def main():
+    """
+    Command line entry point (one JSON layout per line):
+    python layouts.py uploads.jsonl --size 10
+    """
+    parser = argparse.ArgumentParser(description="Validate Battleship fleet layouts.")
+    parser.add_argument("layouts", help="file with one JSON layout per line")
+    parser.add_argument("--size", type=int, default=grid_size)
+    args = parser.parse_args()
+
+    layouts = []
+    with open(args.layouts) as f:
+        for line in f:
+            if line.strip():
+                try:
+                    layouts.append(json.loads(line))
+                except ValueError:
+                    layouts.append(None)
+
+    errors = validate_layouts(layouts, size=args.size)
+    for number, error in enumerate(errors, 1):
+        if error:
+            print(f"Layout {number}: {error}")
+    print(f"{errors.count(None)} of {len(errors)} layouts are valid.")
+
+
+if __name__ == "__main__":
+    main()
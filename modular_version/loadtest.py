@@ -0,0 +1,165 @@
+# loadtest.py - Load generator for the multiplayer server. Starts thousands
+# of simulated players on one event loop, plays full matches and reports
+# shot latency percentiles, throughput and errors.
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import resource
+import time
+
+from state import fleet, grid_size
+from placement import random_ship_layout
+from server import BattleshipServer
+from client import BattleshipClient, ServerError, play_match
+
+
+def percentile(values, p):
+    """
+    Nearest-rank percentile of an already sorted list, 0 for an empty one.
+    """
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(len(values) * p / 100))
+    return values[rank - 1]
+
+
+async def load_match(host, port, rng, stats, interval, connecting, size=grid_size):
+    """
+    Connects two simulated players and plays one match between them.
+    Each player lays out its fleet with the same uniform draw as
+    place_ship_randomly and sends it to the server to validate.
+    If either player cannot get the match going, the other one gives up
+    on it instead of waiting; only the failing player's error is counted.
+    """
+    async def player(me, joined, guest_failed):
+        client = None
+        try:
+            async with connecting:
+                client = await BattleshipClient.connect(host, port)
+            if me == 0:
+                reply = await client.request("new", name="Load 1")
+                joined.set_result(reply["match"])
+                waiting = asyncio.ensure_future(client.wait_for("joined"))
+                await asyncio.wait((waiting, guest_failed), return_when=asyncio.FIRST_COMPLETED)
+                if not waiting.done():
+                    waiting.cancel()
+                    return
+            else:
+                match = await joined
+                if match is None:          # the host failed and counted it
+                    return
+                await client.request("join", match=match, name="Load 2")
+
+            _, ships = random_ship_layout(fleet, size, rng)
+            winner = await play_match(client, me, rng, size, ships, interval, stats["latencies"])
+            if winner is not None and me == 0:
+                stats["games"] += 1
+        except (ServerError, ConnectionError, OSError) as error:
+            stats["errors"] += 1
+            stats["last_error"] = str(error) or type(error).__name__
+            if me == 0 and not joined.done():
+                joined.set_result(None)
+            elif me == 1:
+                guest_failed.set_result(True)
+        finally:
+            if client is not None:
+                await client.close()
+
+    loop = asyncio.get_running_loop()
+    joined, guest_failed = loop.create_future(), loop.create_future()
+    await asyncio.gather(player(0, joined, guest_failed), player(1, joined, guest_failed))
+
+
+async def run_load(players, host="127.0.0.1", port=None, rate=0.0, seed=0, size=grid_size):
+    """
+    Plays players // 2 matches at once against host:port, or against a
+    server started on this event loop if port is None.
+    rate is shots per second per player; 0 fires as fast as replies come.
+    Returns the report dict.
+    """
+    rng = random.Random(seed)
+    stats = {"latencies": [], "games": 0, "errors": 0, "last_error": None}
+    interval = 1 / rate if rate else 0
+    connecting = asyncio.Semaphore(256)
+
+    listener = None
+    if port is None:
+        server = BattleshipServer(size, rng)
+        listener = await server.start(host, 0)
+        port = listener.sockets[0].getsockname()[1]
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(load_match(host, port, rng, stats, interval, connecting, size)
+                               for _ in range(players // 2)))
+    finally:
+        if listener is not None:
+            listener.close()
+            await listener.wait_closed()
+    seconds = time.perf_counter() - start
+
+    latencies = sorted(stats["latencies"])
+    return {
+        "players": players // 2 * 2,
+        "matches": players // 2,
+        "games_completed": stats["games"],
+        "shots": len(latencies),
+        "seconds": seconds,
+        "shots_per_second": len(latencies) / seconds if seconds else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 50) * 1000,
+            "p95": percentile(latencies, 95) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": latencies[-1] * 1000 if latencies else 0.0,
+        },
+        "errors": stats["errors"],
+        "last_error": stats["last_error"],
+    }
+
+
+def raise_file_limit():
+    """
+    Thousands of sockets need more than the usual 1024 descriptors.
+    """
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def main():
+    """
+    Command line entry point:
+    python loadtest.py --players 2000 --rate 2
+    Without --port the server runs in this process; start server.py
+    separately and pass --port to measure it on its own core.
+    """
+    parser = argparse.ArgumentParser(description="Load-test the Battleship server.")
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=0.0, help="shots per second per player, 0 = flat out")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="also write the report as JSON")
+    args = parser.parse_args()
+
+    raise_file_limit()
+    report = asyncio.run(run_load(args.players, args.host, args.port, args.rate, args.seed))
+
+    latency = report["latency_ms"]
+    print(f"{report['matches']} matches, {report['games_completed']} completed, "
+          f"{report['shots']} shots in {report['seconds']:.2f}s")
+    print(f"Throughput: {report['shots_per_second']:,.0f} shots/s")
+    print(f"Latency: p50 {latency['p50']:.2f} ms, p95 {latency['p95']:.2f} ms, "
+          f"p99 {latency['p99']:.2f} ms, max {latency['max']:.2f} ms")
+    print(f"Errors: {report['errors']}" + (f" (last: {report['last_error']})" if report["last_error"] else ""))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 # main.py - Entry point. Runs Battleship.
 
-from state import *
+from state import GameSession
 from placement import create_grid
-from gameplay import shoot_bullet, show_live_score, check_game_over, switch_player
+from gameplay import shoot_bullet, shoot_salvo, show_live_score, check_game_over, switch_player
+from render import GridRenderer
 
 def main():
     """
@@ -10,23 +11,26 @@ def main():
     Sets player names, runs ship placement,
     loops turn-by-turn until one player wins.
     """
-    global game_over, current_player
-
     name1 = input("Name for Player 1: ").strip() or "Player 1"
     name2 = input("Name for Player 2: ").strip() or "Player 2"
-    player_names[0] = name1
-    player_names[1] = name2
+    session = GameSession((name1, name2))
+    session.salvo = input("Classic or Salvo? [C/S]: ").strip().upper().startswith("S")
 
-    create_grid()
-    game_over = False
-    current_player = 0
+    create_grid(session)
+    renderer = GridRenderer()
 
-    while not game_over:
-        shoot_bullet()
-        show_live_score()
-        check_game_over()
-        if not game_over:
-            switch_player()
+    try:
+        while not session.game_over:
+            if session.salvo:
+                shoot_salvo(session, renderer)
+            else:
+                shoot_bullet(session, renderer)
+            show_live_score(session)
+            check_game_over(session)
+            if not session.game_over:
+                switch_player(session, renderer)
+    finally:
+        renderer.close()
 
     print("Game Over!")
 
@@ -0,0 +1,158 @@
+# metrics.py - Lightweight counters and histograms around the hot paths.
+# Off by default: instrumented code checks `metrics.enabled` first, so a
+# disabled build pays one attribute lookup per call. Exports a snapshot
+# dict or Prometheus text format.
+
+from bisect import bisect_left
+
+enabled = False
+
+# Latency buckets in seconds, 1 us to 10 s
+SECONDS_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                   1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RETRY_BUCKETS = (0, 0.5, 1, 2, 5, 10, 20, 50, 100)
+
+REGISTRY = {}
+
+
+class Counter:
+    """
+    Monotonic count, optionally split by one label.
+    """
+
+    def __init__(self, name, help_text, label=None):
+        self.name = name
+        self.help = help_text
+        self.label = label
+        self.values = {}               # label value (None without a label) -> count
+
+    def inc(self, amount=1, label=None):
+        self.values[label] = self.values.get(label, 0) + amount
+
+    def reset(self):
+        self.values = {}
+
+    def snapshot(self):
+        if self.label is None:
+            return self.values.get(None, 0)
+        return dict(self.values)
+
+    def prometheus(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        if self.label is None:
+            lines.append(f"{self.name} {self.values.get(None, 0)}")
+        for value, count in sorted(self.values.items(), key=lambda item: str(item[0])):
+            if value is not None:
+                lines.append(f'{self.name}{{{self.label}="{value}"}} {count}')
+        return lines
+
+
+class Histogram:
+    """
+    Counts of observations per bucket upper bound, plus their sum.
+    """
+
+    def __init__(self, name, help_text, buckets=SECONDS_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.reset()
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def reset(self):
+        self.counts = [0] * (len(self.buckets) + 1)   # last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def snapshot(self):
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"count": self.count, "sum": self.sum, "buckets": buckets}
+
+    def prometheus(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for bound, cumulative in self.snapshot()["buckets"].items():
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{self.name}_bucket{{le="{le}"}} {cumulative}')
+        lines.append(f"{self.name}_sum {self.sum!r}")
+        lines.append(f"{self.name}_count {self.count}")
+        return lines
+
+
+def counter(name, help_text, label=None):
+    REGISTRY[name] = Counter(name, help_text, label)
+    return REGISTRY[name]
+
+
+def histogram(name, help_text, buckets=SECONDS_BUCKETS):
+    REGISTRY[name] = Histogram(name, help_text, buckets)
+    return REGISTRY[name]
+
+
+PLACEMENT_RETRIES = histogram(
+    "battleship_placement_retries",
+    "Retries random ship placement would need by rejection sampling.",
+    RETRY_BUCKETS)
+CHECK_SUNK_SECONDS = histogram(
+    "battleship_check_if_ship_sunk_seconds",
+    "Time spent in check_if_ship_sunk.")
+PRINT_GRID_SECONDS = histogram(
+    "battleship_print_single_grid_seconds",
+    "Time spent in print_single_grid.")
+REJECTED_COORDINATES = counter(
+    "battleship_rejected_coordinates_total",
+    "Coordinates input_coordinate rejected, by reason.",
+    "reason")
+TURN_SECONDS = histogram(
+    "battleship_turn_seconds",
+    "Time per console turn, including waiting for input.")
+FIRE_SECONDS = histogram(
+    "battleship_fire_seconds",
+    "Time to resolve one shot in engine.fire.")
+VOLLEY_SECONDS = histogram(
+    "battleship_volley_seconds",
+    "Time to resolve one volley in engine.fire_many.")
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    """
+    Zeroes every metric.
+    """
+    for metric in REGISTRY.values():
+        metric.reset()
+
+
+def snapshot():
+    """
+    {metric name: value}: a count for counters without a label,
+    {label value: count} for labelled ones and
+    {"count", "sum", "buckets"} for histograms.
+    """
+    return {name: metric.snapshot() for name, metric in REGISTRY.items()}
+
+
+def prometheus_text():
+    """
+    Every metric in Prometheus text exposition format.
+    """
+    lines = []
+    for metric in REGISTRY.values():
+        lines.extend(metric.prometheus())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,194 @@
+# montecarlo.py - Monte Carlo shot planner. Samples full enemy layouts that
+# agree with every hit, miss and sunk ship seen so far, spread over a process
+# pool, and fires at the cell occupied in the most samples.
+
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from state import fleet, grid_size
+from engine import Outcome
+from ai import DensityAI, placement_index
+from zobrist import ViewHash
+
+# Layouts drawn per requested sample before sampling gives up
+MAX_TRIES = 500
+
+# One pool per worker count, shared by every planner in the process
+_pools = {}
+
+
+def get_pool(workers):
+    """
+    Returns the shared process pool with the given number of workers.
+    """
+    if workers not in _pools:
+        _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _pools[workers]
+
+
+def shutdown_pools():
+    """
+    Stops every shared pool, e.g. at the end of a simulation run.
+    """
+    for pool in _pools.values():
+        pool.shutdown()
+    _pools.clear()
+
+
+def sample_layouts(size, ship_lens, blocked, hits, samples, seed, time_budget=None):
+    """
+    Draws up to `samples` random layouts of the given ships that avoid the
+    blocked cells (misses and sunk ships) and cover every unresolved hit.
+    Every consistent layout is equally likely to be drawn. Runs inside a
+    pool worker, so it only takes plain picklable arguments.
+    Returns (counts, accepted): counts[cell] is how many accepted layouts
+    put a ship on that cell.
+    """
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+
+    blocked_mask = 0
+    for cell in blocked:
+        blocked_mask |= 1 << cell
+    hits_mask = 0
+    for cell in hits:
+        hits_mask |= 1 << cell
+
+    # Placements as (mask, cells), minus any that cross a blocked cell or
+    # lie entirely on hits (that ship would already have been reported sunk)
+    tables = {}
+    for ship_len in set(ship_lens):
+        options = []
+        for placement in placement_index(size, ship_len)[0]:
+            mask = 0
+            for cell in placement:
+                mask |= 1 << cell
+            if not mask & blocked_mask and mask & hits_mask != mask:
+                options.append((mask, placement))
+        tables[ship_len] = options
+
+    # Rejection sampling over whole layouts: every ship takes a uniformly
+    # random placement on its own and the layout is kept only if nothing
+    # overlaps and every hit is covered, so each consistent layout is
+    # equally likely. Long ships go first so overlaps are caught early.
+    order = sorted(ship_lens, reverse=True)
+    if not all(tables[ship_len] for ship_len in order):
+        return [0] * (size * size), 0
+    counts = [0] * (size * size)
+    accepted = 0
+
+    for attempt in range(samples * MAX_TRIES):
+        if accepted >= samples or (deadline is not None and attempt % 64 == 0
+                                   and time.perf_counter() > deadline):
+            break
+
+        occupied = 0
+        chosen = []
+        for ship_len in order:
+            options = tables[ship_len]
+            mask, cells = options[rng.randrange(len(options))]
+            if mask & occupied:
+                break
+            occupied |= mask
+            chosen.append(cells)
+        else:
+            if occupied & hits_mask == hits_mask:
+                accepted += 1
+                for cells in chosen:
+                    for cell in cells:
+                        counts[cell] += 1
+
+    return counts, accepted
+
+
+class MonteCarloAI:
+    """
+    Samples many layouts consistent with the observed board and fires at the
+    untouched cell that holds a ship most often across them.
+    Set samples per move, time_budget (seconds per move) or both; sampling is
+    split across `workers` processes. Falls back to DensityAI when no
+    consistent layout is found in the budget.
+    With a zobrist.ProbabilityCache, board states seen before reuse the
+    counts sampled the first time.
+    """
+
+    def __init__(self, size=grid_size, ships=fleet, rng=random,
+                 samples=2000, time_budget=None, workers=None, cache=None):
+        self.size = size
+        self.rng = rng
+        self.cache = cache
+        self.view = ViewHash(size, ships)
+        self.samples = samples
+        self.time_budget = time_budget
+        self.workers = workers or os.cpu_count() or 1
+        self.ship_lens = {name: ship_len for name, ship_len in ships}
+        self.remaining = [ship_len for _, ship_len in ships]
+
+        self.shot = bytearray(size * size)
+        self.blocked = set()           # misses and sunk ship cells
+        self.unresolved = set()        # hit cells not yet part of a sunk ship
+        self.fallback = DensityAI(size, ships, rng)
+        self.last_samples = 0          # accepted layouts behind the last shot
+
+    def observe(self, result):
+        self.fallback.observe(result)
+        self.view.shot(result.row, result.col, result.outcome != Outcome.MISS, result.ship)
+        cell = result.row * self.size + result.col
+        self.shot[cell] = 1
+
+        if result.outcome == Outcome.MISS:
+            self.blocked.add(cell)
+            return
+
+        self.unresolved.add(cell)
+        if result.outcome in (Outcome.SUNK, Outcome.WIN):
+            ship = result.ship
+            self.remaining.remove(self.ship_lens[ship["name"]])
+            for r, c in ship["coords"]:
+                sunk_cell = r * self.size + c
+                self.unresolved.discard(sunk_cell)
+                self.blocked.add(sunk_cell)
+
+    def occupancy(self):
+        """
+        Runs the sampling, in parallel when workers > 1.
+        Returns (counts, accepted) summed over every worker.
+        """
+        args = (self.size, tuple(self.remaining), tuple(self.blocked),
+                tuple(self.unresolved))
+
+        if self.workers == 1:
+            return sample_layouts(*args, self.samples, self.rng.getrandbits(64), self.time_budget)
+
+        share = -(-self.samples // self.workers)
+        pool = get_pool(self.workers)
+        futures = [
+            pool.submit(sample_layouts, *args, share, self.rng.getrandbits(64), self.time_budget)
+            for _ in range(self.workers)
+        ]
+
+        counts = [0] * (self.size * self.size)
+        accepted = 0
+        for future in futures:
+            worker_counts, worker_accepted = future.result()
+            accepted += worker_accepted
+            for cell, n in enumerate(worker_counts):
+                counts[cell] += n
+        return counts, accepted
+
+    def choose_shot(self):
+        if self.cache is None:
+            counts, self.last_samples = self.occupancy()
+        else:
+            counts, self.last_samples = self.cache.lookup(self.view.value, self.occupancy)
+
+        shot = self.shot
+        scores = {c: n for c, n in enumerate(counts) if not shot[c] and n}
+        if not scores:
+            return self.fallback.choose_shot()
+
+        best = max(scores.values())
+        choices = [c for c, n in scores.items() if n == best]
+        return divmod(self.rng.choice(choices), self.size)
@@ -0,0 +1,57 @@
+# openingbook.py - Builds an opening book: the exact shot-probability maps
+# of the board states bots reach in the first few shots of a game, computed
+# once and saved to disk, so simulations can preload them into the cache
+# instead of recounting the opening every game.
+
+import argparse
+import random
+
+from state import fleet, grid_size
+from placement import random_ship_layout
+from engine import new_game, fire
+from exact import ExactAI
+from zobrist import ProbabilityCache, save_book
+
+
+def build_book(games=20, plies=2, size=grid_size, ships=fleet, seed=None):
+    """
+    Plays the first `plies` shots per player of `games` games between
+    ExactAIs sharing one cache. Returns every map they computed, as
+    {view hash: (counts, layouts)}.
+    """
+    rng = random.Random(seed)
+    cache = ProbabilityCache(maxsize=2 * games * plies + 1)
+
+    for _ in range(games):
+        session = new_game(random_ship_layout(ships, size, rng)[1],
+                           random_ship_layout(ships, size, rng)[1], size)
+        players = [ExactAI(size, ships, rng, cache), ExactAI(size, ships, rng, cache)]
+        for _ in range(2 * plies):
+            player = players[session.current_player]
+            result = fire(session, *player.choose_shot())
+            player.observe(result)
+            if session.game_over:
+                break
+    return dict(cache.entries)
+
+
+def main():
+    """
+    Command line entry point:
+    python openingbook.py opening.bsob --games 20 --plies 2
+    """
+    parser = argparse.ArgumentParser(description="Build a Battleship opening book of exact probability maps.")
+    parser.add_argument("path")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--plies", type=int, default=2, help="shots per player to cover")
+    parser.add_argument("--size", type=int, default=grid_size)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    entries = build_book(args.games, args.plies, args.size, seed=args.seed)
+    save_book(args.path, args.size, entries, fleet)
+    print(f"Saved {len(entries)} board states to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
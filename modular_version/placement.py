@@ -1,16 +1,25 @@
 # placement.py - Handles manual + random ship placement
 
 import random
-from state import *
+
+import metrics
+from state import fleet, grid_size, empty_grid, Cell
 from board import input_coordinate, print_single_grid
+from engine import index_ships
+
+
+class NoLegalPlacement(ValueError):
+    """
+    Raised when a ship cannot fit anywhere on the grid.
+    """
 
-def validate_grid_and_place_ship(start_row, end_row, start_col, end_col):
+def place_ship(grid, ship_positions, start_row, end_row, start_col, end_col):
     """
-    Attempts to place a ship between two grid points.
+    Attempts to place a ship between two grid points on the given grid.
     Only allows horizontal or vertical placement.
     Returns True if successfully placed, otherwise False.
     """
-    global placing_grid, placing_ship_positions
+    size = len(grid)
 
     # Must be Horizontal or Vertical
     if start_row != end_row and start_col != end_col:
@@ -20,102 +29,173 @@ def validate_grid_and_place_ship(start_row, end_row, start_col, end_col):
 
     # Horizontal
     if start_row == end_row:
+        if not (0 <= start_row < size):
+            return False
         for c in range(start_col, end_col + (1 if end_col > start_col else -1), 
                        1 if end_col > start_col else -1):
-            if not (0 <= c < grid_size) or placing_grid[start_row][c] != Cell.EMPTY:
+            if not (0 <= c < size) or grid[start_row][c] != Cell.EMPTY:
                 return False
             coords.append((start_row, c))
     else: # Vertical
+        if not (0 <= start_col < size):
+            return False
         for r in range(start_row, end_row + (1 if end_row > start_row else -1),
                        1 if end_row > start_row else -1):
-            if not (0 <= r < grid_size) or placing_grid[r][start_col] != Cell.EMPTY:
+            if not (0 <= r < size) or grid[r][start_col] != Cell.EMPTY:
                 return False
             coords.append((r, start_col))
 
     # Place ship
     for r, c in coords:
-        placing_grid[r][c] = Cell.SHIP
+        grid[r][c] = Cell.SHIP
 
-    placing_ship_positions.append(coords)
+    ship_positions.append(coords)
     return True
 
 
-def place_ship_randomly(ship_name, ship_len):
+def validate_grid_and_place_ship(player, start_row, end_row, start_col, end_col):
+    """
+    Attempts to place a ship between two grid points on the player's board.
+    Returns True if successfully placed, otherwise False.
+    """
+    return place_ship(player.grid, player.ship_positions,
+                      start_row, end_row, start_col, end_col)
+
+
+def legal_placements(grid, ship_len):
     """
-    Randomly places a single ship of given length on placing_grid.
-    Retries until a valid non-overlapping position is found.
+    Lists every (start_row, end_row, start_col, end_col) where a ship of given
+    length fits on empty cells, horizontal placements first.
     """
-    global placing_grid, placing_ship_positions
+    placements = []
+    empty = Cell.EMPTY
 
-    while True:
-        direction = random.choice(["H", "V"])
-        row = random.randint(0, grid_size - 1)
-        col = random.randint(0, grid_size - 1)
+    # Horizontal: count the run of empty cells ending at each column
+    for r, row in enumerate(grid):
+        run = 0
+        for c, cell in enumerate(row):
+            run = run + 1 if cell is empty else 0
+            if run >= ship_len:
+                placements.append((r, r, c - ship_len + 1, c))
 
-        if direction == "H":
-            ok = validate_grid_and_place_ship(row, row, col, col + ship_len - 1)
-        else:
-            ok = validate_grid_and_place_ship(row, row + ship_len - 1, col, col)
+    # Vertical: same, walking down each column
+    for c, column in enumerate(zip(*grid)):
+        run = 0
+        for r, cell in enumerate(column):
+            run = run + 1 if cell is empty else 0
+            if run >= ship_len:
+                placements.append((r - ship_len + 1, r, c, c))
 
-        if ok:
-            coords = placing_ship_positions[-1]
-            placing_ship_positions[-1] = {"name": ship_name, "coords": coords}
-            print(f"✔ {ship_name} placed randomly.")
-            break
+    return placements
 
 
-def create_grid():
+def expected_retries(size, legal_count):
     """
-    Runs full ship placement for both players.
-    Players can choose manual or random placement.
+    How many failed draws the old rejection loop (random direction, row and
+    column, retry until it fits) would need on average before succeeding.
+    """
+    if legal_count == 0:
+        return float("inf")
+    return 2 * size * size / legal_count - 1
+
+
+def random_place_ship(grid, ship_positions, ship_name, ship_len, rng=random):
     """
-    global player_grids, player_ship_positions, ships_sunk
-    global placing_grid, placing_ship_positions
+    Places a single ship of given length on the given grid, drawn uniformly
+    from every legal placement, so it never retries and never hangs.
+    No console output, so it can be used by the headless engine.
+    Returns the retries the old rejection loop would have needed on average.
+    Raises NoLegalPlacement if the ship fits nowhere.
+    """
+    placements = legal_placements(grid, ship_len)
+    if not placements:
+        raise NoLegalPlacement(f"No legal placement left for {ship_name} (length {ship_len}).")
+
+    place_ship(grid, ship_positions, *rng.choice(placements))
+    ship_positions[-1] = {"name": ship_name, "coords": ship_positions[-1]}
 
-    ships_sunk = [0, 0]
+    retries = expected_retries(len(grid), len(placements))
+    if metrics.enabled:
+        metrics.PLACEMENT_RETRIES.observe(retries)
+    return retries
 
-    for player_index, name in enumerate(player_names):
-        placing_grid = [[Cell.EMPTY for _ in range(grid_size)] for _ in range(grid_size)]
-        placing_ship_positions = []
 
-        print(f"\n--- {name}: Place your ships ---")
+def random_ship_layout(ships=fleet, size=grid_size, rng=random):
+    """
+    Builds a complete random layout for one player.
+    Returns (grid, ship_positions) without printing anything.
+    Raises NoLegalPlacement if the fleet does not fit.
+    """
+    grid = empty_grid(size)
+    ship_positions = []
+
+    for ship_name, ship_len in ships:
+        random_place_ship(grid, ship_positions, ship_name, ship_len, rng)
+
+    return grid, ship_positions
+
+
+def place_ship_randomly(player, ship_name, ship_len, rng=random):
+    """
+    Randomly places a single ship of given length on the player's board.
+    Returns the retries the old rejection loop would have needed on average.
+    """
+    retries = random_place_ship(player.grid, player.ship_positions, ship_name, ship_len, rng)
+    print(f"✔ {ship_name} placed randomly.")
+    return retries
+
+
+def create_grid(session, rng=random):
+    """
+    Runs full ship placement for both players.
+    Players can choose manual or random placement;
+    random placements draw from rng.
+    """
+    for player_index, player in enumerate(session.players):
+        player.grid = empty_grid(session.grid_size)
+        player.ship_positions = []
+        player.ships_sunk = 0
+
+        print(f"\n--- {player.name}: Place your ships ---")
         mode = input("Manual or Random? [M/R]: ").strip().upper()
         if mode not in ("M", "R"): mode = "M"
 
         for ship_name, ship_len in fleet:
             if mode == "R":
-                place_ship_randomly(ship_name, ship_len)
+                place_ship_randomly(player, ship_name, ship_len, rng)
                 continue
 
             while True:  
                 print_single_grid(
-                    f"{name} - Ship layout",
-                    placing_grid,
+                    f"{player.name} - Ship layout",
+                    player.grid,
                     reveal_ships=True
                 )
                 print(f"Place {ship_name}(length: {ship_len})")
 
-                row, col = input_coordinate("Start coordinate (e.g. A5): ")
+                row, col = input_coordinate("Start coordinate (e.g. A5): ", session.grid_size)
                 direction = input("Direction H/V: ").strip().upper()
 
                 if direction == "H":
-                    ok = validate_grid_and_place_ship(row, row, col, col + ship_len - 1)
+                    ok = validate_grid_and_place_ship(player, row, row, col, col + ship_len - 1)
                 else:
-                    ok = validate_grid_and_place_ship(row, row + ship_len - 1, col, col)
+                    ok = validate_grid_and_place_ship(player, row, row + ship_len - 1, col, col)
 
                 if ok:
-                    coords = placing_ship_positions[-1]
-                    placing_ship_positions[-1] = {"name": ship_name, "coords": coords}
+                    coords = player.ship_positions[-1]
+                    player.ship_positions[-1] = {"name": ship_name, "coords": coords}
                     print(f"✔ {ship_name} placed!\n")
                     break
                 print("Invalid placement - try again.")
 
-        player_grids[player_index] = placing_grid
-        player_ship_positions[player_index] = placing_ship_positions
+        index_ships(player)
 
         if player_index == 0:
             input("Player 1 done — pass and press ENTER.")
             print("\n" * 50)
 
+    if session.log is not None:
+        session.log.start_game(session)
+
     input("\nBoth players done. Press ENTER to start battle...")
     print("\n" * 50)
@@ -0,0 +1,155 @@
+# render.py - Incremental terminal renderer. Keeps the last frame on screen,
+# caches row strings per grid, and redraws only the characters that changed
+# using cursor positioning, in a single buffered write per frame.
+#
+# The frame is pinned to the top of the screen: the terminal's scrolling
+# region is set to the lines below it, so prompts and messages scroll there
+# without moving the frame. A frame that leaves no room for them is always
+# redrawn in full.
+
+import shutil
+import sys
+
+from board import format_header, format_row
+
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+CLEAR_LINE_END = "\x1b[K"
+CLEAR_BELOW = "\x1b[J"
+RESET_SCROLL_REGION = "\x1b[r"
+# Lines kept free below a frame for prompts and messages
+PROMPT_LINES = 4
+
+
+def move_to(line, col):
+    """
+    ANSI cursor position, both 0-indexed here (the terminal counts from 1).
+    """
+    return f"\x1b[{line + 1};{col + 1}H"
+
+
+def scroll_region(first, last):
+    """
+    Limits scrolling to lines first..last, 0-indexed and inclusive.
+    """
+    return f"\x1b[{first + 1};{last + 1}r"
+
+
+class GridRenderer:
+    """
+    Draws frames (lists of text lines) to a stream.
+    On a TTY only changed characters are rewritten; otherwise every frame
+    is written in full, exactly like print_single_grid.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.tty = self.stream.isatty()
+        self.frame = None              # lines currently on screen
+        self.height = None             # terminal lines when it was drawn
+        self.rows = {}                 # (id(grid), reveal) -> (grid, row strings)
+
+    def invalidate(self, grid, row):
+        """
+        Marks one row of a grid as changed, e.g. after a shot landed on it.
+        """
+        for reveal in (True, False):
+            entry = self.rows.get((id(grid), reveal))
+            if entry is not None and entry[0] is grid:
+                entry[1][row] = None
+
+    def row_strings(self, grid, reveal_ships):
+        """
+        Formatted rows for a grid, rebuilding only invalidated rows.
+        """
+        key = (id(grid), reveal_ships)
+        entry = self.rows.get(key)
+        if entry is None or entry[0] is not grid:
+            entry = (grid, [None] * len(grid))
+            self.rows[key] = entry
+
+        rows = entry[1]
+        for r, text in enumerate(rows):
+            if text is None:
+                rows[r] = format_row(r, grid[r], reveal_ships)
+        return rows
+
+    def grid_lines(self, title, grid, reveal_ships):
+        """
+        Same lines as board.grid_lines, served from the row cache.
+        """
+        return ["", title, format_header(len(grid))] + self.row_strings(grid, reveal_ships) + [""]
+
+    def draw(self, lines):
+        """
+        Shows a frame. Leaves the cursor on the line below it, with
+        everything underneath cleared, so prompts and messages follow.
+        """
+        if not self.tty:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+            return
+
+        height = shutil.get_terminal_size().lines
+        if len(lines) + PROMPT_LINES > height:
+            # No room to pin the frame; it would scroll, so never diff it
+            self.stream.write(RESET_SCROLL_REGION + CLEAR_SCREEN + "\n".join(lines) + "\n")
+            self.stream.flush()
+            self.frame = None
+            return
+
+        if self.frame is None or len(self.frame) != len(lines) or height != self.height:
+            parts = [CLEAR_SCREEN, scroll_region(len(lines), height - 1), "\n".join(lines), "\n"]
+        else:
+            parts = []
+            for i, (old, new) in enumerate(zip(self.frame, lines)):
+                if old != new:
+                    parts.extend(self._line_diff(i, old, new))
+            parts.append(move_to(len(lines), 0))
+        parts.append(CLEAR_BELOW)
+
+        self.frame = list(lines)
+        self.height = height
+        self.stream.write("".join(parts))
+        self.stream.flush()
+
+    def _line_diff(self, i, old, new):
+        """
+        Cursor moves and text that turn line i from old into new.
+        """
+        parts = []
+        j = 0
+        width = min(len(old), len(new))
+        while j < width:
+            if old[j] == new[j]:
+                j += 1
+                continue
+            start = j
+            while j < width and old[j] != new[j]:
+                j += 1
+            parts.append(move_to(i, start) + new[start:j])
+
+        if len(new) > width:
+            parts.append(move_to(i, width) + new[width:])
+        elif len(old) > width:
+            parts.append(move_to(i, width) + CLEAR_LINE_END)
+        return parts
+
+    def clear(self):
+        """
+        Hides everything, e.g. when handing over to the other player.
+        """
+        if self.tty:
+            self.stream.write(RESET_SCROLL_REGION + CLEAR_SCREEN)
+        else:
+            self.stream.write("\n" * 51)
+        self.stream.flush()
+        self.frame = None
+
+    def close(self):
+        """
+        Gives the whole screen back to the terminal's scrolling.
+        """
+        if self.tty:
+            # Resetting the region homes the cursor; save and restore it around that
+            self.stream.write("\x1b7" + RESET_SCROLL_REGION + "\x1b8")
+            self.stream.flush()
@@ -0,0 +1,290 @@
+# scripted.py - Non-interactive mode. Plays games from a move file or a piped
+# stream, without prompts, pauses or screen clears, and writes one JSON
+# result per game (and optionally per shot) to stdout.
+#
+# One move per line, either as words or as a JSON object:
+#   game Alice Bob                 {"op": "game", "names": ["Alice", "Bob"], "size": 10}
+#   place 1 Carrier A1 H           {"op": "place", "player": 1, "ship": "Carrier", "at": "A1", "dir": "H"}
+#   place 2 random 42              {"op": "place", "player": 2, "random": true, "seed": 42}
+#   fire B7                        {"op": "fire", "at": "B7"}
+#   fire 2 C3                      {"op": "fire", "player": 2, "at": "C3"}
+# Blank lines and lines starting with # are skipped. The first game needs
+# no "game" line. Bad moves, including lines that are not UTF-8, are
+# reported in the game's result and skipped.
+
+import argparse
+import json
+import random
+import sys
+from functools import lru_cache
+
+from state import fleet, grid_size, GameSession
+from board import parse_coordinate
+from placement import validate_grid_and_place_ship, random_ship_layout
+from engine import fire, index_ships
+from seeds import master_seed, game_rng
+
+
+# Largest grid a script may ask for: scripted games keep dense list grids
+MAX_SIZE = 1000
+
+# Scripts repeat the same few hundred targets; parse each one once
+cached_coordinate = lru_cache(maxsize=1 << 16)(parse_coordinate)
+
+
+class ScriptError(ValueError):
+    """
+    A move that cannot be played; reported with its line number.
+    """
+
+
+def parse_line(line):
+    """
+    Turns one script line (str, or UTF-8 bytes) into a move dict like the
+    JSON form, or None for blank lines and comments.
+    """
+    if isinstance(line, bytes):
+        try:
+            line = line.decode()
+        except UnicodeDecodeError:
+            raise ScriptError("Line is not valid UTF-8.") from None
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if line.startswith("{"):
+        try:
+            move = json.loads(line)
+        except ValueError:
+            raise ScriptError("Invalid JSON.") from None
+        if not isinstance(move, dict):
+            raise ScriptError("JSON moves must be objects.")
+        return move
+
+    words = line.split()
+    op = words[0].lower()
+    if op == "game":
+        return {"op": "game", "names": words[1:3]}
+    if op == "fire":
+        if len(words) == 2:
+            return {"op": "fire", "at": words[1]}
+        if len(words) == 3:
+            return {"op": "fire", "player": words[1], "at": words[2]}
+    if op == "place" and len(words) >= 3:
+        if words[2].lower() == "random":
+            return {"op": "place", "player": words[1], "random": True,
+                    "seed": words[3] if len(words) > 3 else None}
+        if len(words) >= 5:
+            return {"op": "place", "player": words[1], "ship": " ".join(words[2:-2]),
+                    "at": words[-2], "dir": words[-1]}
+    raise ScriptError(f"Cannot read move: {line}")
+
+
+def check_size(value):
+    """
+    The grid size of a "game" move. Raises ScriptError unless it is a
+    whole number from 1 to MAX_SIZE.
+    """
+    if type(value) is not int or not 1 <= value <= MAX_SIZE:
+        raise ScriptError(f"Size must be a whole number from 1 to {MAX_SIZE}.")
+    return value
+
+
+class ScriptedGame:
+    """
+    One game being played from a script.
+    """
+
+    def __init__(self, number, names=None, size=grid_size, ships=fleet, seed=None):
+        names = list(names or ())
+        names += ["Player 1", "Player 2"][len(names):]
+        self.number = number
+        self.session = GameSession(tuple(names[:2]), size)
+        self.ships = ships
+        self.seed = seed               # master seed of the run
+        # Random placements without a seed of their own draw from this
+        self.rng = random if seed is None else game_rng(seed, number)
+        self.errors = []
+        self.started = False           # both fleets placed
+
+    def _player(self, move):
+        try:
+            index = int(move["player"]) - 1
+        except (KeyError, TypeError, ValueError):
+            raise ScriptError("Player must be 1 or 2.") from None
+        if index not in (0, 1):
+            raise ScriptError("Player must be 1 or 2.")
+        return index
+
+    def placed(self, player):
+        return len(player.ship_positions) == len(self.ships)
+
+    @property
+    def touched(self):
+        """
+        True once any move, good or bad, was made in this game.
+        """
+        return bool(self.errors) or any(player.ship_positions for player in self.session.players)
+
+    def place(self, move):
+        player = self.session.players[self._player(move)]
+        if self.placed(player):
+            raise ScriptError(f"{player.name} has already placed every ship.")
+        size = self.session.grid_size
+
+        if move.get("random"):
+            if player.ship_positions:
+                raise ScriptError("Random placement must place the whole fleet.")
+            rng = self.rng
+            seed = move.get("seed")
+            if seed is not None:
+                try:
+                    rng = random.Random(int(seed))
+                except (TypeError, ValueError):
+                    raise ScriptError("Seed must be a whole number.") from None
+            player.grid, player.ship_positions = random_ship_layout(self.ships, size, rng)
+            index_ships(player)
+            self.started = all(self.placed(p) for p in self.session.players)
+            return
+
+        lengths = dict(self.ships)
+        ship_name = move.get("ship")
+        if not isinstance(ship_name, str) or ship_name not in lengths:
+            raise ScriptError(f"Unknown ship: {ship_name}")
+        if any(ship["name"] == ship_name for ship in player.ship_positions):
+            raise ScriptError(f"{ship_name} is already placed.")
+
+        row, col = parse_coordinate(str(move.get("at", "")), size)
+        direction = str(move.get("dir", "")).upper()
+        ship_len = lengths[ship_name]
+        if direction == "H":
+            ok = validate_grid_and_place_ship(player, row, row, col, col + ship_len - 1)
+        elif direction == "V":
+            ok = validate_grid_and_place_ship(player, row, row + ship_len - 1, col, col)
+        else:
+            raise ScriptError("Direction must be H or V.")
+        if not ok:
+            raise ScriptError(f"Invalid placement for {ship_name}.")
+
+        player.ship_positions[-1] = {"name": ship_name, "coords": player.ship_positions[-1]}
+        if self.placed(player):
+            index_ships(player)
+            self.started = all(self.placed(p) for p in self.session.players)
+
+    def fire(self, move):
+        session = self.session
+        if not self.started:
+            raise ScriptError("Both fleets must be placed before firing.")
+        if "player" in move and self._player(move) != session.current_player:
+            raise ScriptError("Not this player's turn.")
+        row, col = cached_coordinate(str(move.get("at", "")), session.grid_size)
+        return fire(session, row, col)
+
+    def result(self):
+        session = self.session
+        players = session.players
+        return {
+            "game": self.number,
+            "seed": self.seed,
+            "names": [p.name for p in players],
+            "finished": session.game_over,
+            "winner": players[session.winner].name if session.game_over else None,
+            "shots": [p.shots_taken for p in players],
+            "hits": [p.hits for p in players],
+            "misses": [p.misses for p in players],
+            "ships_sunk": [p.ships_sunk for p in players],
+            "errors": self.errors,
+        }
+
+
+def run_script(lines, out, size=grid_size, seed=None, moves=False, strict=False):
+    """
+    Plays every game in lines (any iterable of str or bytes lines; a text
+    stream that fails to decode ends the run with an error) and writes JSON
+    results to out, one per line. With moves, also writes one line per shot.
+    With strict, stops at the first bad move instead of skipping it.
+    Random placements without a seed of their own draw from the game's
+    stream under seed (see seeds.py). Without a seed one is drawn; each
+    result records it so the run can be replayed.
+    Returns the number of games played.
+    """
+    seed = master_seed(seed)
+    game = ScriptedGame(1, size=check_size(size), seed=seed)
+    games = 0
+    write = out.write
+
+    numbered = enumerate(lines, 1)
+    number = 0
+    while True:
+        try:
+            number, line = next(numbered)
+        except StopIteration:
+            break
+        except UnicodeDecodeError:
+            # A text stream cannot go on past bytes it failed to decode
+            if strict:
+                raise ScriptError(f"Line {number + 1}: Input is not valid UTF-8.") from None
+            game.errors.append({"line": number + 1, "error": "Input is not valid UTF-8."})
+            break
+
+        try:
+            move = parse_line(line)
+            if move is None:
+                continue
+            op = move.get("op")
+            if op == "fire":
+                result = game.fire(move)
+                if moves:
+                    write(json.dumps({"game": game.number, "line": number,
+                                      "player": 2 - game.session.current_player,
+                                      "at": move["at"], "result": result.outcome.name.lower(),
+                                      "ship": result.ship["name"] if result.ship else None}) + "\n")
+            elif op == "place":
+                game.place(move)
+            elif op == "game":
+                game_size = check_size(move.get("size", size))
+                names = move.get("names") or []
+                if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+                    raise ScriptError("Names must be a list of strings.")
+                if game.touched:
+                    write(json.dumps(game.result()) + "\n")
+                    games += 1
+                game = ScriptedGame(games + 1, names, game_size, seed=seed)
+            else:
+                raise ScriptError(f"Unknown op: {op}")
+        except ValueError as error:
+            if strict:
+                raise ScriptError(f"Line {number}: {error}") from error
+            game.errors.append({"line": number, "error": str(error)})
+
+    if game.touched:
+        write(json.dumps(game.result()) + "\n")
+        games += 1
+    return games
+
+
+def main():
+    """
+    Command line entry point:
+    python scripted.py moves.txt > results.jsonl
+    python scripted.py - < moves.txt
+    """
+    parser = argparse.ArgumentParser(description="Play Battleship games from a move script.")
+    parser.add_argument("script", nargs="?", default="-", help="move file, or - for stdin")
+    parser.add_argument("--size", type=int, default=grid_size)
+    parser.add_argument("--seed", type=int, default=None, help="seed for random placements")
+    parser.add_argument("--moves", action="store_true", help="also write one JSON line per shot")
+    parser.add_argument("--strict", action="store_true", help="stop at the first bad move")
+    args = parser.parse_args()
+
+    lines = sys.stdin.buffer if args.script == "-" else open(args.script, "rb")
+    try:
+        run_script(lines, sys.stdout, args.size, args.seed, args.moves, args.strict)
+    except ScriptError as error:
+        sys.exit(str(error))
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+# seeds.py - Per-game random streams derived from one master seed. Each
+# game gets its own random.Random, seeded from a hash of (master seed, game
+# index), so a game never depends on the games played before it or on which
+# worker process played it, and any game of a long parallel run can be
+# replayed on its own from its (seed, game) pair.
+
+import hashlib
+import random
+import secrets
+
+
+def master_seed(seed=None):
+    """
+    The master seed of a run: seed itself, or a fresh random one to report
+    so the run can be replayed.
+    """
+    return secrets.randbits(63) if seed is None else seed
+
+
+def game_seed(seed, game, *salt):
+    """
+    64-bit seed of game number `game` under a master seed. salt (e.g. the
+    two strategies of a tournament pairing) separates further streams.
+    """
+    key = "/".join(str(part) for part in (seed, game) + salt).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def game_rng(seed, game, *salt):
+    """
+    The random stream of one game, for its placement and every AI in it.
+    """
+    return random.Random(game_seed(seed, game, *salt))
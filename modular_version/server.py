@@ -0,0 +1,311 @@
+# server.py - Asyncio multiplayer server. Many matches share one event loop;
+# clients talk JSON lines over TCP. Placement, firing and win detection are
+# the same rules the console game uses.
+#
+# Requests (one JSON object per line), each answered with {"ok": true, ...}
+# or {"ok": false, "error": "..."}:
+#   {"op": "new", "name": "Alice", "salvo": true}  -> {"match": id, "player": 0}
+#   {"op": "join", "match": id, "name": "Bob"}     -> {"player": 1}
+#   {"op": "place", "random": true}
+#   {"op": "place", "ships": [{"name": "Carrier", "coords": [[0, 0], ...]}, ...]}
+#   {"op": "fire", "target": "B7"}                 -> {"result": "hit", "ship": null}
+#   {"op": "fire", "targets": ["B7", [3, 4]]}      -> {"shots": [...], "sunk": [...], "won": false}
+#   {"op": "metrics"}                              -> {"metrics": {...}, ...}
+#   {"op": "quit"}
+# Events pushed to players: {"event": "joined" | "start" | "incoming" |
+# "volley" | "game_over" | "left", ...}
+# In a salvo match each turn is one "targets" volley of up to one shot per
+# surviving ship; the opponent gets a single "volley" event for it.
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+
+import metrics
+from state import fleet, grid_size, empty_grid, GameSession
+from board import parse_coordinate
+from placement import validate_grid_and_place_ship, random_ship_layout
+from engine import fire, fire_many, salvo_shots, index_ships, Outcome
+from layouts import check_layout, LayoutError
+
+
+class ProtocolError(Exception):
+    """
+    A request the server refuses; the message goes back to the client.
+    """
+
+
+class Match:
+    """
+    One game on the server: the session plus each player's connection.
+    """
+    __slots__ = ("id", "session", "writers", "placed")
+
+    def __init__(self, match_id, name, size=grid_size, salvo=False):
+        self.id = match_id
+        self.session = GameSession((name, "Player 2"), size)
+        self.session.salvo = salvo
+        self.writers = [None, None]
+        self.placed = [False, False]
+
+    @property
+    def started(self):
+        return self.placed[0] and self.placed[1]
+
+
+def place_fleet(player, ships, size):
+    """
+    Places a client-supplied fleet after checking it with check_layout.
+    ships must list every ship of the fleet once, each as straight,
+    contiguous coordinates.
+    Raises ProtocolError and leaves the board empty if anything is wrong.
+    """
+    player.grid = empty_grid(size)
+    player.ship_positions = []
+    if not isinstance(ships, list):
+        raise ProtocolError("ships must be a list of {\"name\", \"coords\"} objects.")
+    try:
+        check_layout(ships, fleet, size)
+    except LayoutError as error:
+        raise ProtocolError(str(error)) from None
+
+    given = {ship["name"]: ship["coords"] for ship in ships}
+    for ship_name, _ in fleet:
+        coords = sorted(tuple(coord) for coord in given[ship_name])
+        (start_row, start_col), (end_row, end_col) = coords[0], coords[-1]
+        validate_grid_and_place_ship(player, start_row, end_row, start_col, end_col)
+        player.ship_positions[-1] = {"name": ship_name, "coords": player.ship_positions[-1]}
+
+    index_ships(player)
+
+
+class BattleshipServer:
+    """
+    Holds every match and serves clients on one event loop.
+    """
+
+    def __init__(self, size=grid_size, rng=random):
+        self.size = size
+        self.rng = rng
+        self.matches = {}
+        self.match_ids = itertools.count(1)
+        self.shots = 0                 # total shots resolved, for monitoring
+
+    async def start(self, host="127.0.0.1", port=8765):
+        """
+        Starts listening and returns the asyncio server.
+        """
+        return await asyncio.start_server(self.handle_client, host, port,
+                                          limit=1 << 16, backlog=4096)
+
+    async def handle_client(self, reader, writer):
+        """
+        Reads requests from one connection until it closes.
+        """
+        conn = {"match": None, "player": None}
+        try:
+            while True:
+                request = None
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ProtocolError("Requests must be JSON objects.")
+                    reply = self.handle(conn, writer, request)
+                    reply["ok"] = True
+                except (ProtocolError, ValueError) as error:
+                    reply = {"ok": False, "error": str(error)}
+                except (TypeError, KeyError, IndexError):
+                    reply = {"ok": False, "error": "Malformed request."}
+                if isinstance(request, dict) and "id" in request:
+                    reply["id"] = request["id"]
+                writer.write((json.dumps(reply) + "\n").encode())
+                if reply.get("quit"):
+                    break
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.leave(conn)
+            writer.close()
+
+    def handle(self, conn, writer, request):
+        """
+        Dispatches one request and returns the reply fields.
+        """
+        op = request.get("op")
+        if op == "new":
+            return self.op_new(conn, writer, request)
+        if op == "join":
+            return self.op_join(conn, writer, request)
+        if op == "metrics":
+            return {"metrics": metrics.snapshot(), "matches": len(self.matches), "shots": self.shots}
+
+        match = self.matches.get(conn["match"])
+        if match is None:
+            raise ProtocolError("Create or join a match first.")
+
+        if op == "place":
+            return self.op_place(conn, match, request)
+        if op == "fire":
+            return self.op_fire(conn, match, request)
+        if op == "quit":
+            return {"quit": True}
+        raise ProtocolError(f"Unknown op: {op}")
+
+    def op_new(self, conn, writer, request):
+        if conn["match"] in self.matches:
+            raise ProtocolError("Already in a match.")
+        match = Match(next(self.match_ids), request.get("name") or "Player 1", self.size,
+                      bool(request.get("salvo")))
+        match.writers[0] = writer
+        self.matches[match.id] = match
+        conn["match"], conn["player"] = match.id, 0
+        return {"match": match.id, "player": 0, "salvo": match.session.salvo}
+
+    def op_join(self, conn, writer, request):
+        if conn["match"] in self.matches:
+            raise ProtocolError("Already in a match.")
+        match = self.matches.get(request.get("match"))
+        if match is None or match.writers[1] is not None:
+            raise ProtocolError("No such open match.")
+        name = request.get("name") or "Player 2"
+        match.session.players[1].name = name
+        match.writers[1] = writer
+        conn["match"], conn["player"] = match.id, 1
+        self.send(match, 0, {"event": "joined", "name": name})
+        return {"match": match.id, "player": 1, "opponent": match.session.players[0].name,
+                "salvo": match.session.salvo}
+
+    def op_place(self, conn, match, request):
+        me = conn["player"]
+        if match.placed[me]:
+            raise ProtocolError("Ships already placed.")
+        player = match.session.players[me]
+
+        if request.get("random"):
+            player.grid, player.ship_positions = random_ship_layout(fleet, self.size, self.rng)
+            index_ships(player)
+        else:
+            place_fleet(player, request.get("ships") or [], self.size)
+
+        match.placed[me] = True
+        if match.started:
+            for i in (0, 1):
+                self.send(match, i, {"event": "start", "turn": match.session.current_player,
+                                     "salvo": match.session.salvo})
+        return {"ships": player.ship_positions}
+
+    def op_fire(self, conn, match, request):
+        me = conn["player"]
+        session = match.session
+        if not match.started:
+            raise ProtocolError("Both players must place their ships first.")
+        if session.game_over:
+            raise ProtocolError("Game is already over.")
+        if session.current_player != me:
+            raise ProtocolError("Not your turn.")
+
+        if "targets" in request:
+            return self.fire_volley(me, match, request["targets"])
+        if session.salvo:
+            raise ProtocolError("Salvo matches fire a list of targets.")
+
+        if "target" in request:
+            row, col = parse_coordinate(str(request["target"]), self.size)
+        else:
+            row, col = request["row"], request["col"]
+            if type(row) is not int or type(col) is not int:
+                raise ProtocolError("row and col must be whole numbers.")
+
+        result = fire(session, row, col)
+        self.shots += 1
+
+        outcome = result.outcome.name.lower()
+        ship = result.ship["name"] if result.ship else None
+        self.send(match, 1 - me, {"event": "incoming", "row": row, "col": col,
+                                  "result": outcome, "ship": ship})
+        if result.outcome == Outcome.WIN:
+            for i in (0, 1):
+                self.send(match, i, {"event": "game_over", "winner": session.players[me].name})
+            self.matches.pop(match.id, None)
+        return {"row": row, "col": col, "result": outcome, "ship": ship}
+
+    def fire_volley(self, me, match, targets):
+        """
+        Fires a whole volley; targets are "B7" strings or [row, col] pairs.
+        """
+        session = match.session
+        if not isinstance(targets, list):
+            raise ProtocolError("targets must be a list.")
+        cells = []
+        for target in targets:
+            if isinstance(target, str):
+                cells.append(parse_coordinate(target, self.size))
+            else:
+                row, col = target
+                if type(row) is not int or type(col) is not int:
+                    raise ProtocolError("Targets must be like \"B7\" or [row, col] whole numbers.")
+                cells.append((row, col))
+
+        volley = fire_many(session, cells)
+        self.shots += len(volley.shots)
+
+        shots = [{"row": shot.row, "col": shot.col, "result": shot.outcome.name.lower(),
+                  "ship": shot.ship["name"] if shot.ship else None} for shot in volley.shots]
+        sunk = [ship["name"] for ship in volley.sunk]
+        self.send(match, 1 - me, {"event": "volley", "shots": shots, "won": volley.won,
+                                  "shots_allowed": salvo_shots(session)})
+        if volley.won:
+            for i in (0, 1):
+                self.send(match, i, {"event": "game_over", "winner": session.players[me].name})
+            self.matches.pop(match.id, None)
+        return {"shots": shots, "hits": volley.hits, "sunk": sunk, "won": volley.won}
+
+    def send(self, match, player, message):
+        """
+        Pushes an event to one player, if they are still connected.
+        """
+        writer = match.writers[player]
+        if writer is not None and not writer.is_closing():
+            writer.write((json.dumps(message) + "\n").encode())
+
+    def leave(self, conn):
+        """
+        Drops a disconnected player's match and tells the opponent.
+        """
+        match = self.matches.pop(conn["match"], None)
+        if match is None:
+            return
+        match.writers[conn["player"]] = None
+        self.send(match, 1 - conn["player"], {"event": "left"})
+
+
+async def serve(host, port):
+    server = BattleshipServer()
+    listener = await server.start(host, port)
+    print(f"Battleship server listening on {host}:{port}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    """
+    Command line entry point: python server.py --port 8765
+    """
+    parser = argparse.ArgumentParser(description="Battleship multiplayer server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--metrics", action="store_true", help="collect metrics for the metrics op")
+    args = parser.parse_args()
+    if args.metrics:
+        metrics.enable()
+    asyncio.run(serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# simulate.py - Batch simulator. Plays computer-vs-computer games on the
+# headless engine and reports throughput.
+
+import argparse
+import random
+import time
+
+import metrics
+from state import fleet, grid_size
+from placement import random_ship_layout
+from engine import new_game, fire, grid_from_ships, Outcome
+from bitboard import BitBoard
+from sparse import SparseBoard
+from ai import RandomAI, DensityAI
+from montecarlo import MonteCarloAI, shutdown_pools
+from exact import ExactAI, map_cache
+from zobrist import load_book
+from eventlog import EventLog
+from seeds import master_seed, game_rng
+
+# Board backends selectable from the command line
+BACKENDS = {
+    "grid": grid_from_ships,
+    "bitboard": BitBoard.from_ships,
+    "sparse": SparseBoard.from_ships,
+}
+
+# Shooting strategies selectable from the command line
+SHOOTERS = {
+    "random": RandomAI,
+    "density": DensityAI,
+    "montecarlo": MonteCarloAI,
+    "exact": ExactAI,
+}
+
+# Placement strategies: (ships, size, rng) -> (grid, ship_positions)
+PLACERS = {
+    "random": random_ship_layout,
+}
+
+
+def play_game(shooters=("random", "random"), rng=random, ships=fleet, size=grid_size,
+              board_factory=grid_from_ships, placers=("random", "random"), registry=SHOOTERS,
+              log=None):
+    """
+    Plays one game where each player places its fleet with a strategy from
+    PLACERS and fires with a shooter from registry (SHOOTERS by default).
+    log, an eventlog.EventLog, records the game.
+    Returns the finished GameSession.
+    """
+    _, fleet_1 = PLACERS[placers[0]](ships, size, rng)
+    _, fleet_2 = PLACERS[placers[1]](ships, size, rng)
+    game = new_game(fleet_1, fleet_2, size, board_factory=board_factory, log=log)
+    players = [registry[name](size, ships, rng) for name in shooters]
+
+    while True:
+        player = players[game.current_player]
+        row, col = player.choose_shot()
+        result = fire(game, row, col)
+        player.observe(result)
+        if result.outcome == Outcome.WIN:
+            return game
+
+
+def replay_game(seed, game, shooters=("random", "random"), ships=fleet, size=grid_size,
+                backend="grid", log=None):
+    """
+    Plays game number `game` of a run_batch with master seed `seed` again,
+    exactly as it went in the batch. Returns the finished GameSession.
+    """
+    return play_game(shooters, game_rng(seed, game), ships, size, BACKENDS[backend], log=log)
+
+
+def run_batch(games, seed=None, ships=fleet, size=grid_size, backend="grid",
+              shooters=("random", "random"), log=None):
+    """
+    Plays a batch of games and returns a summary dict with the master seed,
+    win counts, average shots to win and games per second.
+    Each game draws from its own stream (see seeds.py), so any one of them
+    can be played again with replay_game.
+    log, an eventlog.EventLog, records every game.
+    """
+    seed = master_seed(seed)
+    wins = [0, 0]
+    winning_shots = 0
+
+    start = time.perf_counter()
+    for index in range(games):
+        game = play_game(shooters, game_rng(seed, index), ships, size, BACKENDS[backend], log=log)
+        wins[game.winner] += 1
+        winning_shots += game.players[game.winner].shots_taken
+    elapsed = time.perf_counter() - start
+
+    return {
+        "seed": seed,
+        "games": games,
+        "seconds": elapsed,
+        "games_per_second": games / elapsed if elapsed > 0 else float("inf"),
+        "wins": wins,
+        "mean_shots_to_win": winning_shots / games if games else 0.0,
+    }
+
+
+def main():
+    """
+    Command line entry point:
+    python simulate.py --games 10000 --players density random
+    python simulate.py --seed 1 --players density random --replay 4711
+    """
+    parser = argparse.ArgumentParser(description="Simulate random Battleship games.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="grid")
+    parser.add_argument("--players", nargs=2, choices=sorted(SHOOTERS), default=["random", "random"])
+    parser.add_argument("--log", default=None, help="append every game to this event log")
+    parser.add_argument("--metrics", default=None, help="write Prometheus metrics to this file")
+    parser.add_argument("--book", default=None, help="preload this opening book for the exact player")
+    parser.add_argument("--replay", type=int, default=None, metavar="GAME",
+                        help="play only game GAME of the --seed run again")
+    args = parser.parse_args()
+
+    if args.metrics:
+        metrics.enable()
+
+    if args.book:
+        map_cache.load_book(load_book(args.book)[1])
+
+    if args.replay is not None:
+        if args.seed is None:
+            parser.error("--replay needs the --seed of the run")
+        game = replay_game(args.seed, args.replay, args.players, backend=args.backend)
+        shutdown_pools()
+        winner = game.players[game.winner]
+        print(f"Game {args.replay} of seed {args.seed}: {winner.name} wins in {winner.shots_taken} shots")
+        return
+
+    log = EventLog(args.log) if args.log else None
+    stats = run_batch(args.games, args.seed, backend=args.backend, shooters=args.players, log=log)
+    shutdown_pools()
+    if log is not None:
+        log.close()
+    if args.metrics:
+        with open(args.metrics, "w") as f:
+            f.write(metrics.prometheus_text())
+    print(f"Played {stats['games']} games in {stats['seconds']:.2f}s "
+          f"({stats['games_per_second']:.0f} games/s), seed {stats['seed']}")
+    print(f"Wins: Player 1 {stats['wins'][0]}, Player 2 {stats['wins'][1]}")
+    print(f"Mean shots to win: {stats['mean_shots_to_win']:.1f}")
+    if "exact" in args.players:
+        cache = map_cache.stats()
+        print(f"Map cache: {cache['hits']} hits, {cache['misses']} misses ({cache['hit_rate'] * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
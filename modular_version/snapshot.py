@@ -0,0 +1,406 @@
+# snapshot.py - Versioned binary save format for games. Two bits per cell,
+# compact ship tables and counters, plus a container file that holds any
+# number of snapshots and is read through mmap, by game id, without parsing
+# the whole file.
+#
+# Snapshot, little-endian:
+#   header   magic "BS", version, flags, grid size (u16)
+#            (version 2 added the salvo and sparse flags; version 1
+#            snapshots still load)
+#   player   x2: name (u8 length + UTF-8), hits, misses, shots_taken (u32),
+#            ships_sunk, ship count (u16), then per ship: name, first row,
+#            first col, length (u16) and direction (u8), then the grid at
+#            2 bits per cell, row by row, padded to a whole byte.
+#            Sparse boards store their shot cells instead: a count (u32),
+#            then row * size + col (u32) per shot; ship cells come from
+#            the ship table, so the board area is never scanned
+#
+# Container:
+#   header   magic "BSGC", version, count, index offset
+#   data     snapshots back to back
+#   index    (game id, offset, length) entries sorted by game id
+
+import mmap
+import struct
+from array import array
+from functools import lru_cache
+
+from state import Cell, PlayerBoard, GameSession, shot_cells
+from sparse import SparseBoard
+from engine import index_ships
+from zobrist import view_hash
+
+MAGIC = b"BS"
+VERSION = 2
+
+HEADER = struct.Struct("<2sBBH")         # magic, version, flags, grid size
+PLAYER = struct.Struct("<IIIHH")         # hits, misses, shots_taken, ships_sunk, ships
+SHIP = struct.Struct("<HHHB")            # first row, first col, length, direction
+NAME = struct.Struct("<B")
+COUNT = struct.Struct("<I")
+
+FLAG_PLAYER_2_TO_MOVE = 1
+FLAG_GAME_OVER = 2
+FLAG_PLAYER_2_WON = 4
+FLAG_SALVO = 8
+FLAG_SPARSE = 16
+
+# Flag bits each readable version defines; any other bit is refused
+KNOWN_FLAGS = {1: FLAG_PLAYER_2_TO_MOVE | FLAG_GAME_OVER | FLAG_PLAYER_2_WON}
+KNOWN_FLAGS[2] = KNOWN_FLAGS[1] | FLAG_SALVO | FLAG_SPARSE
+
+# (row step, col step) for each direction code
+DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+CODE_CELLS = (Cell.EMPTY, Cell.SHIP, Cell.MISS, Cell.HIT)
+# Keyed by id(): Enum members are singletons, and hashing them runs
+# Python-level code, which made this lookup most of the cost of dumps()
+CELL_CODES = {id(cell): code for code, cell in enumerate(CODE_CELLS)}
+# byte -> the four cells packed into it, lowest bits first
+UNPACKED = [tuple(CODE_CELLS[(byte >> shift) & 3] for shift in (0, 2, 4, 6))
+            for byte in range(256)]
+
+CONTAINER_MAGIC = b"BSGC"
+CONTAINER_VERSION = 1
+# The layout is unchanged since version 1; a few files were written as 2
+CONTAINER_VERSIONS = (1, 2)
+CONTAINER_HEADER = struct.Struct("<4sHHQQ")   # magic, version, unused, count, index offset
+ENTRY = struct.Struct("<QQI")                 # game id, offset, length
+
+
+class SnapshotError(ValueError):
+    """
+    Raised for data that is not a snapshot this version can read.
+    """
+
+
+def _pack_name(name):
+    # Cut at 255 bytes without splitting a multi-byte character
+    data = name.encode()[:255].decode(errors="ignore").encode()
+    return NAME.pack(len(data)) + data
+
+
+def _unpack_name(data, offset):
+    (length,) = NAME.unpack_from(data, offset)
+    offset += NAME.size
+    return bytes(data[offset:offset + length]).decode(), offset + length
+
+
+@lru_cache(maxsize=None)
+def _pack_masks(length):
+    """
+    Masks for pack_grid: the low 4 bits of every 16-bit group and the low
+    8 bits of every 32-bit group of a `length`-byte integer.
+    """
+    return (int.from_bytes(b"\x0f\x00" * (length // 2), "little"),
+            int.from_bytes(b"\xff\x00\x00\x00" * (length // 4), "little"))
+
+
+def pack_grid(grid):
+    """
+    Packs a grid at 2 bits per cell, four cells per byte.
+    One code per byte is squeezed together with two shift-and-mask steps
+    on a big integer instead of a Python loop over the bytes.
+    """
+    codes = bytes([CELL_CODES[id(cell)] for row in grid for cell in row])
+    codes += bytes(-len(codes) % 4)
+    pairs, quads = _pack_masks(len(codes))
+    x = int.from_bytes(codes, "little")
+    x = (x | x >> 6) & pairs
+    x = (x | x >> 12) & quads
+    return x.to_bytes(len(codes), "little")[::4]
+
+
+def pack_shots(grid, size):
+    """
+    Packs the shot cells of a board as a count and their cell indexes.
+    """
+    cells = [r * size + c for r, c, _ in shot_cells(grid)]
+    return COUNT.pack(len(cells)) + struct.pack(f"<{len(cells)}I", *cells)
+
+
+def unpack_shots(data, offset, ship_positions, size):
+    """
+    Inverse of pack_shots: a SparseBoard with the ships and shots.
+    Returns (board, offset after the shots).
+    """
+    (count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    cells = struct.unpack_from(f"<{count}I", data, offset)
+    board = SparseBoard.from_ships(ship_positions, size)
+    for cell in cells:
+        if cell >= size * size:
+            raise SnapshotError("Shot outside the board.")
+        try:
+            board.shoot(*divmod(cell, size))
+        except ValueError:
+            raise SnapshotError("Same cell shot twice.") from None
+    return board, offset + 4 * count
+
+
+def unpack_grid(data, size):
+    """
+    Inverse of pack_grid; returns a list-of-lists grid.
+    """
+    cells = [cell for byte in data for cell in UNPACKED[byte]]
+    return [cells[r * size:(r + 1) * size] for r in range(size)]
+
+
+def ship_span(ship):
+    """
+    (first row, first col, length, direction code) for a ship dict.
+    Raises SnapshotError unless its cells form a straight, contiguous run.
+    """
+    coords = ship["coords"]
+    (row, col), length = coords[0], len(coords)
+    step = (coords[1][0] - row, coords[1][1] - col) if length > 1 else (0, 1)
+    if step not in DIRECTIONS or \
+            any(tuple(coords[i]) != (row + step[0] * i, col + step[1] * i) for i in range(length)):
+        raise SnapshotError(f"{ship['name']} is not a straight, contiguous ship.")
+    return row, col, length, DIRECTIONS.index(step)
+
+
+def ship_coords(row, col, length, direction):
+    """
+    Inverse of ship_span: the ship's cells in order.
+    """
+    dr, dc = DIRECTIONS[direction]
+    return [(row + dr * i, col + dc * i) for i in range(length)]
+
+
+def check_ships(ship_positions, size):
+    """
+    Raises SnapshotError if a loaded ship leaves the board or two ships
+    share a cell.
+    """
+    taken = set()
+    for ship in ship_positions:
+        for r, c in ship["coords"]:
+            if not (0 <= r < size and 0 <= c < size):
+                raise SnapshotError(f"{ship['name']} is off the board.")
+            if (r, c) in taken:
+                raise SnapshotError(f"{ship['name']} overlaps another ship.")
+            taken.add((r, c))
+
+
+def _pack_ship(ship):
+    return _pack_name(ship["name"]) + SHIP.pack(*ship_span(ship))
+
+
+def dumps(session):
+    """
+    Serialises a GameSession to bytes.
+    Works with any board backend; ship health and the cell lookups are
+    rebuilt from the grid on load, so they are not stored. SparseBoard
+    sessions store their shot cells instead of the grid and load as
+    SparseBoards.
+    """
+    flags = FLAG_PLAYER_2_TO_MOVE if session.current_player else 0
+    if session.winner is not None:
+        flags |= FLAG_GAME_OVER | (FLAG_PLAYER_2_WON if session.winner else 0)
+    if session.salvo:
+        flags |= FLAG_SALVO
+    sparse = isinstance(session.players[0].grid, SparseBoard)
+    if sparse:
+        flags |= FLAG_SPARSE
+
+    parts = [HEADER.pack(MAGIC, VERSION, flags, session.grid_size)]
+    for player in session.players:
+        parts.append(_pack_name(player.name))
+        parts.append(PLAYER.pack(player.hits, player.misses, player.shots_taken,
+                                 player.ships_sunk, len(player.ship_positions)))
+        parts.extend(_pack_ship(ship) for ship in player.ship_positions)
+        parts.append(pack_shots(player.grid, session.grid_size) if sparse else pack_grid(player.grid))
+    return b"".join(parts)
+
+
+def loads(data, offset=0):
+    """
+    Rebuilds a GameSession from dumps() output starting at offset, so a
+    snapshot can be read straight out of an mmap without copying it first.
+    Raises SnapshotError for anything it cannot read.
+    """
+    try:
+        magic, version, flags, size = HEADER.unpack_from(data, offset)
+        if magic != MAGIC:
+            raise SnapshotError("Not a Battleship snapshot.")
+        if version not in KNOWN_FLAGS:
+            raise SnapshotError(f"Unsupported snapshot version {version}.")
+        if flags & ~KNOWN_FLAGS[version]:
+            raise SnapshotError(f"Unknown snapshot flags {flags:#x}.")
+        offset += HEADER.size
+        grid_bytes = (size * size + 3) // 4
+
+        players = []
+        for _ in range(2):
+            name, offset = _unpack_name(data, offset)
+            hits, misses, shots_taken, ships_sunk, ship_count = PLAYER.unpack_from(data, offset)
+            offset += PLAYER.size
+
+            ship_positions = []
+            for _ in range(ship_count):
+                ship_name, offset = _unpack_name(data, offset)
+                row, col, length, direction = SHIP.unpack_from(data, offset)
+                offset += SHIP.size
+                ship_positions.append({"name": ship_name,
+                                       "coords": ship_coords(row, col, length, direction)})
+            check_ships(ship_positions, size)
+
+            if flags & FLAG_SPARSE:
+                grid, offset = unpack_shots(data, offset, ship_positions, size)
+            else:
+                grid_data = data[offset:offset + grid_bytes]
+                if len(grid_data) != grid_bytes:
+                    raise SnapshotError("Snapshot is truncated.")
+                offset += grid_bytes
+                grid = unpack_grid(grid_data, size)
+
+            player = PlayerBoard(name, grid, ship_positions, size)
+            player.hits, player.misses, player.shots_taken = hits, misses, shots_taken
+            player.ships_sunk = ships_sunk
+            index_ships(player)
+            player.view_hash = view_hash(player)
+            players.append(player)
+    except (struct.error, IndexError, UnicodeDecodeError) as error:
+        raise SnapshotError(f"Corrupt snapshot: {error}") from error
+
+    session = GameSession(size=size, players=players)
+    session.current_player = 1 if flags & FLAG_PLAYER_2_TO_MOVE else 0
+    if flags & FLAG_GAME_OVER:
+        session.winner = 1 if flags & FLAG_PLAYER_2_WON else 0
+    session.salvo = bool(flags & FLAG_SALVO)
+    return session
+
+
+class SnapshotWriter:
+    """
+    Writes a container file. Snapshots are appended as they are added;
+    the sorted index and the header are written by close().
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "wb")
+        self.file.write(bytes(CONTAINER_HEADER.size))
+        self.offset = CONTAINER_HEADER.size
+        self.ids = array("Q")
+        self.offsets = array("Q")
+        self.lengths = array("I")
+
+    def add(self, game_id, session):
+        self.add_bytes(game_id, dumps(session))
+
+    def add_bytes(self, game_id, data):
+        self.file.write(data)
+        self.ids.append(game_id)
+        self.offsets.append(self.offset)
+        self.lengths.append(len(data))
+        self.offset += len(data)
+
+    def close(self):
+        """
+        Writes the index and the header.
+        Raises SnapshotError if a game id was added twice.
+        """
+        if self.file.closed:
+            return
+        ids = self.ids
+        order = sorted(range(len(ids)), key=ids.__getitem__)
+        index = bytearray(ENTRY.size * len(order))
+        previous = None
+        for i, j in enumerate(order):
+            if ids[j] == previous:
+                self.file.close()
+                raise SnapshotError(f"Duplicate game id {previous}.")
+            previous = ids[j]
+            ENTRY.pack_into(index, i * ENTRY.size, ids[j], self.offsets[j], self.lengths[j])
+
+        self.file.write(index)
+        self.file.seek(0)
+        self.file.write(CONTAINER_HEADER.pack(CONTAINER_MAGIC, CONTAINER_VERSION, 0,
+                                              len(order), self.offset))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SnapshotArchive:
+    """
+    Read-only view of a container file through mmap.
+    Lookups binary-search the on-disk index, so opening the file and
+    fetching a game cost the same however many games it holds.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            try:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as error:    # an empty file cannot be mapped
+                raise SnapshotError("Not a snapshot container.") from error
+        try:
+            magic, version, _, self.count, self.index_offset = CONTAINER_HEADER.unpack_from(self.map)
+        except struct.error as error:
+            self.map.close()
+            raise SnapshotError("Not a snapshot container.") from error
+        if magic != CONTAINER_MAGIC or version not in CONTAINER_VERSIONS:
+            self.map.close()
+            raise SnapshotError("Not a snapshot container this version can read.")
+
+    def __len__(self):
+        return self.count
+
+    def _entry(self, i):
+        return ENTRY.unpack_from(self.map, self.index_offset + i * ENTRY.size)
+
+    def _find(self, game_id):
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            entry = self._entry(mid)
+            if entry[0] < game_id:
+                low = mid + 1
+            elif entry[0] > game_id:
+                high = mid
+            else:
+                return entry
+        return None
+
+    def __contains__(self, game_id):
+        return self._find(game_id) is not None
+
+    def ids(self):
+        """
+        Game ids in ascending order.
+        """
+        return (self._entry(i)[0] for i in range(self.count))
+
+    def read(self, game_id):
+        """
+        Raw snapshot bytes for a game. Raises KeyError if it is missing.
+        """
+        entry = self._find(game_id)
+        if entry is None:
+            raise KeyError(game_id)
+        _, offset, length = entry
+        return self.map[offset:offset + length]
+
+    def load(self, game_id):
+        """
+        The GameSession for a game. Raises KeyError if it is missing.
+        """
+        entry = self._find(game_id)
+        if entry is None:
+            raise KeyError(game_id)
+        return loads(self.map, entry[1])
+
+    def close(self):
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,173 @@
+# sparse.py - Board backend for very large grids. Stores only ship cells and
+# shot cells in dicts, so memory follows the fleet and the shots fired rather
+# than the board area. Drop-in for the list-of-lists grid.
+
+import random
+
+from state import Cell
+from placement import place_ship, NoLegalPlacement
+
+
+class _SparseRow:
+    """
+    One row of a SparseBoard, so that board[row][col] reads and writes
+    work exactly like the list-of-lists grid.
+    """
+    __slots__ = ("board", "row")
+
+    def __init__(self, board, row):
+        self.board = board
+        self.row = row
+
+    def __len__(self):
+        return self.board.size
+
+    def __getitem__(self, col):
+        if not (0 <= col < self.board.size):
+            raise IndexError("column out of range")
+        return self.board.cells.get((self.row, col), Cell.EMPTY)
+
+    def __setitem__(self, col, value):
+        self.board.set_cell(self.row, col, value)
+
+    def __iter__(self):
+        cells = self.board.cells
+        row = self.row
+        return (cells.get((row, c), Cell.EMPTY) for c in range(self.board.size))
+
+
+class SparseBoard:
+    """
+    cells maps (row, col) to SHIP, HIT or MISS; anything missing is EMPTY.
+    ship_at and health give the same O(1) hit and sunk checks as the
+    other backends.
+    """
+    __slots__ = ("size", "cells", "ship_at", "health", "ships", "afloat")
+
+    def __init__(self, size):
+        self.size = size
+        self.cells = {}
+        self.ship_at = {}              # (row, col) -> ship index
+        self.health = []               # cells not yet hit, per ship
+        self.ships = []                # the {"name", "coords"} dicts
+        self.afloat = 0                # ships with health left
+
+    @classmethod
+    def from_ships(cls, ship_positions, size):
+        """
+        Builds an untouched board from a list of {"name", "coords"} ships.
+        Same signature as engine.grid_from_ships.
+        """
+        board = cls(size)
+        for ship in ship_positions:
+            board.add_ship(ship)
+        return board
+
+    def add_ship(self, ship):
+        """
+        Adds a {"name", "coords"} ship to the board.
+        """
+        index = len(self.ships)
+        for coord in ship["coords"]:
+            self.cells[coord] = Cell.SHIP
+            self.ship_at[coord] = index
+        self.ships.append(ship)
+        self.health.append(len(ship["coords"]))
+        self.afloat += 1
+
+    # --- list-of-lists grid API ---
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, row):
+        if not (0 <= row < self.size):
+            raise IndexError("row out of range")
+        return _SparseRow(self, row)
+
+    def __iter__(self):
+        return (_SparseRow(self, r) for r in range(self.size))
+
+    def set_cell(self, row, col, value):
+        """
+        Stores a Cell value; EMPTY removes the entry.
+        """
+        if value == Cell.EMPTY:
+            self.cells.pop((row, col), None)
+        else:
+            self.cells[(row, col)] = value
+
+    # --- fast paths, same contract as BitBoard ---
+
+    def already_shot(self, row, col):
+        return self.cells.get((row, col)) in (Cell.HIT, Cell.MISS)
+
+    def shoot(self, row, col):
+        """
+        Marks a shot at (row, col).
+        Returns (hit, sunk_ship) where sunk_ship is the ship dict
+        if this shot finished it off, otherwise None.
+        Raises ValueError if the cell was already shot.
+        """
+        coord = (row, col)
+        cell = self.cells.get(coord)
+        if cell in (Cell.HIT, Cell.MISS):
+            raise ValueError("Cell already shot.")
+
+        if cell != Cell.SHIP:
+            self.cells[coord] = Cell.MISS
+            return False, None
+
+        self.cells[coord] = Cell.HIT
+        i = self.ship_at.get(coord)
+        if i is None:
+            return True, None
+        self.health[i] -= 1
+        if self.health[i]:
+            return True, None
+        self.afloat -= 1
+        return True, self.ships[i]
+
+    def shots(self):
+        """
+        (row, col, cell) for every shot cell.
+        """
+        hit, miss = Cell.HIT, Cell.MISS
+        return [(row, col, cell) for (row, col), cell in self.cells.items()
+                if cell is hit or cell is miss]
+
+    def is_sunk(self, index):
+        return self.health[index] == 0
+
+    def all_sunk(self):
+        return self.afloat == 0
+
+
+def random_sparse_fleet(ships, size, rng=random, max_attempts=1000):
+    """
+    Random layout for a huge, mostly empty board.
+    Enumerating every legal placement would cost O(size^2), so this draws
+    random positions and retries on overlap, which almost never happens
+    when the fleet covers a tiny fraction of the board.
+    Returns the ship_positions list.
+    Raises NoLegalPlacement after max_attempts failed draws for one ship.
+    """
+    board = SparseBoard(size)
+    ship_positions = []
+
+    for ship_name, ship_len in ships:
+        for _ in range(max_attempts):
+            row = rng.randrange(size)
+            col = rng.randrange(size)
+            if rng.random() < 0.5:
+                ok = place_ship(board, ship_positions, row, row, col, col + ship_len - 1)
+            else:
+                ok = place_ship(board, ship_positions, row, row + ship_len - 1, col, col)
+            if ok:
+                ship_positions[-1] = {"name": ship_name, "coords": ship_positions[-1]}
+                break
+        else:
+            raise NoLegalPlacement(f"Could not place {ship_name} (length {ship_len}) "
+                                   f"in {max_attempts} attempts.")
+
+    return ship_positions
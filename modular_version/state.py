@@ -1,8 +1,8 @@
-# state.py - Shared game state + enumerations
+# state.py - Shared constants, enumerations and per-game session objects
 
 from enum import Enum
 
-# Global variables
+# Game rules
 grid_size = 10
 fleet = [
     ("Carrier", 5),
@@ -20,17 +20,81 @@ class Cell(Enum):
     MISS = -1        # water shot
     HIT = 2          # ship shot
 
-# Per-player state
-player_grids = [None, None]            
-player_ship_positions = [None, None]
-ships_sunk = [0, 0]                    # ships sunk per player
-player_names = ["Player 1", "Player 2"]
-current_player = 0
-game_over = False
-player_hits = [0, 0]
-player_misses = [0, 0]
-shots_taken = [0, 0]
-
-# Temporary holders while placing ships
-placing_grid = None
-placing_ship_positions = None
+
+def scaled_fleet(scale):
+    """
+    The standard fleet repeated `scale` times, e.g. Carrier 1..4 for scale 4.
+    """
+    if scale == 1:
+        return list(fleet)
+    return [(f"{name} {i + 1}", ship_len) for i in range(scale) for name, ship_len in fleet]
+
+
+def empty_grid(size=grid_size):
+    """
+    Returns a size x size grid with every cell EMPTY.
+    """
+    return [[Cell.EMPTY for _ in range(size)] for _ in range(size)]
+
+
+def shot_cells(grid):
+    """
+    (row, col, cell) for every HIT or MISS cell of a list-of-lists grid or
+    a board backend. Backends list their shots; a grid is scanned.
+    """
+    if not isinstance(grid, list):
+        return grid.shots()
+    hit, miss = Cell.HIT, Cell.MISS
+    return [(r, c, cell) for r, row in enumerate(grid) for c, cell in enumerate(row)
+            if cell is hit or cell is miss]
+
+
+class PlayerBoard:
+    """
+    One player's side of a game: their own grid and fleet,
+    plus the stats for the shots they have fired.
+    """
+    __slots__ = ("name", "grid", "ship_positions", "ship_at", "ship_health",
+                 "ships_sunk", "hits", "misses", "shots_taken", "view_hash")
+
+    def __init__(self, name, grid=None, ship_positions=None, size=grid_size):
+        self.name = name
+        self.grid = grid if grid is not None else empty_grid(size)
+        self.ship_positions = ship_positions if ship_positions is not None else []
+        self.ship_at = {}              # (row, col) -> index into ship_positions
+        self.ship_health = []          # cells not yet hit, per ship
+        self.ships_sunk = 0            # enemy ships sunk by this player
+        self.hits = 0
+        self.misses = 0
+        self.shots_taken = 0
+        self.view_hash = 0             # zobrist hash of what the opponent has seen of this board
+
+
+class GameSession:
+    """
+    Everything one game needs. Replaces the old module-level globals,
+    so a single process can hold any number of independent games.
+    """
+    __slots__ = ("players", "current_player", "winner", "grid_size", "log", "salvo")
+
+    def __init__(self, names=("Player 1", "Player 2"), size=grid_size, players=None):
+        if players is None:
+            players = (PlayerBoard(names[0], size=size), PlayerBoard(names[1], size=size))
+        self.players = tuple(players)
+        self.current_player = 0
+        self.winner = None
+        self.grid_size = size
+        self.log = None                # eventlog.EventLog recording the game, if any
+        self.salvo = False             # salvo rules: one shot per surviving ship each turn
+
+    @property
+    def game_over(self):
+        return self.winner is not None
+
+    @property
+    def attacker(self):
+        return self.players[self.current_player]
+
+    @property
+    def defender(self):
+        return self.players[1 - self.current_player]
@@ -0,0 +1,239 @@
+# tournament.py - Round-robin bot tournament across all cores.
+# Results stream to a JSON-lines file as games finish, so a run can be
+# resumed, and the report gives Elo, win rates and shots-to-win.
+# Ratings are fitted to all games at once (Bradley-Terry), so they do not
+# depend on the order games were played or read in.
+
+import argparse
+import itertools
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+
+from simulate import play_game, SHOOTERS, PLACERS
+from montecarlo import MonteCarloAI
+from seeds import game_rng
+
+# Tournament workers already use every core, so the Monte Carlo planner
+# samples in-process instead of starting a pool of its own
+TOURNAMENT_SHOOTERS = dict(SHOOTERS, montecarlo=partial(MonteCarloAI, workers=1, samples=500))
+
+ELO_START = 1500
+# Bradley-Terry fit: iteration limit and the change in strength that ends it
+FIT_ROUNDS = 1000
+FIT_TOLERANCE = 1e-9
+Z_95 = 1.96
+
+
+def parse_strategy(name):
+    """
+    Splits "shooter" or "shooter/placer" into (shooter, placer).
+    """
+    shooter, _, placer = name.partition("/")
+    placer = placer or "random"
+    if shooter not in TOURNAMENT_SHOOTERS or placer not in PLACERS:
+        raise ValueError(f"Unknown strategy: {name}")
+    return shooter, placer
+
+
+def play_block(seed, a, b, games):
+    """
+    Plays a block of games between strategies a and b inside a worker.
+    Even games are started by a, odd games by b. Each game has its own
+    stream from (seed, game, a, b), whichever worker and block plays it.
+    Returns one result dict per game.
+    """
+    results = []
+    for game in games:
+        first, second = (a, b) if game % 2 == 0 else (b, a)
+        shooter_1, placer_1 = parse_strategy(first)
+        shooter_2, placer_2 = parse_strategy(second)
+
+        session = play_game((shooter_1, shooter_2), game_rng(seed, game, a, b),
+                            placers=(placer_1, placer_2), registry=TOURNAMENT_SHOOTERS)
+        winner = (first, second)[session.winner]
+        results.append({
+            "seed": seed,
+            "a": a,
+            "b": b,
+            "game": game,
+            "winner": winner,
+            "shots": session.players[session.winner].shots_taken,
+        })
+    return results
+
+
+def load_results(path):
+    """
+    Streams result dicts from a results file, skipping a torn last line.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def run_tournament(strategies, games, path, seed=0, workers=None, block=200):
+    """
+    Plays `games` games for every pair of strategies, skipping games of this
+    seed already in the results file, and appends each finished block to it.
+    Returns the number of games played by this call.
+    """
+    for name in strategies:
+        parse_strategy(name)
+
+    done = {(r["a"], r["b"], r["game"]) for r in load_results(path) if r.get("seed") == seed}
+    tasks = []
+    for a, b in itertools.combinations(strategies, 2):
+        todo = [g for g in range(games) if (a, b, g) not in done]
+        for start in range(0, len(todo), block):
+            tasks.append((a, b, todo[start:start + block]))
+
+    # Terminate a line torn by an interrupted run before appending
+    if os.path.exists(path) and os.path.getsize(path):
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            torn = f.read(1) != b"\n"
+        if torn:
+            with open(path, "a") as out:
+                out.write("\n")
+
+    played = 0
+    with open(path, "a") as out, ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_block, seed, a, b, g) for a, b, g in tasks]
+        for future in as_completed(futures):
+            results = future.result()
+            out.write("".join(json.dumps(r) + "\n" for r in results))
+            out.flush()
+            played += len(results)
+    return played
+
+
+def wilson_interval(wins, n):
+    """
+    95% Wilson score interval for a win rate.
+    """
+    if n == 0:
+        return 0.0, 1.0
+    p = wins / n
+    denom = 1 + Z_95 ** 2 / n
+    centre = (p + Z_95 ** 2 / (2 * n)) / denom
+    half = Z_95 * math.sqrt(p * (1 - p) / n + Z_95 ** 2 / (4 * n * n)) / denom
+    return centre - half, centre + half
+
+
+def fit_elo(wins, games):
+    """
+    Bradley-Terry ratings on the Elo scale, averaging ELO_START.
+    wins[name] counts games won; games[(a, b)] counts games between a and b.
+    Each strategy also gets one virtual win and one virtual loss against an
+    average opponent, so an unbeaten or winless one still gets a finite rating.
+    """
+    names = sorted(wins)
+    opponents = {name: [] for name in names}
+    for (a, b), n in games.items():
+        opponents[a].append((b, n))
+        opponents[b].append((a, n))
+
+    strength = dict.fromkeys(names, 1.0)
+    for _ in range(FIT_ROUNDS):
+        new = {}
+        for name in names:
+            p = strength[name]
+            denom = 2 / (p + 1) + sum(n / (p + strength[other]) for other, n in opponents[name])
+            new[name] = (wins[name] + 1) / denom
+        scale = math.exp(sum(math.log(p) for p in new.values()) / len(names))
+        new = {name: p / scale for name, p in new.items()}
+        change = max(abs(new[name] - strength[name]) for name in names)
+        strength = new
+        if change < FIT_TOLERANCE:
+            break
+    return {name: ELO_START + 400 * math.log10(p) for name, p in strength.items()}
+
+
+def summarize(path, seed=None):
+    """
+    Builds the report from a results file, from the games of one seed if
+    given. Ratings are fitted to every game at once (see fit_elo).
+    Returns {strategy: {"elo", "games", "wins", "win_rate", "win_ci",
+    "mean_shots_to_win", "shots_ci"}}.
+    """
+    stats = {}
+    pairs = {}
+    for r in load_results(path):
+        if seed is not None and r.get("seed") != seed:
+            continue
+        for name in (r["a"], r["b"]):
+            if name not in stats:
+                stats[name] = {"games": 0, "wins": 0, "shots": 0, "shots_sq": 0}
+
+        stats[r["a"]]["games"] += 1
+        stats[r["b"]]["games"] += 1
+        winner = stats[r["winner"]]
+        winner["wins"] += 1
+        winner["shots"] += r["shots"]
+        winner["shots_sq"] += r["shots"] * r["shots"]
+        pair = (r["a"], r["b"])
+        pairs[pair] = pairs.get(pair, 0) + 1
+
+    elo = fit_elo({name: s["wins"] for name, s in stats.items()}, pairs) if stats else {}
+    report = {}
+    for name, s in stats.items():
+        wins = s["wins"]
+        mean = s["shots"] / wins if wins else 0.0
+        spread = 0.0
+        if wins > 1:
+            variance = (s["shots_sq"] - wins * mean * mean) / (wins - 1)
+            spread = Z_95 * math.sqrt(max(variance, 0.0) / wins)
+        report[name] = {
+            "elo": round(elo[name], 1),
+            "games": s["games"],
+            "wins": wins,
+            "win_rate": wins / s["games"] if s["games"] else 0.0,
+            "win_ci": wilson_interval(wins, s["games"]),
+            "mean_shots_to_win": mean,
+            "shots_ci": (mean - spread, mean + spread),
+        }
+    return report
+
+
+def print_report(report):
+    """
+    Prints the standings, best Elo first.
+    """
+    print(f"{'Strategy':<20} {'Elo':>7} {'Games':>8} {'Win %':>7} {'95% CI':>15} {'Shots':>6} {'95% CI':>13}")
+    for name, s in sorted(report.items(), key=lambda item: -item[1]["elo"]):
+        low, high = s["win_ci"]
+        shots_low, shots_high = s["shots_ci"]
+        print(f"{name:<20} {s['elo']:>7.1f} {s['games']:>8} {s['win_rate'] * 100:>6.1f}% "
+              f"{low * 100:>6.1f}-{high * 100:>5.1f}% {s['mean_shots_to_win']:>6.1f} "
+              f"{shots_low:>6.1f}-{shots_high:>5.1f}")
+
+
+def main():
+    """
+    Command line entry point:
+    python tournament.py random density montecarlo --games 1000 --out results.jsonl
+    Run the same command again to resume an interrupted tournament.
+    """
+    parser = argparse.ArgumentParser(description="Round-robin Battleship bot tournament.")
+    parser.add_argument("strategies", nargs="+", help="shooter or shooter/placer, e.g. density/random")
+    parser.add_argument("--games", type=int, default=1000, help="games per pair")
+    parser.add_argument("--out", default="tournament.jsonl")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    played = run_tournament(args.strategies, args.games, args.out, args.seed, args.workers)
+    print(f"Played {played} new games, results in {args.out}\n")
+    print_report(summarize(args.out, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+# zobrist.py - Zobrist hashing of the attacker's view of a board: which
+# ships are still afloat, and which cells were missed, hit or belong to a
+# sunk ship. Each shot XORs one or two 64-bit keys into the hash, so it is
+# kept up to date as cells turn HIT or MISS. A bounded LRU cache maps those
+# hashes to shot-probability maps, and an opening book of maps can be saved
+# to disk and preloaded.
+#
+# Keys come from fixed seeds, so a hash means the same view in every
+# process and a saved book stays valid.
+#
+# Ship keys depend on each ship's name and length, so fleets that differ in
+# either never share a hash.
+#
+# Book file: header (magic "BSOB", version, grid size, entry count, fleet
+# key), then per entry: hash u64, layouts u64, then one u64 count per cell
+
+import random
+import struct
+from collections import OrderedDict
+from functools import lru_cache
+
+from state import Cell, fleet, shot_cells
+
+MISS = 0
+HIT = 1
+SUNK = 2
+
+MAGIC = b"BSOB"
+VERSION = 2
+# Larger boards (sparse ones) derive each cell's keys on demand instead of
+# holding a table of size * size keys
+TABLE_MAX_SIZE = 64
+MASK64 = (1 << 64) - 1
+
+HEADER = struct.Struct("<4sHHIQ")         # magic, version, grid size, entries, fleet key
+ENTRY = struct.Struct("<QQ")              # hash, layouts (samples) behind the map
+
+
+class BookError(ValueError):
+    """
+    Raised for a file that is not an opening book this version can read.
+    """
+
+
+def _mix(x):
+    # splitmix64 finalizer
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9 & MASK64
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EB & MASK64
+    return x ^ (x >> 31)
+
+
+class _DerivedKeys:
+    """
+    cell_keys for boards too large for a table.
+    """
+    __slots__ = ("seed",)
+
+    def __init__(self, size):
+        self.seed = random.Random(f"zobrist/{size}").getrandbits(64)
+
+    def __getitem__(self, cell):
+        base = self.seed + 3 * cell
+        return _mix(base & MASK64), _mix((base + 1) & MASK64), _mix((base + 2) & MASK64)
+
+
+@lru_cache(maxsize=None)
+def cell_keys(size):
+    """
+    (miss, hit, sunk) keys for every cell of a size x size board,
+    indexed by row * size + col.
+    """
+    if size > TABLE_MAX_SIZE:
+        return _DerivedKeys(size)
+    rng = random.Random(f"zobrist/{size}")
+    return tuple((rng.getrandbits(64), rng.getrandbits(64), rng.getrandbits(64))
+                 for _ in range(size * size))
+
+
+@lru_cache(maxsize=None)
+def ship_key(name, ship_len, size):
+    return random.Random(f"zobrist/{size}/ship/{name}/{ship_len}").getrandbits(64)
+
+
+def fleet_key(ships, size):
+    """
+    Hash of an untouched size x size board holding these (name, length) ships.
+    Also identifies the fleet in opening books.
+    """
+    value = 0
+    for name, ship_len in ships:
+        value ^= ship_key(name, ship_len, size)
+    return value
+
+
+def sink_ship(value, size, ship):
+    """
+    The hash once a {"name", "coords"} ship is sunk: its cells turn from
+    hit to sunk and it leaves the fleet.
+    """
+    keys = cell_keys(size)
+    for r, c in ship["coords"]:
+        cell = keys[r * size + c]
+        value ^= cell[HIT] ^ cell[SUNK]
+    return value ^ ship_key(ship["name"], len(ship["coords"]), size)
+
+
+def record_shot(value, size, row, col, hit, ship=None):
+    """
+    The hash after a shot at (row, col); ship is the ship it sank, if any.
+    """
+    value ^= cell_keys(size)[row * size + col][HIT if hit else MISS]
+    if ship is not None:
+        value = sink_ship(value, size, ship)
+    return value
+
+
+def view_hash(board):
+    """
+    Hash of what the opponent has seen of a PlayerBoard, worked out from
+    scratch from its shot cells, e.g. for a board restored from disk.
+    Matches the hash record_shot keeps up to date.
+    """
+    size = len(board.grid)
+    value = fleet_key(((ship["name"], len(ship["coords"])) for ship in board.ship_positions), size)
+    keys = cell_keys(size)
+    for r, c, cell in shot_cells(board.grid):
+        value ^= keys[r * size + c][HIT if cell is Cell.HIT else MISS]
+    for ship, health in zip(board.ship_positions, board.ship_health):
+        if health == 0:
+            value = sink_ship(value, size, ship)
+    return value
+
+
+class ViewHash:
+    """
+    The same hash kept by a computer player from the results it observes.
+    """
+    __slots__ = ("size", "value")
+
+    def __init__(self, size, ships):
+        self.size = size
+        self.value = fleet_key(ships, size)
+
+    def shot(self, row, col, hit, ship=None):
+        self.value = record_shot(self.value, self.size, row, col, hit, ship)
+
+
+class ProbabilityCache:
+    """
+    Bounded LRU cache from view hash to a shot-probability map, stored as
+    (counts per cell, layouts or samples behind them). Counts hits and
+    misses. Opening book entries are kept apart and never evicted.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.book = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries) + len(self.book)
+
+    def get(self, key):
+        value = self.book.get(key)
+        if value is None:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if key in self.book:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def lookup(self, key, compute):
+        """
+        The cached map for key, or compute() stored under it.
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def load_book(self, entries):
+        """
+        Adds {hash: map} entries that stay cached for good.
+        """
+        self.book.update(entries)
+
+    def clear(self):
+        self.entries.clear()
+        self.book.clear()
+        self.hits = self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "book_entries": len(self.book),
+            "maxsize": self.maxsize,
+        }
+
+
+def save_book(path, size, entries, ships=fleet):
+    """
+    Writes {hash: (counts, layouts)} maps for a size x size board and
+    the fleet of (name, length) ships they were computed for.
+    """
+    cells = struct.Struct(f"<{size * size}Q")
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, size, len(entries), fleet_key(ships, size)))
+        for key, (counts, layouts) in sorted(entries.items()):
+            f.write(ENTRY.pack(key, layouts))
+            f.write(cells.pack(*counts))
+
+
+def load_book(path, ships=fleet):
+    """
+    Reads a book written by save_book for this fleet.
+    Returns (size, {hash: (counts, layouts)}).
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise BookError("Not an opening book this version can read.")
+    magic, version, size, count, fleet_id = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise BookError("Not an opening book this version can read.")
+    if fleet_id != fleet_key(ships, size):
+        raise BookError("Opening book was built for a different fleet.")
+    cells = struct.Struct(f"<{size * size}Q")
+    if len(data) != HEADER.size + count * (ENTRY.size + cells.size):
+        raise BookError("Opening book is truncated.")
+
+    entries = {}
+    offset = HEADER.size
+    for _ in range(count):
+        key, layouts = ENTRY.unpack_from(data, offset)
+        entries[key] = (cells.unpack_from(data, offset + ENTRY.size), layouts)
+        offset += ENTRY.size + cells.size
+    return size, entries
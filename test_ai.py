@@ -0,0 +1,56 @@
+import random
+
+from ai import DensityAI, ship_placements
+from engine import new_game, fire, Outcome
+from placement import random_ship_layout
+from simulate import run_batch
+
+
+def play_solo(ai, seed):
+    """Lets one AI shoot at a random fleet until it is sunk; returns the shot count."""
+    rng = random.Random(seed)
+    game = new_game(random_ship_layout(rng=rng)[1], random_ship_layout(rng=rng)[1])
+    shots = 0
+    while True:
+        game.current_player = 0
+        row, col = ai.choose_shot()
+        result = fire(game, row, col)
+        ai.observe(result)
+        shots += 1
+        if result.outcome == Outcome.WIN:
+            return shots
+
+
+def recomputed_density(ai):
+    """Density built from scratch from the AI's alive placements."""
+    density = [0] * (ai.size * ai.size)
+    for ship_len, alive in ai.alive.items():
+        for pid, placement in enumerate(ship_placements(ai.size, ship_len)):
+            if alive[pid]:
+                for cell in placement:
+                    density[cell] += ai.remaining[ship_len]
+    return density
+
+
+def test_density_ai_sinks_fleet_without_repeating_shots():
+    shots = play_solo(DensityAI(rng=random.Random(0)), seed=1)
+    assert 17 <= shots < 100
+
+
+def test_incremental_density_matches_full_recompute():
+    ai = DensityAI(rng=random.Random(0))
+    rng = random.Random(2)
+    game = new_game(random_ship_layout(rng=rng)[1], random_ship_layout(rng=rng)[1])
+
+    for _ in range(40):
+        game.current_player = 0
+        result = fire(game, *ai.choose_shot())
+        ai.observe(result)
+        if result.outcome == Outcome.WIN:
+            break
+        assert ai.density == recomputed_density(ai)
+
+
+def test_density_beats_random():
+    stats = run_batch(40, seed=4, shooters=("density", "random"))
+    assert stats["wins"][0] > 30
@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+from analytics import analyze, summarize
+from eventlog import EventLog, read_events, NEW_GAME, PLACE, SHOT, LENGTH_MASK, DIRECTION_SHIFT
+from snapshot import ship_coords
+from simulate import play_game
+from state import fleet
+
+
+def record(path, games, seed):
+    rng = random.Random(seed)
+    with EventLog(path) as log:
+        for _ in range(games):
+            play_game(("density", "random"), rng, log=log)
+
+
+def reference(paths):
+    """
+    The same numbers, one event at a time.
+    """
+    shots, hits, first_hits = [0, 0], [0, 0], [[], []]
+    sink = {}
+    for path in paths:
+        for kind, player, row, col, aux in read_events(path):
+            if kind == NEW_GAME:
+                ship_at, fired, first_hit, ship_count = {}, [0, 0], {}, [0, 0]
+                seen_hit = [False, False]
+            elif kind == PLACE:
+                for cell in ship_coords(row, col, aux & LENGTH_MASK, aux >> DIRECTION_SHIFT):
+                    ship_at[(player, cell)] = fleet[ship_count[player]][0]
+                ship_count[player] += 1
+            elif kind == SHOT:
+                fired[player] += 1
+                shots[player] += 1
+                if aux == 0:
+                    continue
+                hits[player] += 1
+                if not seen_hit[player]:
+                    seen_hit[player] = True
+                    first_hits[player].append(fired[player])
+                name = ship_at[(1 - player, (row, col))]
+                first_hit.setdefault((player, name), fired[player])
+                if aux >= 2:
+                    sink.setdefault(name, []).append(fired[player] - first_hit[(player, name)] + 1)
+    return {
+        "accuracy": [hits[i] / shots[i] for i in (0, 1)],
+        "first_hit_latency": [sum(f) / len(f) for f in first_hits],
+        "shots_to_sink": {name: sum(v) / len(v) for name, v in sink.items()},
+    }
+
+
+def test_matches_event_by_event_reference(tmp_path):
+    path = str(tmp_path / "games.bsel")
+    record(path, 60, seed=1)
+
+    report = summarize(analyze([path]))
+    expected = reference([path])
+    assert report["games"] == 60
+    assert report["wins"][0] + report["wins"][1] == 60
+    for key in ("accuracy", "first_hit_latency"):
+        assert report[key] == pytest.approx(expected[key])
+    assert report["shots_to_sink"] == pytest.approx(expected["shots_to_sink"])
+
+
+def test_chunking_and_workers_do_not_change_results(tmp_path):
+    paths = [str(tmp_path / f"games{i}.bsel") for i in range(3)]
+    for i, path in enumerate(paths):
+        record(path, 25, seed=i)
+
+    one_pass = analyze(paths, workers=1)
+    chunked = analyze(paths, workers=1, chunk=97)
+    parallel = analyze(paths, workers=2)
+    for stats in (chunked, parallel):
+        assert summarize(stats) == summarize(one_pass)
+        assert np.array_equal(stats["hit_heat"][10], one_pass["hit_heat"][10])
+
+
+def test_heatmaps_count_every_ship_cell_and_hit(tmp_path):
+    path = str(tmp_path / "games.bsel")
+    record(path, 10, seed=5)
+
+    stats = analyze([path])
+    ship_cells = sum(length for _, length in fleet)
+    assert stats["ship_heat"][10].sum() == 10 * 2 * ship_cells
+    assert stats["hit_heat"][10].sum() == stats["hits"].sum()
@@ -64,3 +64,22 @@ def test_score_updates():
 
     assert battleship.player_hits[0] == 1
     assert battleship.player_misses[0] == 1
+
+
+def test_sunk_detection_uses_remaining_health():
+    setup_game_state()
+
+    defender = 1
+    grid = battleship.player_grids[defender]
+    ships, cell_to_ship, health = battleship.build_ship_index(defender)
+
+    assert cell_to_ship[(5, 6)] == 0
+    assert health == [2]
+
+    # Register hits the way shoot_bullet does
+    for r, c in ships[0]["coords"]:
+        grid[r][c] = Cell.HIT
+        health[cell_to_ship[(r, c)]] -= 1
+
+    battleship.check_if_ship_sunk(5, 6)
+    assert battleship.ships_sunk[0] == 1
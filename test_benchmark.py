@@ -0,0 +1,36 @@
+import random
+
+from benchmark import run_benchmarks, compare
+from state import scaled_fleet
+
+
+def test_benchmarks_cover_every_hot_path():
+    results = run_benchmarks(sizes=(10,), scales=(1,), repeat=2)
+
+    assert set(results) == {
+        "validate_grid_and_place_ship/10/5",
+        "place_ship_randomly/10/5",
+        "check_if_ship_sunk/10/5",
+        "print_single_grid/10/5",
+        "full_game/10/5",
+    }
+    assert all(us > 0 for us in results.values())
+
+
+def test_benchmarks_leave_the_global_random_alone():
+    state = random.getstate()
+    run_benchmarks(sizes=(10,), scales=(1,), repeat=1)
+    assert random.getstate() == state
+
+
+def test_compare_flags_only_real_slowdowns():
+    baseline = {"a": 10.0, "b": 10.0, "gone": 1.0}
+    results = {"a": 12.0, "b": 14.0}
+
+    assert compare(results, baseline, tolerance=0.25) == [("b", 10.0, 14.0)]
+
+
+def test_scaled_fleet_keeps_names_unique():
+    ships = scaled_fleet(4)
+    assert len(ships) == 20
+    assert len({name for name, _ in ships}) == 20
@@ -0,0 +1,64 @@
+from bitboard import BitBoard
+from engine import new_game, fire, Outcome
+from simulate import run_batch
+from state import Cell
+
+import pytest
+
+
+def make_board():
+    ships = [
+        {"name": "Destroyer", "coords": [(5, 5), (5, 6)]},
+        {"name": "Cruiser", "coords": [(0, 0), (1, 0), (2, 0)]},
+    ]
+    return BitBoard.from_ships(ships, 10)
+
+
+def test_grid_api_matches_list_grid():
+    board = make_board()
+
+    assert len(board) == 10
+    assert board[5][6] == Cell.SHIP
+    assert board[9][9] == Cell.EMPTY
+
+    board[9][9] = Cell.MISS
+    assert board[9][9] == Cell.MISS
+    assert board.already_shot(9, 9)
+
+    for row, col in ((0, 10), (1, -1), (10, 0), (-1, 0)):
+        with pytest.raises(IndexError):
+            board[row][col]
+        with pytest.raises(IndexError):
+            board[row][col] = Cell.MISS
+    assert board[1][0] == Cell.SHIP and board[0][9] == Cell.EMPTY
+
+
+def test_shoot_reports_sunk_ship_and_all_sunk():
+    board = make_board()
+
+    assert board.shoot(5, 5) == (True, None)
+    hit, ship = board.shoot(5, 6)
+    assert hit and ship["name"] == "Destroyer"
+    assert board.shoot(3, 3) == (False, None)
+    assert not board.all_sunk()
+
+    with pytest.raises(ValueError):
+        board.shoot(5, 5)
+
+    for r in range(3):
+        board.shoot(r, 0)
+    assert board.all_sunk()
+
+
+def test_engine_runs_on_bitboards():
+    fleet_1 = [{"name": "Destroyer", "coords": [(0, 0), (0, 1)]}]
+    fleet_2 = [{"name": "Destroyer", "coords": [(5, 5), (5, 6)]}]
+    game = new_game(fleet_1, fleet_2, board_factory=BitBoard.from_ships)
+
+    assert fire(game, 5, 5).outcome == Outcome.HIT
+    assert fire(game, 0, 5).outcome == Outcome.MISS
+    assert fire(game, 5, 6).outcome == Outcome.WIN
+
+
+def test_backends_agree_on_results():
+    assert run_batch(30, seed=7)["wins"] == run_batch(30, seed=7, backend="bitboard")["wins"]
@@ -0,0 +1,40 @@
+from board import column_label, parse_coordinate, CoordinateError, format_header, grid_lines
+from state import empty_grid
+
+import pytest
+
+
+def test_column_labels_go_past_z():
+    assert [column_label(c) for c in (0, 25, 26, 27, 51, 52, 701, 702)] == \
+        ["A", "Z", "AA", "AB", "AZ", "BA", "ZZ", "AAA"]
+
+
+def test_parse_multi_letter_coordinates():
+    assert parse_coordinate("A5") == (4, 0)
+    assert parse_coordinate("j10") == (9, 9)
+    assert parse_coordinate("AB12", size=100) == (11, 27)
+    assert parse_coordinate("CV100", size=100) == (99, 99)
+    assert parse_coordinate(" A 5 ") == parse_coordinate("a\t05") == (4, 0)
+
+
+@pytest.mark.parametrize("text, message, reason", [
+    ("A", "Invalid format. Use e.g. A5.", "format"),
+    ("K1", "Invalid column letter.", "column"),
+    ("AA1", "Invalid column letter.", "column"),
+    ("A5X", "Row must be a number.", "row"),
+    ("B-2", "Row must be a number.", "row"),
+    ("A11", "Coordinates out of bounds.", "bounds"),
+    ("A0", "Coordinates out of bounds.", "bounds"),
+])
+def test_parse_rejects_bad_input(text, message, reason):
+    with pytest.raises(CoordinateError, match=message) as error:
+        parse_coordinate(text, size=10)
+    assert error.value.reason == reason
+
+
+def test_wide_boards_keep_columns_aligned():
+    lines = grid_lines("Big", empty_grid(30), reveal_ships=True)
+
+    assert format_header(10) == "   A B C D E F G H I J"
+    assert lines[2].endswith("Z AA AB AC AD")
+    assert len(lines[3]) == len(lines[2])
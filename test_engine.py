@@ -0,0 +1,65 @@
+import random
+
+from engine import new_game, fire, Outcome
+from placement import random_ship_layout
+from simulate import run_batch
+from state import Cell
+
+import pytest
+
+
+def make_game():
+    """Two single-ship fleets: a Destroyer each."""
+    fleet_1 = [{"name": "Destroyer", "coords": [(0, 0), (0, 1)]}]
+    fleet_2 = [{"name": "Destroyer", "coords": [(5, 5), (5, 6)]}]
+    return new_game(fleet_1, fleet_2)
+
+
+def test_miss_hit_and_win():
+    game = make_game()
+
+    assert fire(game, 5, 5).outcome == Outcome.HIT   # Player 1
+    assert fire(game, 9, 9).outcome == Outcome.MISS  # Player 2
+    result = fire(game, 5, 6)                        # Player 1
+
+    assert result.outcome == Outcome.WIN
+    assert result.ship["name"] == "Destroyer"
+    assert game.winner == 0
+    assert game.players[0].hits == 2
+    assert game.players[1].misses == 1
+
+
+def test_repeated_shot_is_rejected():
+    game = make_game()
+    fire(game, 5, 5)
+    fire(game, 9, 9)
+
+    with pytest.raises(ValueError):
+        fire(game, 5, 5)
+
+
+def test_random_layout_places_whole_fleet():
+    grid, ships = random_ship_layout(rng=random.Random(1))
+
+    assert len(ships) == 5
+    assert sum(row.count(Cell.SHIP) for row in grid) == 17
+
+
+def test_batch_simulator_finishes_games():
+    stats = run_batch(20, seed=3)
+
+    assert stats["games"] == 20
+    assert sum(stats["wins"]) == 20
+    assert 17 <= stats["mean_shots_to_win"] <= 100
+
+
+def test_sessions_are_independent_and_slotted():
+    game_1 = make_game()
+    game_2 = make_game()
+    fire(game_1, 5, 5)
+
+    assert game_1.players[0].hits == 1
+    assert game_2.players[0].hits == 0
+    assert game_2.current_player == 0
+    assert not hasattr(game_1, "__dict__")
+    assert not hasattr(game_1.players[0], "__dict__")
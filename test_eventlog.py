@@ -0,0 +1,79 @@
+import random
+
+import eventlog
+from eventlog import EventLog, replay_log, seek, read_checkpoints, read_events, game_start, SHOT, EVENT
+from simulate import play_game
+from snapshot import dumps
+from state import scaled_fleet
+
+
+def record(path, games, checkpoint_every=1024, **kwargs):
+    rng = random.Random(4)
+    with EventLog(path, checkpoint_every) as log:
+        return [dumps(play_game(rng=rng, log=log, **kwargs)) for _ in range(games)]
+
+
+def test_replay_rebuilds_every_game(tmp_path):
+    path = str(tmp_path / "games.bsel")
+    finals = record(path, 20)
+
+    assert [dumps(session) for session in replay_log(path)] == finals
+
+
+def test_seek_uses_checkpoints_and_matches_replay(tmp_path):
+    plain = str(tmp_path / "plain.bsel")
+    checkpointed = str(tmp_path / "checkpointed.bsel")
+    record(plain, 3, checkpoint_every=0)
+    record(checkpointed, 3, checkpoint_every=16)
+
+    assert list(read_checkpoints(plain)) == []
+    assert any(game == 2 for game, *_ in read_checkpoints(checkpointed))
+    for turn in (0, 15, 16, 17, 40, 1000):
+        expected = dumps(seek(plain, turn, game=2))
+        assert dumps(seek(checkpointed, turn, game=2)) == expected
+
+    session = seek(plain, 40, game=1)
+    assert session.players[0].shots_taken + session.players[1].shots_taken == 40
+
+
+def test_torn_record_is_cut_on_reopen(tmp_path):
+    path = tmp_path / "games.bsel"
+    finals = record(str(path), 2)
+    with open(path, "ab") as f:
+        f.write(b"\x03\x00\x01")
+
+    rng = random.Random(9)
+    with EventLog(str(path)) as log:
+        finals.append(dumps(play_game(rng=rng, log=log)))
+    assert [dumps(session) for session in replay_log(str(path))] == finals
+
+
+def test_scaled_fleet_names_survive(tmp_path):
+    path = str(tmp_path / "big.bsel")
+    record(path, 1, ships=scaled_fleet(2), size=20)
+
+    (session,) = replay_log(path)
+    assert [ship["name"] for ship in session.players[1].ship_positions] == \
+           [name for name, _ in scaled_fleet(2)]
+    assert sum(1 for event in read_events(path) if event[0] == SHOT) == \
+           session.players[0].shots_taken + session.players[1].shots_taken
+
+
+def test_scans_stream_and_stale_checkpoints_are_dropped(tmp_path, monkeypatch):
+    monkeypatch.setattr(eventlog, "CHUNK_EVENTS", 16)
+    path = tmp_path / "games.bsel"
+    finals = record(str(path), 3, checkpoint_every=8)
+    starts = [i for i, event in enumerate(read_events(str(path))) if event[0] == eventlog.NEW_GAME]
+    assert [game_start(str(path), game) for game in range(3)] == starts
+
+    # Cut the log back into its last game, as if its tail never reached disk
+    last = max(ckpt[2] for ckpt in read_checkpoints(str(path)))
+    with open(path, "r+b") as f:
+        f.truncate(eventlog.HEADER.size + (last - 3) * EVENT.size + 5)
+    turn = 10 ** 6
+    assert dumps(seek(str(path), turn, game=1)) == finals[1]
+
+    with EventLog(str(path)) as log:
+        assert log.games == 3
+    assert all(ckpt[2] <= last - 3 for ckpt in read_checkpoints(str(path)))
+    assert dumps(seek(str(path), turn, game=2)) == dumps(list(replay_log(str(path)))[2])
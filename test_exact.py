@@ -0,0 +1,64 @@
+import itertools
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from exact import LayoutCounter, count_layouts, cell_probabilities, attacker_view
+from ai import ship_placements
+from engine import new_game, fire
+from placement import random_ship_layout
+from simulate import play_game
+
+SHIPS = [("Cruiser", 3), ("Destroyer", 2), ("Patrol", 2)]
+
+
+def brute_force(size, ships, blocked, hits):
+    options = [[p for p in ship_placements(size, ship_len) if not set(p) & blocked and not set(p) <= hits]
+               for _, ship_len in ships]
+    total, counts = 0, [0] * (size * size)
+    for layout in itertools.product(*options):
+        cells = [cell for placement in layout for cell in placement]
+        if len(set(cells)) == len(cells) and hits <= set(cells):
+            total += 1
+            for cell in cells:
+                counts[cell] += 1
+    return total, counts
+
+
+def test_matches_brute_force_enumeration():
+    rng = random.Random(3)
+    for trial in range(6):
+        cells = rng.sample(range(25), 25)
+        blocked, hits = set(cells[:trial]), set(cells[trial:trial + trial // 2])
+        expected = brute_force(5, SHIPS, blocked, hits)
+        assert LayoutCounter(5, SHIPS, blocked, hits).occupancy() == expected
+        assert count_layouts(5, SHIPS, blocked, hits) == expected[0]
+
+
+def test_standard_empty_board():
+    assert count_layouts() == 30093975536
+
+
+def test_probabilities_follow_the_observations():
+    rng = random.Random(5)
+    session = new_game(random_ship_layout(rng=rng)[1], random_ship_layout(rng=rng)[1])
+    shots = rng.sample([(r, c) for r in range(10) for c in range(10)], 100)
+    for turn in range(50):
+        fire(session, *shots[turn // 2] if turn % 2 == 0 else shots[50 + turn // 2])
+
+    ships, blocked, hits = attacker_view(session, 0)
+    probabilities = cell_probabilities(10, ships, blocked, hits)
+    assert all(probabilities[cell] == 0 for cell in blocked)
+    assert all(probabilities[cell] == 1 for cell in hits)
+    assert sum(probabilities) == pytest.approx(sum(length for _, length in ships))
+
+    # The real layout is one of those counted
+    assert count_layouts(10, ships, blocked, hits) >= 1
+
+
+def test_exact_ai_finishes_game():
+    game = play_game(("exact", "random"), random.Random(1), ships=SHIPS, size=6)
+    assert game.game_over
+    assert game.players[0].shots_taken <= 36
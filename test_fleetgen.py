@@ -0,0 +1,71 @@
+import random
+
+from placement import random_ship_layout, NoLegalPlacement
+from state import Cell
+
+import pytest
+
+np = pytest.importorskip("numpy")
+import fleetgen
+from fleetgen import random_layouts, placement_table, pack_masks
+
+
+def test_layouts_hold_the_whole_fleet():
+    boards, coords = random_layouts(500, seed=1)
+
+    assert boards.shape == (500, 10, 10)
+    assert ((boards > 0).sum(axis=(1, 2)) == 17).all()
+    for i, ship_coords in enumerate(coords):
+        rows, cols = ship_coords[:, :, 0], ship_coords[:, :, 1]
+        assert (boards[np.arange(500)[:, None], rows, cols] == i + 1).all()
+
+
+def test_placement_table_matches_empty_grid_count():
+    masks, coords = placement_table(10, 5)
+
+    assert masks.shape == (120, 100)
+    assert (masks.sum(axis=1) == 5).all()
+
+
+def test_packed_masks_hold_the_same_cells():
+    masks, _ = placement_table(12, 4)
+    packed = pack_masks(masks)
+
+    assert packed.shape == (3, len(masks))
+    for p in (0, 50, len(masks) - 1):
+        bits = sum(int(word) << 64 * w for w, word in enumerate(packed[:, p]))
+        assert bits == sum(1 << int(cell) for cell in np.flatnonzero(masks[p]))
+
+
+def test_distribution_matches_place_ship_randomly():
+    ships = [("Cruiser", 3), ("Destroyer", 2)]
+    n = 20000
+
+    boards, _ = random_layouts(n, ships, size=4, seed=2)
+    batch = (boards > 0).mean(axis=0)
+
+    rng = random.Random(2)
+    single = np.zeros((4, 4))
+    for _ in range(n):
+        grid, _ = random_ship_layout(ships, 4, rng)
+        single += [[cell == Cell.SHIP for cell in row] for row in grid]
+    single /= n
+
+    assert np.abs(batch - single).max() < 0.02
+
+
+@pytest.mark.parametrize("rounds, scan", [(8, 1 << 22), (0, 500)])
+def test_large_boards_and_scans_in_slices(monkeypatch, rounds, scan):
+    monkeypatch.setattr(fleetgen, "REJECTION_ROUNDS", rounds)
+    monkeypatch.setattr(fleetgen, "SCAN_ELEMENTS", scan)
+    boards, coords = random_layouts(300, size=40, seed=4, chunk=100)
+
+    assert ((boards > 0).sum(axis=(1, 2)) == 17).all()
+    for i, ship_coords in enumerate(coords):
+        rows, cols = ship_coords[:, :, 0], ship_coords[:, :, 1]
+        assert (boards[np.arange(300)[:, None], rows, cols] == i + 1).all()
+
+
+def test_impossible_fleet_raises():
+    with pytest.raises(NoLegalPlacement):
+        random_layouts(10, [("Destroyer", 2)] * 3, size=2, seed=0)
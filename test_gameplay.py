@@ -0,0 +1,74 @@
+import metrics
+from gameplay import shoot_bullet, shoot_salvo, show_live_score, check_game_over, switch_player
+from engine import new_game, Outcome
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+
+def play_console(session, answers, monkeypatch):
+    """
+    Runs the main.py turn loop on session, answering every prompt from answers.
+    """
+    answers = iter(answers)
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    while not session.game_over:
+        if session.salvo:
+            shoot_salvo(session)
+        else:
+            shoot_bullet(session)
+        show_live_score(session)
+        check_game_over(session)
+        if not session.game_over:
+            switch_player(session)
+
+
+FLEET_1 = [{"name": "Destroyer", "coords": [(0, 0), (0, 1)]}]
+FLEET_2 = [{"name": "Destroyer", "coords": [(5, 5), (5, 6)]},
+           {"name": "Patrol", "coords": [(9, 9)]}]
+
+
+class ShotLog:
+    def __init__(self):
+        self.shots = []
+
+    def shot(self, session, player, result):
+        self.shots.append((player, result.outcome))
+
+
+def test_console_turns_fire_through_the_engine(monkeypatch, capsys):
+    metrics.enable()
+    session = new_game(FLEET_1, FLEET_2)
+    session.log = ShotLog()
+    play_console(session, ["F6", "", "A1", "", "F6", "G6", "", "J10", "", "J10"], monkeypatch)
+
+    out = capsys.readouterr().out
+    assert out.count("Hit!") == 4 and out.count("Miss.") == 1
+    assert "You already shot there" in out
+    assert "You sank the Destroyer!" in out and "You sank the Patrol!" in out
+    assert "Player 1 wins!" in out
+
+    assert session.winner == 0
+    assert (session.players[0].hits, session.players[0].ships_sunk) == (3, 2)
+    assert (session.players[1].hits, session.players[1].misses) == (1, 1)
+    assert metrics.FIRE_SECONDS.count == 5
+    assert session.log.shots == [(0, Outcome.HIT), (1, Outcome.HIT), (0, Outcome.SUNK),
+                                 (1, Outcome.MISS), (0, Outcome.WIN)]
+
+
+def test_console_salvo_fires_one_volley(monkeypatch, capsys):
+    session = new_game(FLEET_2, FLEET_2, salvo=True)
+    play_console(session, ["F6", "F6", "G6", "", "A1", "", "J10", "A1"], monkeypatch)
+
+    out = capsys.readouterr().out
+    assert "Salvo: 2 shot(s) this turn." in out
+    assert "Already in this salvo" in out
+    assert session.winner == 0
+    assert session.players[0].shots_taken == 3
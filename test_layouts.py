@@ -0,0 +1,95 @@
+import json
+import random
+
+import layouts
+from layouts import validate_layouts, check_layout, placement_masks, LayoutError
+from placement import random_ship_layout
+from state import fleet, scaled_fleet
+
+import pytest
+
+
+def layout(seed, ships=None, size=10):
+    rng = random.Random(seed)
+    args = (ships, size) if ships else ()
+    return {ship["name"]: ship["coords"] for ship in random_ship_layout(*args, rng=rng)[1]}
+
+
+def test_random_layouts_are_valid_in_every_form():
+    good = layout(1)
+    as_lists = {name: [list(c) for c in coords] for name, coords in good.items()}
+    reversed_order = {name: coords[::-1] for name, coords in good.items()}
+    as_positions = [{"name": name, "coords": coords} for name, coords in good.items()]
+
+    assert validate_layouts([layout(seed) for seed in range(200)]) == [None] * 200
+    assert validate_layouts([as_lists, reversed_order, as_positions]) == [None] * 3
+    assert bin(check_layout(good)).count("1") == 17
+
+
+def test_each_broken_layout_gets_its_own_error():
+    good = layout(2)
+    carrier = good["Carrier"]
+    layouts = [
+        {**good, "Destroyer": [(9, 9), (9, 10)]},
+        {**good, "Carrier": [(0, 0), (1, 5), (2, 0), (3, 0), (4, 0)]},
+        {**good, "Carrier": [(0, 0), (0, 1), (0, 3), (0, 4), (0, 5)]},
+        {**good, "Cruiser": carrier[:3]},
+        {**good, "Cruiser": carrier[:2]},
+        {name: coords for name, coords in good.items() if name != "Submarine"},
+        {**good, "Rowboat": [(0, 0)]},
+        {**good, "Destroyer": [(0, "A"), (0, 1)]},
+        [{"name": "Carrier", "coords": carrier}] * 2,
+        good,
+    ]
+    errors = validate_layouts(layouts)
+
+    assert errors == [
+        "Destroyer is out of bounds.",
+        "Carrier is not a straight, unbroken line.",
+        "Carrier is not a straight, unbroken line.",
+        "Cruiser overlaps another ship.",
+        "Cruiser must cover 3 cells, not 2.",
+        "Missing ship: Submarine",
+        "Unknown ship: Rowboat",
+        "Destroyer has a malformed coordinate.",
+        "Carrier appears more than once.",
+        None,
+    ]
+    with pytest.raises(LayoutError, match="overlaps"):
+        check_layout(layouts[3])
+
+
+def test_scaled_fleets_and_grids_without_a_table():
+    ships = scaled_fleet(4)
+    assert validate_layouts([layout(3, ships, 20)], ships, 20) == [None]
+
+    assert placement_masks(100, 5) == {}
+    big = layout(4, ships, 100)
+    assert validate_layouts([big], ships, 100) == [None]
+    big["Carrier 1"] = [(99, 99), (99, 100), (99, 101), (99, 102), (99, 103)]
+    assert validate_layouts([big], ships, 100) == ["Carrier 1 is out of bounds."]
+
+
+def test_json_layouts_take_the_table_path(monkeypatch):
+    uploads = json.loads(json.dumps([layout(seed) for seed in range(50)]))
+
+    def slow_path(*args):
+        raise AssertionError("table lookup missed")
+
+    monkeypatch.setattr(layouts, "ship_mask", slow_path)
+    assert validate_layouts(uploads) == [None] * 50
+
+
+def test_float_and_bool_coordinates_are_malformed():
+    # Every ship in its own row from column 0; the Destroyer is in row 1
+    rows = {"Carrier": 0, "Destroyer": 1, "Battleship": 2, "Cruiser": 3, "Submarine": 4}
+    good = {name: [(rows[name], c) for c in range(length)] for name, length in fleet}
+    layouts = [
+        {**good, "Destroyer": [(1.0, 0), (1, 1)]},
+        {**good, "Destroyer": [(1, 0), (1, 1.0)]},
+        {**good, "Destroyer": [(True, False), (True, True)]},
+        [{"name": name, "coords": [list(cell) for cell in coords]} for name, coords in good.items()],
+    ]
+
+    assert validate_layouts(layouts[:3]) == ["Destroyer has a malformed coordinate."] * 3
+    assert validate_layouts(layouts[3:]) == [None]
@@ -0,0 +1,71 @@
+import asyncio
+
+from loadtest import run_load, percentile
+from server import BattleshipServer, ProtocolError
+from client import BattleshipClient
+
+import pytest
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7], 95) == 7
+    assert percentile([], 50) == 0.0
+
+
+def test_load_run_reports_every_match():
+    report = asyncio.run(run_load(20, seed=3))
+
+    assert report["matches"] == 10
+    assert report["games_completed"] == 10
+    assert report["errors"] == 0
+    # Each match needs at least 17 hits from the winner
+    assert report["shots"] >= 10 * 17
+    latency = report["latency_ms"]
+    assert 0 < latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+
+
+def test_unreachable_server_counts_errors():
+    report = asyncio.run(run_load(4, port=1))
+
+    assert report["games_completed"] == 0
+    assert report["errors"] == 4
+    assert report["shots"] == 0
+
+
+def test_failed_join_does_not_hang_the_host():
+    class FullServer(BattleshipServer):
+        def op_join(self, conn, writer, request):
+            raise ProtocolError("Server is full.")
+
+    async def run():
+        listener = await FullServer().start(port=0)
+        async with listener:
+            port = listener.sockets[0].getsockname()[1]
+            return await asyncio.wait_for(run_load(4, port=port), 10)
+
+    report = asyncio.run(run())
+    assert report["errors"] == 2
+    assert report["last_error"] == "Server is full."
+
+
+@pytest.mark.parametrize("failing", [0, 1])
+def test_failed_connect_is_counted_once(monkeypatch, failing):
+    connect = BattleshipClient.connect.__func__
+    calls = []
+
+    async def flaky_connect(cls, *args):
+        # Connects come host, guest, host, guest: fail every host or every guest
+        calls.append(None)
+        if len(calls) % 2 != failing:
+            raise ConnectionRefusedError("connect refused")
+        return await connect(cls, *args)
+
+    monkeypatch.setattr(BattleshipClient, "connect", classmethod(flaky_connect))
+    report = asyncio.run(asyncio.wait_for(run_load(4, seed=1), 10))
+
+    assert report["games_completed"] == 0
+    assert report["errors"] == 2
+    assert report["last_error"] == "connect refused"
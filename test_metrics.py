@@ -0,0 +1,57 @@
+import random
+
+import metrics
+from board import input_coordinate
+from simulate import play_game
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+
+def test_disabled_records_nothing():
+    play_game(rng=random.Random(1))
+
+    assert metrics.FIRE_SECONDS.count == 0
+    assert metrics.PLACEMENT_RETRIES.count == 0
+
+
+def test_enabled_counts_shots_and_placements():
+    metrics.enable()
+    game = play_game(rng=random.Random(1))
+
+    shots = game.players[0].shots_taken + game.players[1].shots_taken
+    snapshot = metrics.snapshot()
+    assert snapshot["battleship_fire_seconds"]["count"] == shots
+    assert snapshot["battleship_placement_retries"]["count"] == 10
+    assert snapshot["battleship_placement_retries"]["buckets"][float("inf")] == 10
+
+
+def test_rejected_coordinates_by_reason(monkeypatch, capsys):
+    metrics.enable()
+    answers = iter(["5A", "A", "K1", "A11", "A1.5", "B2"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+
+    assert input_coordinate("Target: ") == (1, 1)
+    assert metrics.snapshot()["battleship_rejected_coordinates_total"] == \
+           {"format": 2, "column": 1, "bounds": 1, "row": 1}
+
+
+def test_prometheus_text_format():
+    metrics.enable()
+    metrics.CHECK_SUNK_SECONDS.observe(3e-6)
+    metrics.REJECTED_COORDINATES.inc(label="format")
+
+    lines = metrics.prometheus_text().splitlines()
+    assert "# TYPE battleship_check_if_ship_sunk_seconds histogram" in lines
+    assert 'battleship_check_if_ship_sunk_seconds_bucket{le="2.5e-06"} 0' in lines
+    assert 'battleship_check_if_ship_sunk_seconds_bucket{le="5e-06"} 1' in lines
+    assert 'battleship_check_if_ship_sunk_seconds_bucket{le="+Inf"} 1' in lines
+    assert "battleship_check_if_ship_sunk_seconds_count 1" in lines
+    assert 'battleship_rejected_coordinates_total{reason="format"} 1' in lines
@@ -0,0 +1,46 @@
+import random
+
+from montecarlo import sample_layouts, MonteCarloAI, shutdown_pools
+from test_ai import play_solo
+
+import pytest
+
+
+def test_samples_respect_observations():
+    blocked = (0, 1, 2, 10, 11, 12)
+    hits = (55,)
+
+    counts, accepted = sample_layouts(10, (5, 4, 3, 3, 2), blocked, hits, 300, seed=1)
+
+    assert accepted == 300
+    assert all(counts[cell] == 0 for cell in blocked)
+    assert counts[55] == accepted           # every sample covers the hit
+
+
+def test_monte_carlo_ai_finishes_game():
+    ai = MonteCarloAI(rng=random.Random(0), samples=200, workers=1)
+    assert 17 <= play_solo(ai, seed=3) < 100
+
+
+def test_sampling_is_spread_over_the_pool():
+    ai = MonteCarloAI(rng=random.Random(0), samples=400, workers=2)
+    try:
+        row, col = ai.choose_shot()
+    finally:
+        shutdown_pools()
+
+    assert ai.last_samples >= 400
+    assert 0 <= row < 10 and 0 <= col < 10
+
+
+def test_samples_are_uniform_over_consistent_layouts():
+    pytest.importorskip("numpy")
+    from exact import cell_probabilities
+
+    ships = [("Battleship", 4), ("Cruiser", 3), ("Destroyer", 2)]
+    blocked, hits = (0, 7, 14), (20,)
+    counts, accepted = sample_layouts(6, (4, 3, 2), blocked, hits, 20000, seed=1)
+
+    exact = cell_probabilities(6, ships, blocked, hits)
+    assert accepted == 20000
+    assert max(abs(n / accepted - p) for n, p in zip(counts, exact)) < 0.02
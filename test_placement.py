@@ -0,0 +1,54 @@
+import random
+from collections import Counter
+
+from placement import (legal_placements, random_place_ship, random_ship_layout,
+                       expected_retries, NoLegalPlacement)
+from state import empty_grid, Cell
+
+import pytest
+
+
+def test_legal_placements_on_empty_grid():
+    # 10 rows x 9 starts horizontally, same vertically
+    assert len(legal_placements(empty_grid(10), 2)) == 180
+    assert len(legal_placements(empty_grid(10), 5)) == 120
+
+
+def test_legal_placements_skip_occupied_cells():
+    grid = empty_grid(3)
+    grid[1][1] = Cell.SHIP
+
+    placements = legal_placements(grid, 3)
+
+    assert (0, 0, 0, 2) in placements
+    assert (1, 1, 0, 2) not in placements
+    assert (0, 2, 1, 1) not in placements
+    assert len(placements) == 4
+
+
+def test_sampler_is_uniform_over_legal_placements():
+    rng = random.Random(5)
+    counts = Counter()
+    for _ in range(4000):
+        grid, ships = empty_grid(3), []
+        random_place_ship(grid, ships, "Destroyer", 2, rng)
+        counts[tuple(ships[0]["coords"])] += 1
+
+    # 12 legal placements on a 3x3 grid, each ~333 times
+    assert len(counts) == 12
+    assert max(counts.values()) - min(counts.values()) < 120
+
+
+def test_no_legal_layout_raises_instead_of_hanging():
+    with pytest.raises(NoLegalPlacement):
+        random_ship_layout([("Carrier", 6)], size=5)
+
+    # Two Destroyers fill a 2x2 grid, the third has nowhere to go
+    with pytest.raises(NoLegalPlacement):
+        random_ship_layout([("Destroyer", 2)] * 3, size=2, rng=random.Random(0))
+
+
+def test_expected_retries_of_rejection_loop():
+    # 180 of 200 possible draws fit a Destroyer on an empty board
+    assert expected_retries(10, 180) == pytest.approx(200 / 180 - 1)
+    assert expected_retries(10, 0) == float("inf")
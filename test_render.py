@@ -0,0 +1,72 @@
+import io
+
+from board import grid_lines
+from render import GridRenderer, CLEAR_SCREEN, RESET_SCROLL_REGION
+from state import empty_grid, Cell
+
+
+class FakeTerminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def test_non_tty_output_matches_print_single_grid():
+    grid = empty_grid(10)
+    grid[2][3] = Cell.SHIP
+    out = io.StringIO()
+
+    renderer = GridRenderer(out)
+    renderer.draw(renderer.grid_lines("Board", grid, reveal_ships=True))
+
+    assert out.getvalue() == "\n".join(grid_lines("Board", grid, True)) + "\n"
+
+
+def test_tty_redraws_only_the_changed_cell(monkeypatch):
+    monkeypatch.setenv("LINES", "40")
+    grid = empty_grid(10)
+    out = FakeTerminal()
+    renderer = GridRenderer(out)
+
+    renderer.draw(renderer.grid_lines("Board", grid, reveal_ships=False))
+    assert out.getvalue().startswith(CLEAR_SCREEN)
+
+    out.seek(0)
+    out.truncate()
+    grid[4][2] = Cell.MISS
+    renderer.invalidate(grid, 4)
+    renderer.draw(renderer.grid_lines("Board", grid, reveal_ships=False))
+
+    # Row 5 of the grid is line 8 on screen; column C is character 8
+    assert out.getvalue().startswith("\x1b[8;8HO")
+    assert CLEAR_SCREEN not in out.getvalue()
+
+
+def test_rows_are_cached_until_invalidated():
+    grid = empty_grid(10)
+    renderer = GridRenderer(io.StringIO())
+    renderer.row_strings(grid, True)
+
+    grid[0][0] = Cell.HIT
+    assert renderer.row_strings(grid, True)[0].startswith(" 1 .")
+
+    renderer.invalidate(grid, 0)
+    assert renderer.row_strings(grid, True)[0].startswith(" 1 X")
+
+
+def test_frame_is_pinned_or_redrawn_in_full(monkeypatch):
+    grid = empty_grid(10)
+    out = FakeTerminal()
+    renderer = GridRenderer(out)
+    lines = renderer.grid_lines("Board", grid, reveal_ships=False)
+
+    monkeypatch.setenv("LINES", "40")
+    renderer.draw(lines)
+    # Prompts scroll in lines 15-40, below the 14-line frame
+    assert "\x1b[15;40r" in out.getvalue()
+
+    monkeypatch.setenv("LINES", "16")
+    for _ in range(2):
+        out.seek(0)
+        out.truncate()
+        renderer.draw(lines)
+        assert out.getvalue().startswith(RESET_SCROLL_REGION + CLEAR_SCREEN)
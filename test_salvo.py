@@ -0,0 +1,133 @@
+import asyncio
+import random
+
+from engine import new_game, fire, fire_many, salvo_shots, Outcome
+from snapshot import dumps, loads, SnapshotError
+from server import BattleshipServer
+from client import BattleshipClient, ServerError, play_bot
+from state import Cell
+
+import pytest
+
+
+def make_game():
+    """Two fleets of a Destroyer and a Submarine, salvo rules."""
+    fleet_1 = [{"name": "Destroyer", "coords": [(0, 0), (0, 1)]},
+               {"name": "Submarine", "coords": [(2, 0), (2, 1), (2, 2)]}]
+    fleet_2 = [{"name": "Destroyer", "coords": [(5, 5), (5, 6)]},
+               {"name": "Submarine", "coords": [(7, 0), (7, 1), (7, 2)]}]
+    return new_game(fleet_1, fleet_2, salvo=True)
+
+
+def test_volley_is_resolved_as_one_turn():
+    game = make_game()
+    assert salvo_shots(game) == 2
+
+    volley = fire_many(game, [(5, 5), (9, 9)])
+
+    assert [shot.outcome for shot in volley.shots] == [Outcome.HIT, Outcome.MISS]
+    assert (volley.hits, volley.misses, volley.sunk, volley.won) == (1, 1, [], False)
+    assert game.current_player == 1
+    assert game.players[0].shots_taken == 2
+    assert game.players[1].grid[9][9] == Cell.MISS
+
+
+def test_bad_volley_changes_nothing():
+    game = make_game()
+    fire_many(game, [(5, 5), (9, 9)])
+    fire_many(game, [(9, 9), (8, 8)])
+    before = dumps(game)
+
+    for targets in ([], [(0, 0), (0, 0)], [(5, 5), (4, 4)], [(1, 1), (10, 0)],
+                    [(1, 1), (1, 2), (1, 3)]):
+        with pytest.raises(ValueError):
+            fire_many(game, targets)
+    assert dumps(game) == before
+
+
+def test_shots_shrink_as_ships_sink_and_win_stops_the_volley():
+    game = make_game()
+    volley = fire_many(game, [(5, 5), (5, 6)])
+    assert [ship["name"] for ship in volley.sunk] == ["Destroyer"]
+
+    assert salvo_shots(game) == 1              # Player 2 lost a ship
+    fire_many(game, [(9, 9)])
+    fire_many(game, [(7, 0), (7, 1)])
+    fire_many(game, [(9, 8)])
+    volley = fire_many(game, [(7, 2), (0, 9)])
+
+    assert volley.won and len(volley.shots) == 1
+    assert game.winner == 0
+    with pytest.raises(ValueError, match="over"):
+        fire_many(game, [(0, 9)])
+
+
+def test_classic_rules_allow_one_shot_and_salvo_survives_a_snapshot():
+    classic = new_game(*[[{"name": "Destroyer", "coords": [(r, 0), (r, 1)]}] for r in (0, 5)])
+    assert salvo_shots(classic) == 1
+    with pytest.raises(ValueError, match="allowed"):
+        fire_many(classic, [(5, 5), (6, 6)])
+    fire(classic, 5, 5)
+    assert not loads(dumps(classic)).salvo
+
+    game = make_game()
+    fire_many(game, [(5, 5), (5, 6)])
+    restored = loads(dumps(game))
+    assert restored.salvo
+    assert salvo_shots(restored) == 1
+
+    # Version 1 readers knew no salvo flag: a version 1 snapshot with it is refused
+    data = dumps(game)
+    with pytest.raises(SnapshotError, match="flags"):
+        loads(data[:2] + b"\x01" + data[3:])
+    assert not loads(dumps(classic)[:2] + b"\x01" + dumps(classic)[3:]).salvo
+
+
+def test_bots_play_a_salvo_match_on_the_server():
+    async def run():
+        server = BattleshipServer(rng=random.Random(0))
+        listener = await server.start(port=0)
+        async with listener:
+            host = await BattleshipClient.connect(port=listener.sockets[0].getsockname()[1])
+            guest = await BattleshipClient.connect(port=listener.sockets[0].getsockname()[1])
+            created = asyncio.ensure_future(play_bot(host, random.Random(1), name="A", salvo=True))
+            while not server.matches:
+                await asyncio.sleep(0)
+            match = next(iter(server.matches))
+            assert server.matches[match].session.salvo
+            winners = await asyncio.gather(
+                created, play_bot(guest, random.Random(2), match=match, name="B"))
+            await host.close()
+            await guest.close()
+            return server, winners
+
+    server, winners = asyncio.run(run())
+    assert winners[0] == winners[1] and winners[0] in ("A", "B")
+    assert server.shots >= 17
+    assert not server.matches
+
+
+def test_volley_targets_must_be_whole_numbers():
+    async def run():
+        server = BattleshipServer(rng=random.Random(0))
+        listener = await server.start(port=0)
+        async with listener:
+            port = listener.sockets[0].getsockname()[1]
+            host = await BattleshipClient.connect(port=port)
+            guest = await BattleshipClient.connect(port=port)
+            match = (await host.request("new", name="A", salvo=True))["match"]
+            await guest.request("join", match=match, name="B")
+            await host.request("place", random=True)
+            await guest.request("place", random=True)
+
+            for targets in ([[1.7, 2]], [[True, 0]], [["1", 2]]):
+                with pytest.raises(ServerError, match="whole numbers"):
+                    await host.request("fire", targets=targets)
+            reply = await host.request("fire", targets=["A1", [4, 4]])
+            await host.close()
+            await guest.close()
+            return server, reply
+
+    server, reply = asyncio.run(run())
+    assert [(shot["row"], shot["col"]) for shot in reply["shots"]] == [(0, 0), (4, 4)]
+    assert server.shots == 2
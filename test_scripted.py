@@ -0,0 +1,107 @@
+import io
+import json
+
+from scripted import run_script, ScriptError
+from board import column_label
+from state import fleet
+
+import pytest
+
+# Every ship in its own row, starting at column A
+PLACEMENTS = [f"place {p} {name} A{row + 1} H" for p in (1, 2) for row, (name, _) in enumerate(fleet)]
+TARGETS = [f"{column_label(c)}{row + 1}" for row, (_, length) in enumerate(fleet) for c in range(length)]
+WATER = [f"J{row}" for row in range(1, 11)] + [f"I{row}" for row in range(1, 11)]
+
+
+def play(lines, **kwargs):
+    out = io.StringIO()
+    run_script(lines, out, **kwargs)
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_plays_a_whole_game_from_words():
+    lines = list(PLACEMENTS)
+    for target, water in zip(TARGETS, WATER):
+        lines += [f"fire {target}", f"fire {water}"]
+
+    (result,) = play(lines)
+    assert result["finished"] and result["winner"] == "Player 1"
+    assert result["shots"] == [17, 16]
+    assert result["ships_sunk"] == [5, 0]
+    assert result["errors"] == [{"line": len(lines), "error": "Game is already over."}]
+
+
+def test_json_moves_and_bad_moves_are_reported():
+    lines = [
+        '{"op": "game", "names": ["Ann", "Bob"]}',
+        "fire A1",
+        '{"op": "place", "player": 1, "random": true, "seed": 1}',
+        "place 2 random 2",
+        "# comment",
+        "fire 2 A1",
+        '{"op": "fire", "at": "A1"}',
+        "fire A1",
+        "fire A1",
+        "launch A1",
+    ]
+    (result,) = play(lines)
+
+    assert result["names"] == ["Ann", "Bob"]
+    assert result["shots"] == [1, 1]
+    assert [e["line"] for e in result["errors"]] == [2, 6, 9, 10]
+    assert "placed" in result["errors"][0]["error"]
+
+    with pytest.raises(ScriptError, match="Line 2"):
+        play(lines, strict=True)
+
+
+def test_several_games_with_shot_lines():
+    lines = ["place 1 random 1", "place 2 random 2", "fire B2", "game", "place 1 random 3",
+             "place 2 random 3", "fire C3", "fire C3"]
+    records = play(lines, moves=True)
+
+    shots = [r for r in records if "result" in r]
+    games = [r for r in records if "winner" in r]
+    assert [(s["game"], s["player"], s["at"]) for s in shots] == [(1, 1, "B2"), (2, 1, "C3"), (2, 2, "C3")]
+    assert [g["game"] for g in games] == [1, 2]
+    assert games[1]["shots"] == [1, 1]
+
+
+def test_malformed_moves_are_reported_not_raised():
+    lines = [
+        '{"op": "game", "size": "big"}',
+        '{"op": "game", "size": 0}',
+        '{"op": "game", "size": true}',
+        '{"op": "game", "size": 1000000}',
+        '{"op": "game", "names": "Ann"}',
+        '{"op": "place", "player": 1, "ship": ["x"], "at": "A1", "dir": "H"}',
+    ]
+    (result,) = play(lines)
+
+    assert [e["line"] for e in result["errors"]] == [1, 2, 3, 4, 5, 6]
+    assert "Size" in result["errors"][0]["error"]
+    assert "1 to 1000" in result["errors"][3]["error"]
+    assert "Unknown ship" in result["errors"][5]["error"]
+    with pytest.raises(ScriptError, match="Size"):
+        play([], size=10 ** 6)
+
+
+def test_undecodable_input_is_reported():
+    (result,) = play([b"game Ann Bob\n", b"fire \xff\n", b"place 1 random\n"])
+    assert result["names"] == ["Ann", "Bob"]
+    assert result["errors"] == [{"line": 2, "error": "Line is not valid UTF-8."}]
+
+    stream = io.TextIOWrapper(io.BytesIO(b"place 1 random\n\xff\n"), encoding="utf-8")
+    (result,) = play(stream)
+    assert result["errors"][-1]["error"] == "Input is not valid UTF-8."
+    with pytest.raises(ScriptError, match="UTF-8"):
+        play(io.TextIOWrapper(io.BytesIO(b"\xff\n"), encoding="utf-8"), strict=True)
+
+
+def test_unseeded_runs_report_a_seed_that_replays_them():
+    lines = ["place 1 random", "place 2 random", "fire A1", "game", "place 1 random", "place 2 random"]
+    first = play(lines)
+    seed = first[0]["seed"]
+
+    assert isinstance(seed, int) and [r["seed"] for r in first] == [seed, seed]
+    assert play(lines, seed=seed) == first
@@ -0,0 +1,49 @@
+from seeds import master_seed, game_seed, game_rng
+from simulate import run_batch, replay_game
+from eventlog import EventLog, replay_log
+from snapshot import dumps
+from tournament import play_block
+
+import pytest
+
+
+def test_streams_are_fixed_per_game_and_distinct():
+    assert game_seed(1, 5) == game_seed(1, 5)
+    assert len({game_seed(1, game) for game in range(1000)}) == 1000
+    assert game_seed(1, 5) != game_seed(2, 5) != game_seed(1, 5, "random", "density")
+    assert game_rng(7, 3).random() == game_rng(7, 3).random()
+    assert master_seed(42) == 42
+    assert master_seed() != master_seed()
+
+
+def test_any_game_of_a_batch_replays_on_its_own(tmp_path):
+    path = str(tmp_path / "games.bsel")
+    with EventLog(path) as log:
+        stats = run_batch(12, seed=3, shooters=("density", "random"), log=log)
+    played = [dumps(session) for session in replay_log(path)]
+
+    assert stats["seed"] == 3
+    for game in (0, 7, 11):
+        assert dumps(replay_game(3, game, ("density", "random"))) == played[game]
+
+
+def test_unseeded_batch_reports_a_seed_that_reproduces_it():
+    stats = run_batch(10)
+    again = run_batch(10, seed=stats["seed"])
+
+    assert (again["wins"], again["mean_shots_to_win"]) == (stats["wins"], stats["mean_shots_to_win"])
+
+
+def test_tournament_games_do_not_depend_on_their_block():
+    whole = play_block(5, "random", "density", range(6))
+    assert play_block(5, "random", "density", [4]) == whole[4:5]
+
+
+def test_fleetgen_chunks_have_their_own_streams():
+    pytest.importorskip("numpy")
+    from fleetgen import random_layouts
+
+    boards, _ = random_layouts(30, seed=1, chunk=10)
+    first, _ = random_layouts(10, seed=1, chunk=10)
+    assert (boards[:10] == first).all()
+    assert not (boards[:10] == boards[10:20]).all()
@@ -0,0 +1,90 @@
+import asyncio
+import random
+
+from server import BattleshipServer, ProtocolError, place_fleet
+from client import BattleshipClient, ServerError, play_bot
+from state import PlayerBoard, fleet
+
+import pytest
+
+
+async def start_server():
+    server = BattleshipServer(rng=random.Random(0))
+    listener = await server.start(port=0)
+    return server, listener, listener.sockets[0].getsockname()[1]
+
+
+def test_bots_play_many_matches():
+    async def run():
+        server, listener, port = await start_server()
+        async with listener:
+            winners = []
+            for i in range(20):
+                host = await BattleshipClient.connect(port=port)
+                guest = await BattleshipClient.connect(port=port)
+                created = asyncio.ensure_future(play_bot(host, random.Random(i), name="A"))
+                while not server.matches:
+                    await asyncio.sleep(0)
+                match = next(iter(server.matches))
+                winners += await asyncio.gather(
+                    created, play_bot(guest, random.Random(-i), match=match, name="B"))
+                await host.close()
+                await guest.close()
+            return server, winners
+
+    server, winners = asyncio.run(run())
+    # Both sides of every match agree on who won
+    assert all(a == b and a in ("A", "B") for a, b in zip(winners[::2], winners[1::2]))
+    assert server.shots >= 20 * 17
+    assert not server.matches
+
+
+def test_rules_are_enforced():
+    async def run():
+        server, listener, port = await start_server()
+        async with listener:
+            host = await BattleshipClient.connect(port=port)
+            guest = await BattleshipClient.connect(port=port)
+            match = (await host.request("new", name="A"))["match"]
+
+            with pytest.raises(ServerError, match="place"):
+                await host.request("fire", target="A1")
+            await guest.request("join", match=match, name="B")
+            await host.request("place", random=True)
+            await guest.request("place", random=True)
+
+            with pytest.raises(ServerError, match="turn"):
+                await guest.request("fire", target="A1")
+            await host.request("fire", target="A1")
+            with pytest.raises(ServerError, match="Invalid format"):
+                await guest.request("fire", target="hello")
+            for row, col in ((1.7, True), ("2", "3"), (None, 0)):
+                with pytest.raises(ServerError, match="whole numbers"):
+                    await guest.request("fire", row=row, col=col)
+            await guest.request("fire", row=3, col=3)
+            with pytest.raises(ServerError, match="already"):
+                await host.request("fire", row=0, col=0)
+
+            await guest.close()
+            event = await host.wait_for("left")
+            await host.close()
+            return event, server
+
+    event, server = asyncio.run(run())
+    assert event["event"] == "left"
+    assert not server.matches
+
+
+def test_place_fleet_validates_layout():
+    player = PlayerBoard("A")
+    ships = [{"name": name, "coords": [[row, c] for c in range(length)]}
+             for row, (name, length) in enumerate(fleet)]
+    place_fleet(player, ships, 10)
+    assert [ship["name"] for ship in player.ship_positions] == [name for name, _ in fleet]
+    assert player.ship_health == [length for _, length in fleet]
+
+    # A gap in the Carrier
+    ships[0]["coords"][2] = [0, 7]
+    with pytest.raises(ProtocolError, match="Carrier"):
+        place_fleet(player, ships, 10)
+    assert player.ship_positions == []
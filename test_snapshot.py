@@ -0,0 +1,152 @@
+import random
+
+from snapshot import dumps, loads, pack_grid, unpack_grid, SnapshotWriter, SnapshotArchive, SnapshotError, SHIP, \
+    CONTAINER_HEADER, ENTRY
+from engine import new_game, fire
+from bitboard import BitBoard
+from sparse import SparseBoard, random_sparse_fleet
+from placement import random_ship_layout
+from state import Cell, fleet
+
+import pytest
+
+
+def half_played(seed, board_factory=None):
+    rng = random.Random(seed)
+    kwargs = {"board_factory": board_factory} if board_factory else {}
+    session = new_game(random_ship_layout(rng=rng)[1], random_ship_layout(rng=rng)[1], **kwargs)
+    cells = [(r, c) for r in range(10) for c in range(10)]
+    shots = [rng.sample(cells, 100), rng.sample(cells, 100)]
+    for turn in range(60):
+        fire(session, *shots[turn % 2][turn // 2])
+    return session, shots
+
+
+def test_round_trip_keeps_playing_the_same_game():
+    session, shots = half_played(1)
+    data = dumps(session)
+    restored = loads(data)
+
+    assert dumps(restored) == data
+    assert restored.current_player == session.current_player
+    for a, b in zip(session.players, restored.players):
+        assert a.grid == b.grid
+        assert a.ship_health == b.ship_health
+        assert (a.hits, a.misses, a.shots_taken, a.ships_sunk) == \
+               (b.hits, b.misses, b.shots_taken, b.ships_sunk)
+
+    turn = 60
+    while not session.game_over:
+        shot = shots[turn % 2][turn // 2]
+        assert fire(session, *shot).outcome == fire(restored, *shot).outcome
+        turn += 1
+    assert restored.winner == session.winner
+    assert loads(dumps(restored)).winner == session.winner
+
+
+def test_grid_packs_two_bits_per_cell():
+    grid = [[Cell.EMPTY, Cell.SHIP, Cell.MISS], [Cell.HIT, Cell.EMPTY, Cell.EMPTY],
+            [Cell.SHIP, Cell.SHIP, Cell.HIT]]
+    data = pack_grid(grid)
+
+    assert len(data) == 3
+    assert unpack_grid(data, 3) == grid
+
+
+def test_bitboard_sessions_save_as_grids():
+    session, _ = half_played(2, BitBoard.from_ships)
+    restored = loads(dumps(session))
+
+    assert restored.players[1].grid == [list(row) for row in session.players[1].grid]
+
+
+def test_container_random_access(tmp_path):
+    path = str(tmp_path / "games.bsgc")
+    sessions = {game_id: half_played(game_id)[0] for game_id in (42, 7, 1000, 3)}
+    with SnapshotWriter(path) as writer:
+        for game_id, session in sessions.items():
+            writer.add(game_id, session)
+
+    with SnapshotArchive(path) as archive:
+        assert len(archive) == 4
+        assert list(archive.ids()) == [3, 7, 42, 1000]
+        assert 8 not in archive
+        for game_id, session in sessions.items():
+            assert archive.read(game_id) == dumps(session)
+            assert dumps(archive.load(game_id)) == dumps(session)
+        with pytest.raises(KeyError):
+            archive.load(8)
+
+
+def test_version_1_containers_still_load(tmp_path):
+    session = half_played(4)[0]
+    data = dumps(session)
+    data = data[:2] + b"\x01" + data[3:]          # a version 1 snapshot
+    index = CONTAINER_HEADER.size + len(data)
+    path = tmp_path / "old.bsgc"
+    path.write_bytes(CONTAINER_HEADER.pack(b"BSGC", 1, 0, 1, index) + data +
+                     ENTRY.pack(9, CONTAINER_HEADER.size, len(data)))
+
+    with SnapshotArchive(str(path)) as archive:
+        assert list(archive.ids()) == [9]
+        assert dumps(archive.load(9)) == dumps(session)
+
+
+def test_bad_data_is_rejected(tmp_path):
+    data = dumps(half_played(3)[0])
+
+    with pytest.raises(SnapshotError):
+        loads(data[:40])
+    with pytest.raises(SnapshotError, match="version"):
+        loads(data[:2] + b"\x09" + data[3:])
+
+    with pytest.raises(SnapshotError, match="Duplicate"):
+        with SnapshotWriter(str(tmp_path / "dup.bsgc")) as writer:
+            writer.add_bytes(1, data)
+            writer.add_bytes(1, data)
+
+
+def test_ships_off_the_board_or_overlapping_are_rejected():
+    ships = [{"name": "Destroyer", "coords": [(0, 5), (1, 5)]},
+             {"name": "Cruiser", "coords": [(3, 0), (3, 1), (3, 2)]}]
+    data = dumps(new_game(ships, ships))
+    destroyer, cruiser = SHIP.pack(0, 5, 2, 1), SHIP.pack(3, 0, 3, 0)
+
+    with pytest.raises(SnapshotError, match="off the board"):
+        loads(data.replace(destroyer, SHIP.pack(0, 5, 2, 3)))       # pointing up from row 0
+    with pytest.raises(SnapshotError, match="off the board"):
+        loads(data.replace(cruiser, SHIP.pack(3, 8, 3, 0)))
+    with pytest.raises(SnapshotError, match="overlaps"):
+        loads(data.replace(cruiser, SHIP.pack(1, 4, 3, 0)))
+
+
+def test_long_names_are_cut_on_a_character_boundary():
+    session = half_played(3)[0]
+    session.players[0].name = "é" * 200
+    assert loads(dumps(session)).players[0].name == "é" * 127
+
+
+def test_sparse_sessions_save_their_shots_only():
+    rng = random.Random(5)
+    size = 5000
+    session = new_game(random_sparse_fleet(fleet, size, rng), random_sparse_fleet(fleet, size, rng),
+                       size, board_factory=SparseBoard.from_ships)
+    target = session.players[1].ship_positions[0]["coords"][0]
+    for shot in [target, (0, 0), (1, 1), (size - 1, size - 1)]:
+        fire(session, *shot)
+
+    data = dumps(session)
+    assert len(data) < 1000
+    restored = loads(data)
+    assert isinstance(restored.players[1].grid, SparseBoard)
+    assert restored.players[1].grid[target[0]][target[1]] == Cell.HIT
+    assert restored.players[1].grid[1][1] == Cell.MISS
+    assert [p.view_hash for p in restored.players] == [p.view_hash for p in session.players]
+    assert dumps(restored) == data
+
+
+def test_empty_container_is_rejected(tmp_path):
+    path = tmp_path / "empty.bsgc"
+    path.write_bytes(b"")
+    with pytest.raises(SnapshotError):
+        SnapshotArchive(str(path))
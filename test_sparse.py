@@ -0,0 +1,61 @@
+import random
+import tracemalloc
+
+from engine import new_game, fire, Outcome
+from sparse import SparseBoard, random_sparse_fleet
+from state import Cell, scaled_fleet
+
+import pytest
+
+
+def test_grid_api_matches_list_grid():
+    board = SparseBoard.from_ships([{"name": "Destroyer", "coords": [(5, 5), (5, 6)]}], 10)
+
+    assert len(board) == 10
+    assert board[5][6] == Cell.SHIP
+    assert board[0][0] == Cell.EMPTY
+    assert list(board[5])[5:7] == [Cell.SHIP, Cell.SHIP]
+
+    board[0][0] = Cell.MISS
+    assert board.already_shot(0, 0)
+    with pytest.raises(IndexError):
+        board[10]
+
+
+def test_shoot_tracks_health_and_all_sunk():
+    board = SparseBoard.from_ships([{"name": "Destroyer", "coords": [(5, 5), (5, 6)]}], 10)
+
+    assert board.shoot(5, 5) == (True, None)
+    assert board.shoot(0, 0) == (False, None)
+    hit, ship = board.shoot(5, 6)
+    assert hit and ship["name"] == "Destroyer"
+    assert board.all_sunk()
+
+    with pytest.raises(ValueError):
+        board.shoot(5, 6)
+
+
+def test_huge_board_uses_kilobytes():
+    size = 10_000
+    ships = scaled_fleet(4)
+    rng = random.Random(1)
+
+    tracemalloc.start()
+    game = new_game(random_sparse_fleet(ships, size, rng), random_sparse_fleet(ships, size, rng),
+                    size, board_factory=SparseBoard.from_ships)
+    result = fire(game, 123, 4567)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert result.outcome in (Outcome.MISS, Outcome.HIT)
+    assert peak < 200_000
+
+
+def test_full_game_on_sparse_boards():
+    fleet_1 = [{"name": "Destroyer", "coords": [(0, 0), (0, 1)]}]
+    fleet_2 = [{"name": "Destroyer", "coords": [(900, 900), (901, 900)]}]
+    game = new_game(fleet_1, fleet_2, 1000, board_factory=SparseBoard.from_ships)
+
+    assert fire(game, 900, 900).outcome == Outcome.HIT
+    assert fire(game, 999, 999).outcome == Outcome.MISS
+    assert fire(game, 901, 900).outcome == Outcome.WIN
@@ -0,0 +1,70 @@
+import json
+
+from tournament import run_tournament, summarize, wilson_interval, parse_strategy, fit_elo
+
+import pytest
+
+
+def test_round_robin_streams_and_resumes(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+
+    assert run_tournament(["random", "density"], 20, path, seed=1, workers=1, block=8) == 20
+    assert run_tournament(["random", "density"], 20, path, seed=1, workers=1, block=8) == 0
+    assert run_tournament(["random", "density"], 30, path, seed=1, workers=1, block=8) == 10
+
+    with open(path) as f:
+        games = [json.loads(line)["game"] for line in f]
+    assert sorted(games) == list(range(30))
+
+
+def test_interrupted_line_is_replayed(tmp_path):
+    path = tmp_path / "results.jsonl"
+    run_tournament(["random", "density"], 4, str(path), workers=1)
+    lines = path.read_text().splitlines()
+    path.write_text("\n".join(lines[:3]) + "\n" + lines[3][:10])
+
+    assert run_tournament(["random", "density"], 4, str(path), workers=1) == 1
+    assert summarize(str(path))["density"]["games"] == 4
+
+
+def test_report_ranks_stronger_strategy_first(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    run_tournament(["random", "density"], 40, path, workers=1)
+
+    report = summarize(path)
+    assert report["density"]["elo"] > report["random"]["elo"]
+    assert report["density"]["wins"] + report["random"]["wins"] == 40
+    low, high = report["density"]["win_ci"]
+    assert low <= report["density"]["win_rate"] <= high
+
+
+def test_wilson_interval_and_strategy_names():
+    low, high = wilson_interval(50, 100)
+    assert low == pytest.approx(0.404, abs=0.001)
+    assert high == pytest.approx(0.596, abs=0.001)
+
+    assert parse_strategy("density/random") == ("density", "random")
+    with pytest.raises(ValueError):
+        parse_strategy("psychic")
+
+
+def test_ratings_do_not_depend_on_game_order(tmp_path):
+    path = tmp_path / "results.jsonl"
+    run_tournament(["random", "density", "random/random"], 12, str(path), workers=1)
+    lines = path.read_text().splitlines()
+    shuffled = tmp_path / "shuffled.jsonl"
+    shuffled.write_text("\n".join(reversed(lines)) + "\n")
+
+    assert summarize(str(path)) == summarize(str(shuffled))
+    elo = fit_elo({"a": 75, "b": 25}, {("a", "b"): 100})
+    assert elo["a"] + elo["b"] == pytest.approx(3000)
+    assert 150 < elo["a"] - elo["b"] < 200
+
+
+def test_resume_only_counts_games_of_the_same_seed(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    run_tournament(["random", "density"], 6, path, seed=1, workers=1)
+
+    assert run_tournament(["random", "density"], 6, path, seed=2, workers=1) == 6
+    assert summarize(path, seed=2)["density"]["games"] == 6
+    assert summarize(path)["density"]["games"] == 12
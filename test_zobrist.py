@@ -0,0 +1,111 @@
+import random
+
+from zobrist import view_hash, ViewHash, ProbabilityCache, save_book, load_book, BookError
+from engine import new_game, fire, Outcome
+from placement import random_ship_layout
+from bitboard import BitBoard
+from snapshot import dumps, loads
+from state import fleet
+
+import pytest
+
+
+def play(seed, turns, board_factory=None):
+    rng = random.Random(seed)
+    kwargs = {"board_factory": board_factory} if board_factory else {}
+    session = new_game(random_ship_layout(rng=rng)[1], random_ship_layout(rng=rng)[1], **kwargs)
+    views = [ViewHash(10, fleet), ViewHash(10, fleet)]
+    shots = [rng.sample([(r, c) for r in range(10) for c in range(10)], 100) for _ in range(2)]
+    for turn in range(turns):
+        player = session.current_player
+        result = fire(session, *shots[player][turn // 2])
+        views[player].shot(result.row, result.col, result.outcome != Outcome.MISS, result.ship)
+        if session.game_over:
+            break
+    return session, views
+
+
+def test_incremental_hash_matches_full_recompute():
+    for board_factory in (None, BitBoard.from_ships):
+        session, views = play(1, 200, board_factory)
+        assert session.game_over
+        for player in (0, 1):
+            defender = session.players[1 - player]
+            assert defender.view_hash == views[player].value
+            if board_factory is None:
+                assert defender.view_hash == view_hash(defender)
+
+    session, _ = play(2, 60)
+    restored = loads(dumps(session))
+    assert [p.view_hash for p in restored.players] == [p.view_hash for p in session.players]
+
+
+def test_same_view_in_any_shot_order():
+    a, b = ViewHash(10, fleet), ViewHash(10, fleet)
+    shots = [(0, 0, False), (4, 4, True), (9, 2, False)]
+    for shot in shots:
+        a.shot(*shot)
+    for shot in reversed(shots):
+        b.shot(*shot)
+    assert a.value == b.value
+
+    b.shot(5, 5, False)
+    assert a.value != b.value
+    assert ViewHash(10, fleet).value != ViewHash(12, fleet).value
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ProbabilityCache(maxsize=2)
+    cache.load_book({99: "book"})
+    computed = []
+    compute = lambda key: (lambda: computed.append(key) or f"map {key}")
+
+    for key in (1, 2, 1, 3, 2, 99):
+        cache.lookup(key, compute(key))
+
+    assert computed == [1, 2, 3, 2]            # 2 was evicted when 3 came in
+    assert cache.get(99) == "book"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["book_entries"]) == (3, 4, 2, 1)
+
+
+def test_book_round_trip(tmp_path):
+    path = str(tmp_path / "opening.bsob")
+    entries = {7: (tuple(range(25)), 1000), 2 ** 64 - 1: ((0,) * 25, 0)}
+    save_book(path, 5, entries)
+
+    assert load_book(path) == (5, entries)
+    with pytest.raises(BookError, match="fleet"):
+        load_book(path, [("Destroyer", 2)])
+    with open(path, "r+b") as f:
+        f.truncate(40)
+    with pytest.raises(BookError):
+        load_book(path)
+
+
+def test_opening_book_feeds_the_exact_player(tmp_path):
+    pytest.importorskip("numpy")
+    from openingbook import build_book
+    from exact import ExactAI
+
+    ships = [("Cruiser", 3), ("Destroyer", 2)]
+    book = build_book(games=4, plies=2, size=6, ships=ships, seed=1)
+    path = str(tmp_path / "opening.bsob")
+    save_book(path, 6, book, ships)
+
+    cache = ProbabilityCache()
+    cache.load_book(load_book(path, ships)[1])
+    ExactAI(6, ships, cache=cache).choose_shot()
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 0
+
+
+def test_fleets_with_other_lengths_do_not_share_maps():
+    pytest.importorskip("numpy")
+    from exact import ExactAI
+
+    cache = ProbabilityCache()
+    assert ViewHash(6, [("A", 3)]).value != ViewHash(6, [("A", 2)]).value
+    ExactAI(6, [("A", 3)], cache=cache).choose_shot()
+    player = ExactAI(6, [("A", 2)], cache=cache)
+    player.choose_shot()
+    assert player.last_layouts == 60